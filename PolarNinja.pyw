@@ -4,7 +4,8 @@ import os
 from modules.settings import load_settings, save_settings
 from modules.dmx_engine import DMXEngine
 from modules.ui_topbar_online import TopBar
-from util.wave_assets import load_waveform, load_beats
+from util.wave_assets import load_waveform, load_beats, load_peaks, WAVE_EXT
+from modules.beat_scheduler import BeatScheduler
 from ui.wave_view import WaveView
 from modes.rockin_modes import RockinModes
 from ui.style_classic import apply_classic
@@ -100,6 +101,7 @@ class App:
         self.pos_ms = 0
         self.playing = False
         self.beats = {"tempo_bpm":0.0, "beats_sec":[]}
+        self.beat_sched = BeatScheduler(on_beat=self.rockin.on_beat)
 
         # Default
         self.start_cue("19", auto_play=False)
@@ -109,6 +111,7 @@ class App:
         try: sec = float(ev.data)
         except Exception: return
         self.pos_ms = int(sec*1000); self.wave.set_pos(self.pos_ms/1000.0)
+        self.beat_sched.seek(sec)
 
     def start_cue(self, cue, auto_play=True):
         self.current_cue = cue
@@ -116,17 +119,28 @@ class App:
         wf_name, beats_name = ASSETS[cue]
         wf_json = os.path.join(assets_dir, wf_name)
         wf_csv  = wf_json.replace(".json",".csv")
-        path = wf_json if os.path.exists(wf_json) else wf_csv
-        if not os.path.exists(path):
-            messagebox.showerror("Waveform missing", f"Cannot find waveform: {wf_json} or {wf_csv}")
+        # Peak pyramid from tools/build_wave_assets.py, else the JSON/CSV
+        wf_peaks = wf_json.replace("_waveform.json", "_peaks.bin")
+        wf_packed = wf_json.replace("_waveform.json", WAVE_EXT)
+        path = wf_packed if os.path.exists(wf_packed) else wf_json if os.path.exists(wf_json) else wf_csv
+        if os.path.exists(wf_peaks):
+            peaks = load_peaks(wf_peaks); self.duration = peaks.duration; self.values = []
+            self.wave.load_peaks(peaks)
+        elif not os.path.exists(path):
+            messagebox.showerror("Waveform missing", f"Cannot find waveform: {wf_peaks}, {wf_json} or {wf_csv}")
             return
-        wf = load_waveform(path); self.duration = float(wf["duration"]); self.values = list(wf["values"])
-        self.wave.load(self.values, self.duration); self.pos_ms = 0
+        else:
+            wf = load_waveform(path); self.duration = float(wf["duration"]); self.values = list(wf["values"])
+            self.wave.load(self.values, self.duration)
+        self.pos_ms = 0
         if cue == "21" and beats_name:
             bpath = os.path.join(assets_dir, beats_name)
+            if os.path.exists(wf_packed):
+                bpath = wf_packed
             self.beats = load_beats(bpath) if os.path.exists(bpath) else {"tempo_bpm":0.0, "beats_sec":[]}
         else:
             self.beats = {"tempo_bpm":0.0, "beats_sec":[]}
+        self.beat_sched.set_beats(self.beats["beats_sec"])
         if auto_play: self.play()
 
     def play(self):
@@ -153,10 +167,8 @@ class App:
             self.playing = False
             return
 
-        if self.current_cue == "21" and self.beats["beats_sec"]:
-            now = self.pos_ms/1000.0; prev = (self.pos_ms-33)/1000.0
-            for i, bt in enumerate(self.beats["beats_sec"]):
-                if prev < bt <= now: self.rockin.on_beat(i, bt)
+        if self.current_cue == "21" and len(self.beats["beats_sec"]):
+            self.beat_sched.advance(self.pos_ms/1000.0)
 
         if self.current_cue == "19":
             import math; t = self.pos_ms/1000.0; x = (math.sin(t*0.8)+1)/2
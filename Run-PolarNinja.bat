@@ -22,9 +22,9 @@ if errorlevel 1 (
   goto :eof
 )
 
-REM Check for PySide6 and pygame
+REM Check for PySide6, pygame and numpy
 set "CHK="
-%USE% -c "import importlib; print('OK' if all(importlib.util.find_spec(m) for m in ['PySide6','pygame']) else 'MISS')" > "__chk.txt" 2>nul
+%USE% -c "import importlib; print('OK' if all(importlib.util.find_spec(m) for m in ['PySide6','pygame','numpy']) else 'MISS')" > "__chk.txt" 2>nul
 
 if exist "__chk.txt" (
   set /p CHK=<"__chk.txt"
@@ -33,7 +33,7 @@ if exist "__chk.txt" (
 
 if /I not "%CHK%"=="OK" (
   echo.
-  echo PySide6 and/or pygame not found. Running first-time setup...
+  echo PySide6, pygame and/or numpy not found. Running first-time setup...
   echo.
   if exist "%~dp0Run-Setup.bat" (
     call "%~dp0Run-Setup.bat"
@@ -12,11 +12,11 @@ if %errorlevel%==0 (
 )
 
 echo.
-echo Installing / upgrading PySide6, pygame, and pyserial...
+echo Installing / upgrading PySide6, pygame, pyserial, and numpy...
 echo.
 
 %USE% -m pip install --upgrade pip
-%USE% -m pip install --upgrade PySide6 pygame pyserial
+%USE% -m pip install --upgrade PySide6 pygame pyserial numpy
 
 echo.
 echo Done installing dependencies.
@@ -1,15 +1,41 @@
+# Cold-start timing starts before the heavy imports below
+from modules.startup_timing import StartupTimer
+STARTUP = StartupTimer()
+
 from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QHBoxLayout
 from PySide6.QtCore import QTimer
 from PySide6.QtGui import QFont
-import sys, os, json, math
+import sys, os, time, threading, functools
 
 from modules.settings import load_settings
 from modules.dmx_engine import DMXEngine
+from modules.dmx_universe import FixturePatch
+from modules.dmx_net import make_backend
+from modules.dmx_recorder import FrameRecorder
 from modules.audio import AudioEngine
 from modules.rockin_modes import RockinModes
+from modules.beat_scheduler import BeatScheduler
+from modules.cue_timeline import load_cue_map, cue_map_path
+from modules.frame_cache import load_or_bake
+from modules.render_loop import RenderLoop
+from modules.show import NEXT_CUE, transition_for, beats_path, cue_colors
 from ui.widgets import CircleButton, SeekBar
 from ui.dots import DotBar
 
+STARTUP.mark("imports")
+
+APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _show_locked(fn):
+    """Run a GUI handler under the show lock, so the render thread never
+    renders a half-applied cue change, seek or transport action."""
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with self.show_lock:
+            return fn(self, *args, **kwargs)
+    return wrapper
+
 
 class App(QWidget):
     def __init__(self):
@@ -23,34 +49,80 @@ class App(QWidget):
 
         # ---- Core engines / config ----
         self.cfg = load_settings()
-
-        self.audio = AudioEngine()
+        STARTUP.mark("settings")
+
+        # Show state (audio, cue, timelines) is advanced by the render thread
+        # and changed by GUI handlers; both hold this lock while they do.
+        self.show_lock = threading.RLock()
+        # Latest rendered frame for the UI: (pos, duration, colors)
+        self._view = None
+        self._view_shown = None
+
+        # The mixer itself is opened on first use (the preloads below)
+        self.audio = AudioEngine(
+            sound_cache_mb=self.cfg.get("sound_cache_mb", 256),
+            mixer_freq=self.cfg.get("mixer_freq", 44100),
+            mixer_buffer=self.cfg.get("mixer_buffer", 256),
+            voices=self.cfg.get("mixer_voices", 4),
+            fade_hz=self.cfg.get("fade_hz", 1000.0),
+        )
         if hasattr(self.audio, "set_assets_dir"):
             self.audio.set_assets_dir(self.cfg.get("assets_dir"))
-
-        # Pre-warm core cue sounds so overlays don't glitch when we hit CUE 20
+        self.audio.seek_mode = self.cfg.get("seek_mode", "pcm")
+        # Decoded songs on disk, so startup and cue loads skip MP3 decoding
+        if self.cfg.get("pcm_cache", True):
+            self.audio.set_pcm_cache_dir(self.cfg.get("pcm_cache_dir") or os.path.join(
+                self.cfg.get("assets_dir") or APP_ROOT, "pcm_cache"
+            ))
+
+        # Pre-warm core cue sounds on a worker pool so overlays don't glitch
+        # when we hit CUE 20; the window comes up meanwhile and each cue
+        # button shows when its song is armed
+        self.audio.preload_workers = self.cfg.get("preload_workers", 3)
         for cid in ("19", "20", "21"):
             path = self.cfg["songs"].get(cid)
             if path and os.path.exists(path):
-                self.audio.warm_sound(path)
+                self.audio.preload(path)
+        STARTUP.mark("audio engine")
 
         # DMX engine + status callback
         dmx_port = self.cfg.get("dmx_com_port", 11)
-        self.dmx = DMXEngine(dmx_port, status_cb=self._set_dmx_status)
+        self.dmx = DMXEngine(
+            dmx_port,
+            status_cb=self._set_dmx_status,
+            frame_rate=self.cfg.get("frame_rate", 40),
+            baud=self.cfg.get("baud", 57600),
+            patch=FixturePatch.from_config(self.cfg, APP_ROOT),
+            keepalive_hz=self.cfg.get("dmx_keepalive_hz", 1.0),
+            backend=make_backend(self.cfg),
+            universes=self.cfg.get("dmx_universes", 1),
+        )
+        STARTUP.mark("dmx engine")
+
+        # Optional log of every frame sent, to compare a show run against a
+        # golden run with tools/dmx_replay.py
+        rec_dir = self.cfg.get("dmx_record_dir")
+        if rec_dir:
+            try:
+                name = time.strftime("show_%Y%m%d_%H%M%S.dmxlog")
+                self.dmx.set_recorder(FrameRecorder(os.path.join(rec_dir, name), self.dmx.frame_rate))
+            except Exception:
+                pass
         self.dmx.start()
 
         self.rockin = RockinModes(38)
         self.rockin.set_mode(1)
-        self.beats = []
-        self.last_beat_index = -1
-
-        # For smooth fade to white at end of CUE 20
-        self.white_fade_t0 = None
-        self.white_fade_dur = 3.0  # seconds
-        self.white_target = (240, 240, 240)
-
-        # For CUE 21 "All White Low Power" hold-to-reset
-        self.c21_hold_white = False
+        # CUE 21 beat grid -> rockin.on_beat, fired a little ahead of the beat
+        self.beat_lookahead_s = self.cfg.get("beat_lookahead_ms", 40) / 1000.0
+        self.beats = BeatScheduler(on_beat=self.rockin.on_beat, lookahead_s=self.beat_lookahead_s)
+
+        # Per-cue lighting timelines, compiled once: {"19": CueTimeline, ...}
+        self.timelines = load_cue_map(cue_map_path(self.cfg, APP_ROOT), 38)
+        # Optionally pre-render them at the DMX frame rate into a memory-mapped
+        # cache (in the background; ticks use the live timeline until done)
+        if self.cfg.get("bake_lighting", True):
+            threading.Thread(target=self._bake_lighting, daemon=True).start()
+        STARTUP.mark("timelines")
 
         # Track cue state so we know when we’re doing 19 -> 20
         self.current_cue = None
@@ -74,6 +146,12 @@ class App(QWidget):
         self.dmx_dot.setStyleSheet("color:#aa0000; font-size:18px;")
         top.addWidget(self.dmx_dot)
 
+        # DMX output timing (latency p50/p95, jitter p95), refreshed once a second
+        self.dmx_timing_lbl = QLabel("")
+        self.dmx_timing_lbl.setStyleSheet("color:#9aa0a6; font-size:11px;")
+        top.addWidget(self.dmx_timing_lbl)
+        self._dmx_timing_next = 0.0
+
         self.dmx.set_online(True)
 
         # ------------------------------------------------------------------
@@ -87,6 +165,8 @@ class App(QWidget):
         self.c19 = QPushButton("CUE 19 - UNLOADING")
         self.c20 = QPushButton("CUE 20 - HEAD ELF")
         self.c21 = QPushButton("CUE 21 - ROCKIN")
+        self._cue_labels = {"19": self.c19.text(), "20": self.c20.text(), "21": self.c21.text()}
+        self._cue_states = {}
 
         for b in (self.c19, self.c20, self.c21):
             b.setMinimumHeight(56)
@@ -174,15 +254,27 @@ class App(QWidget):
         lay.addWidget(self.dots)
         lay.addLayout(rrow)
 
+        # Initial state. CUE 19 is loaded from _tick once its preload is
+        # done (or by the first cue press), so a cold decode doesn't hold up
+        # the window
+        self.current_cue = "19"
+        self.prev_cue = None
+        self._initial_cue = "19"
+
+        # Show rendering runs on its own thread at the DMX frame rate; the
+        # timer only samples the latest frame for display
+        self.render = None
+        if self.cfg.get("render_thread", True):
+            self.render = RenderLoop(self._render_frame, frame_rate=self.cfg.get("frame_rate", 40))
+            self.render.start()
+
         # Timer
         self.timer = QTimer(self)
         self.timer.timeout.connect(self._tick)
         self.timer.start(50)
-
-        # Initial state
-        self.current_cue = "19"
-        self.prev_cue = None
-        self._load_song_for_cue("19", auto_play=False)
+        STARTUP.mark("window built")
+        self._first_paint = False
+        self.exit_after_startup = False  # main(): --exit-after-startup
 
     # ======================================================================
     # DMX STATUS
@@ -195,6 +287,58 @@ class App(QWidget):
         else:
             self.dmx_dot.setStyleSheet("color:#aa0000; font-size:18px;")
 
+    def _update_dmx_timing(self):
+        now = time.perf_counter()
+        if now < self._dmx_timing_next:
+            return
+        self._dmx_timing_next = now + 1.0
+        parts = [self.dmx.timing.status_text(), self.audio.clock.status_text()]
+        tip = self.dmx.timing.format_report()
+        tip += "\n\nAudio vs. show clock (ms): " + str(self.audio.clock.drift_stats())
+        tip += "\nSeek (ms): " + str(self.audio.seek_stats())
+        tip += "\nFader interval (ms): " + str(self.audio.fade_stats())
+        tip += "\nSound cache: " + str(self.audio.cache_stats())
+        tip += f"\nStartup: first paint {STARTUP.elapsed('first paint') * 1000.0:.0f} ms"
+        if self.render is not None:
+            parts.append(self.render.status_text())
+            tip += "\n\nRender loop (ms):\n" + self.render.format_report()
+        self.dmx_timing_lbl.setText("  ".join(p for p in parts if p))
+        self.dmx_dot.setToolTip(tip)
+
+    def paintEvent(self, e):
+        if not self._first_paint:
+            self._first_paint = True
+            STARTUP.mark("first paint")
+        super().paintEvent(e)
+
+    def _startup_done(self):
+        """Print the cold-start report once the first cue is loaded."""
+        if self.audio.mixer_ready:
+            STARTUP.mark("mixer open", at=self.audio.mixer_ready_at)
+        STARTUP.mark("cue 19 loaded")
+        print("Startup (ms):")
+        print(STARTUP.format_report())
+        if self.exit_after_startup:
+            QTimer.singleShot(0, self.close)
+
+    def closeEvent(self, e):
+        if self.render is not None:
+            self.render.stop()
+            print("Render loop (ms):")
+            print(self.render.format_report())
+        # Leave the DMX timing numbers in the console / log for the show report
+        print("DMX timing (ms):")
+        print(self.dmx.timing.format_report())
+        print("DMX counters:", self.dmx.counters())
+        print("Audio vs. show clock (ms):", self.audio.clock.drift_stats())
+        print("Seek (ms):", self.audio.seek_stats())
+        print("Fader interval (ms):", self.audio.fade_stats())
+        print("Sound cache:", self.audio.cache_stats())
+        self.dmx.stop()
+        if self.dmx.recorder is not None:
+            self.dmx.recorder.close()
+        super().closeEvent(e)
+
     # ======================================================================
     # GENERAL HELPERS / RESET
     # ======================================================================
@@ -208,42 +352,41 @@ class App(QWidget):
         for b in (self.c19, self.c20, self.c21):
             b.setStyleSheet(base)
 
+    @_show_locked
     def reset_all(self):
         """Full end-of-show reset."""
         self.stop()
         self.dots.set_colors([(0, 0, 0)] * 38)
+        self.dmx.submit_colors([(0, 0, 0)] * 38)
         self._reset_cue_button_styles()
-        self.white_fade_t0 = None
-        self.c21_hold_white = False
+        self._reset_timelines()
         self.current_cue = "19"
         self.prev_cue = None
         self._load_song_for_cue("19", auto_play=False)
 
+    @_show_locked
     def _on_seek_ratio(self, x: float):
         if self.audio.length > 0:
             sec = x * self.audio.length
-            # restart playback at new position (main channel only)
-            self.audio.play(start_sec=sec)
-            if self.beats:
-                self.last_beat_index = -1
-                for i, bt in enumerate(self.beats):
-                    if bt <= sec:
-                        self.last_beat_index = i
-                    else:
-                        break
+            # restart playback at new position (main track only)
+            self.audio.seek(sec)
+            self.beats.seek(sec)
 
+    @_show_locked
     def play(self):
         if self.audio.paused:
             self.audio.unpause()
         else:
             self.audio.play()
 
+    @_show_locked
     def pause(self):
         if self.audio.paused:
             self.audio.unpause()
         else:
             self.audio.pause()
 
+    @_show_locked
     def stop(self):
         self.audio.stop()
 
@@ -251,53 +394,41 @@ class App(QWidget):
     # CUES
     # ======================================================================
 
+    @_show_locked
     def load_cue(self, cid: str, auto_play: bool = True):
         """
         Load and optionally start a cue.
 
-        Special behavior:
-        - When jumping from CUE 19 to CUE 20 while 19 is playing,
-          keep 19 fading out for 2 seconds while 20 starts at full volume.
+        If a transition is configured for prev -> cid (settings
+        "transitions", e.g. "19>20") and a cue is playing, cid starts
+        while the playing cue fades out, both overlapping (19 -> 20: 20 in
+        at full volume, 19 tailing out over 2 seconds). Otherwise the new
+        cue is a hard cut.
         """
         prev = self.current_cue
         self.prev_cue = prev
         self.current_cue = cid
-        self.white_fade_t0 = None
-
-        # --- Special case: CUE 19 -> CUE 20 tail fade + instant 20 ---
-        if (prev == "19") and (cid == "20") and (self.audio._anchor_t is not None):
-            # 1) Start CUE 20 on overlay channel at full volume
-            path20 = self.cfg["songs"].get("20")
-            self.audio.play_overlay(path20)
-
-            # 2) Start a 2s manual tail fade on CUE 19 (main mixer.music)
-            self.audio.start_tail_fade(2.0)
-
-            # Update cue button styles to show 20 as active
-            self._reset_cue_button_styles()
-            {
-                "19": self.c19,
-                "20": self.c20,
-                "21": self.c21,
-            }[cid].setStyleSheet(
-                "QPushButton{color:#000;background:#16a34a;"
-                "border:2px solid #4ade80;padding:10px;}"
-            )
-
-            # Update right-hand duration label using overlay length
-            dur = max(0.0, self.audio.length or 0.0)
-            m = int(dur // 60)
-            s = int(dur % 60)
-            self.lbl_r.setText(f"{m:02d}:{s:02d}")
-
-            # For CUE 20 we don't use beats; ensure it's clean
-            self.beats = []
-            self.last_beat_index = -1
+        self._reset_timelines()
 
-            return
-
-        # --- Normal path for all other cue loads (19, 20 standalone, 21) ---
-        self._load_song_for_cue(cid, auto_play=False)
+        tr = self._transition(prev, cid)
+        path = self.cfg["songs"].get(cid)
+        if tr is not None and self.audio.clock.started and path and os.path.exists(path):
+            # --- Crossfade from the playing cue ---
+            self.audio.crossfade(
+                path,
+                fade_out=float(tr.get("fade_out", 2.0)),
+                fade_in=float(tr.get("fade_in", 0.0)),
+                shape=tr.get("shape", "linear"),
+            )
+            self._load_song_for_cue(cid, load_audio=False)
+        else:
+            # --- Hard cut ---
+            self._load_song_for_cue(cid, auto_play=False)
+            if auto_play:
+                try:
+                    self.audio.play(start_sec=0.0)
+                except TypeError:
+                    self.audio.play()
 
         self._reset_cue_button_styles()
         {
@@ -309,175 +440,130 @@ class App(QWidget):
             "border:2px solid #4ade80;padding:10px;}"
         )
 
-        if auto_play:
-            try:
-                self.audio.play(start_sec=0.0)
-            except TypeError:
-                self.audio.play()
-
         if cid == "21":
-            self.last_beat_index = -1
-            # Reset hold-white state whenever we start CUE 21
-            self.c21_hold_white = False
-            self.white_fade_t0 = None
+            self.beats.rewind()
+
+    def _transition(self, prev, cid):
+        """Crossfade settings for prev -> cid ("19>20", else "*"), or None."""
+        return transition_for(self.cfg, prev, cid)
+
+    def _arm_next_cue(self, cid: str):
+        """Keep the cue after cid decoded and pinned in the sound cache."""
+        nxt = NEXT_CUE.get(cid)
+        self.audio.arm(self.cfg["songs"].get(nxt) if nxt else None)
 
-    def _load_song_for_cue(self, cid: str, auto_play: bool = False):
+    def _load_song_for_cue(self, cid: str, auto_play: bool = False, load_audio: bool = True):
+        self._initial_cue = None
         path = self.cfg["songs"].get(cid)
-        if path and os.path.exists(path):
+        if load_audio and path and os.path.exists(path):
             self.audio.load(path)
+        self._arm_next_cue(cid)
 
         dur = max(0.0, self.audio.length or 0.0)
         m = int(dur // 60)
         s = int(dur % 60)
         self.lbl_r.setText(f"{m:02d}:{s:02d}")
 
-        self.beats = []
-        self.last_beat_index = -1
-        assets = self.cfg.get("assets_dir")
-
-        if cid == "21":
-            if assets and os.path.isdir(assets):
-                beats_json = os.path.join(assets, "CUE_21_-_ROCKIN_beats.json")
-                if os.path.exists(beats_json):
-                    try:
-                        with open(beats_json, "r", encoding="utf-8") as f:
-                            self.beats = json.load(f)
-                    except Exception:
-                        self.beats = []
+        self.beats.clear()
+        beats_json = beats_path(cid, self.cfg.get("assets_dir"))
+        if beats_json:
+            self.beats = BeatScheduler.from_file(
+                beats_json, on_beat=self.rockin.on_beat, lookahead_s=self.beat_lookahead_s
+            )
 
     # ======================================================================
     # COLOR HELPERS
     # ======================================================================
 
-    def _current_fade_cols(self, t: float):
-        x = (math.sin(t * 1.0) + 1) / 2
-        cols = []
-        for i in range(38):
-            if i % 2 == 0:
-                cols.append((int(255 * x), int(255 * (1 - x)), 0))
-            else:
-                cols.append((int(255 * (1 - x)), int(255 * x), 0))
-        return cols
-
-    def _blend_cols(self, cols_a, cols_b, alpha: float):
-        out = []
-        a = max(0.0, min(1.0, float(alpha)))
-        for (r1, g1, b1), (r2, g2, b2) in zip(cols_a, cols_b):
-            r = int(round(r1 * (1 - a) + r2 * a))
-            g = int(round(g1 * (1 - a) + g2 * a))
-            b = int(round(b1 * (1 - a) + b2 * a))
-            out.append((r, g, b))
-        return out
+    def _bake_lighting(self):
+        cache_dir = self.cfg.get("lighting_cache_dir") or os.path.join(
+            self.cfg.get("assets_dir") or APP_ROOT, "lighting_cache"
+        )
+        fps = float(self.cfg.get("frame_rate", 40) or 40)
+        for cid, tl in list(self.timelines.items()):
+            path = self.cfg["songs"].get(cid)
+            self.audio.wait_preload(path)
+            duration = self.audio.duration_of(path)
+            try:
+                baked = load_or_bake(cid, tl, fps, duration, cache_dir)
+            except Exception:
+                baked = None
+            if baked is not None:
+                self.timelines[cid] = baked
+
+    def _reset_timelines(self):
+        # Cursor back to the start, clear any held segment (CUE 21 white)
+        for tl in self.timelines.values():
+            tl.reset()
 
     # ======================================================================
-    # MAIN TICK
+    # RENDER (render thread) / MAIN TICK (GUI)
     # ======================================================================
 
-    def _tick(self):
-        # Let audio engine update fades/ramp first
-        self.audio.update()
+    def _render_frame(self, now=None):
+        """One show frame: audio fades/ramps, lighting, DMX submit."""
+        with self.show_lock:
+            # Let audio engine update fades/ramp first
+            self.audio.update()
 
-        dur = max(0.01, self.audio.length or 0.01)
-        pos = max(0.0, self.audio.get_pos())
+            dur = max(0.01, self.audio.length or 0.01)
+            pos = max(0.0, self.audio.get_pos())
 
-        self.seek.set_progress(min(1.0, pos / dur))
-        m = int(pos // 60)
-        s = int(pos % 60)
-        self.lbl_l.setText(f"{m:02d}:{s:02d}")
+            t_cols = time.perf_counter()
 
-        # ---- CUE 19 ----
-        if self.current_cue == "19":
-            cols = self._current_fade_cols(pos * 0.8)
-            self.dots.set_colors(cols)
+            # Cue map lighting, or CUE 21's beat grid (modules/show.py)
+            cid = self.current_cue
+            cols = cue_colors(cid, pos, self.timelines.get(cid), self.beats, self.rockin)
 
-        # ---- CUE 20 ----
-        elif self.current_cue == "20":
-            cols = [(0, 0, 0)] * 38
-
-            def red_left():
-                return [(255, 0, 0)] * 19 + [(0, 0, 0)] * 19
-
-            def green_right():
-                return [(0, 0, 0)] * 19 + [(0, 255, 0)] * 19
-
-            base_cols = self._current_fade_cols(pos)
-
-            if pos < 38.9:
-                cols = base_cols
-            elif pos < 40.2:
-                cols = red_left()
-            elif pos < 41.9:
-                cols = green_right()
-            elif pos < 43.2:
-                cols = red_left()
-            elif pos < 45.0:
-                cols = green_right()
-            elif pos < 46.1:
-                cols = red_left()
-            elif pos < 48.0:
-                cols = green_right()
-            elif pos < 50.0:
-                alpha = min(1.0, max(0.0, (pos - 48.0) / 2.0))
-                start_cols = green_right()
-                cols = self._blend_cols(start_cols, base_cols, alpha)
-            elif pos < 67.5:
-                cols = base_cols
-            elif pos < 68.6:
-                cols = green_right()
-            elif pos < 70.1:
-                cols = red_left()
-            elif pos < 71.7:
-                cols = green_right()
-            elif pos < 73.1:
-                cols = red_left()
-            elif pos < 74.6:
-                cols = green_right()
-            elif pos < 76.1:
-                cols = red_left()
-            elif pos < 78.1:
-                alpha = min(1.0, max(0.0, (pos - 76.1) / 2.0))
-                start_cols = red_left()
-                cols = self._blend_cols(start_cols, base_cols, alpha)
-            elif pos < 187.0:
-                cols = base_cols
-            else:
-                if self.white_fade_t0 is None:
-                    self.white_fade_t0 = pos
-                alpha = min(1.0, (pos - self.white_fade_t0) / self.white_fade_dur)
-                target_cols = [self.white_target] * 38
-                cols = self._blend_cols(base_cols, target_cols, alpha)
+            self.dmx.record_compute(time.perf_counter() - t_cols)
+            self.dmx.submit_colors(cols)
+            # Frames belong to the timeline; keep a copy for the UI
+            self._view = (pos, dur, cols.copy())
 
+    def _tick(self):
+        if self.render is None:
+            self._render_frame()
+        view = self._view
+        if view is not None and view is not self._view_shown:
+            self._view_shown = view
+            pos, dur, cols = view
+            self.seek.set_progress(min(1.0, pos / dur))
+            m = int(pos // 60)
+            s = int(pos % 60)
+            self.lbl_l.setText(f"{m:02d}:{s:02d}")
             self.dots.set_colors(cols)
-
-        # ---- CUE 21 ----
-        else:
-            # CUE 21 (ROCKIN)
-            if self.c21_hold_white:
-                # Once we hit all white, stay here until RESET is pressed
-                cols = [(240, 240, 240)] * 38
-                self.dots.set_colors(cols)
-            else:
-                # 0:00.0 -> 2:30.4  Rockin Red/Green
-                step = int(pos * 2.0) % 2
-
-                cols = []
-                for i in range(38):
-                    if (i + step) % 2 == 0:
-                        cols.append((255, 0, 0))
-                    else:
-                        cols.append((0, 255, 0))
-
-                # Switch to all white at 2:30.5 and hold
-                if pos >= 150.5:
-                    self.c21_hold_white = True
-                    cols = [(240, 240, 240)] * 38
-
-                self.dots.set_colors(cols)
+        self._update_cue_armed()
+        self._update_dmx_timing()
+
+    def _load_initial_cue(self):
+        with self.show_lock:
+            if not self._initial_cue:
+                return
+            self._load_song_for_cue(self._initial_cue, auto_play=False)
+        self._startup_done()
+
+    def _update_cue_armed(self):
+        """Mark each cue button with its preload state (● armed, … loading)."""
+        if self._initial_cue:
+            path = self.cfg["songs"].get(self._initial_cue)
+            if self.audio.preload_state(path) != "loading":
+                self._load_initial_cue()
+        for cid, btn in (("19", self.c19), ("20", self.c20), ("21", self.c21)):
+            state = self.audio.preload_state(self.cfg["songs"].get(cid))
+            if state == self._cue_states.get(cid):
+                continue
+            self._cue_states[cid] = state
+            mark = {"armed": "  ●", "loading": "  …", "failed": "  ✕"}.get(state, "")
+            btn.setText(self._cue_labels[cid] + mark)
+            btn.setToolTip({"armed": "Decoded and ready", "loading": "Decoding…",
+                            "failed": "Could not decode this song"}.get(state, ""))
 
 
 def main():
     app = QApplication(sys.argv)
     w = App()
+    # Print the startup report and quit (tools/startup_report.py)
+    w.exit_after_startup = "--exit-after-startup" in sys.argv
     w.resize(1280, 760)
     w.show()
     sys.exit(app.exec())
@@ -1,9 +1,43 @@
-import pygame, os, json, time
-print("Polar Ninja AudioEngine v0.7 (overlay cache + manual tail fade)")
-
-# Low-latency mixer settings to speed up start/seek
-pygame.mixer.pre_init(44100, -16, 2, 256)
-pygame.mixer.init()
+import os, json, math, time, threading, functools
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.dmx_timing import RollingHistogram
+from modules.pcm_cache import PCMCache
+from modules.sound_cache import SoundCache, sound_bytes
+from modules.show_clock import ShowClock
+from util.wave_assets import WAVE_EXT, wave_asset_duration
+
+# Low-latency mixer settings to speed up start/seek (defaults; the app
+# passes mixer_freq / mixer_buffer from settings)
+MIXER_FREQ = 44100
+MIXER_BUFFER = 256
+
+# pygame is imported, and the audio device opened, by init_mixer() on first
+# use (normally on a preload worker), not at import time: both are off the
+# path to the first frame. None until then.
+pygame = None
+_mixer_lock = threading.RLock()
+mixer_init_s = 0.0  # how long init_mixer() took
+
+
+def init_mixer(freq=MIXER_FREQ, buffer=MIXER_BUFFER):
+    """Import pygame and open the mixer once; later calls return at once.
+    Returns (freq, size, channels) as the device actually runs."""
+    global pygame, mixer_init_s
+    with _mixer_lock:
+        if pygame is None:
+            t0 = time.perf_counter()
+            import pygame as _pygame
+            _pygame.mixer.pre_init(int(freq), -16, 2, int(buffer))
+            _pygame.mixer.init()
+            pygame = _pygame
+            mixer_init_s = time.perf_counter() - t0
+            print("Polar Ninja AudioEngine v0.7 (overlay cache + manual tail fade)")
+        return pygame.mixer.get_init()
+
+# PCM seeks play the decoded track in chunks of this length: creating a
+# Sound from a buffer copies it, so only the first chunk is on the seek path
+_PCM_CHUNK_S = 2.0
 
 
 def _duration_from_assets(song_path, assets_dir):
@@ -17,6 +51,11 @@ def _duration_from_assets(song_path, assets_dir):
         guess = os.path.join(assets_dir, "CUE_20_-_HEAD_ELF_SCENE_waveform.json")
     elif "ROCKIN" in name:
         guess = os.path.join(assets_dir, "CUE_21_-_ROCKIN_waveform.json")
+    if guess:
+        # The .pnwave header (tools/build_wave_assets.py), else the JSON
+        dur = wave_asset_duration(guess.replace("_waveform.json", WAVE_EXT))
+        if dur > 0.0:
+            return dur
     if guess and os.path.exists(guess):
         try:
             with open(guess, "r", encoding="utf-8-sig") as f:
@@ -29,288 +68,794 @@ def _duration_from_assets(song_path, assets_dir):
     return 0.0
 
 
+# ----------------------------------------------------------------------
+# Voices: overlapping songs with gain envelopes
+# ----------------------------------------------------------------------
+
+SHAPES = ("linear", "equal_power")
+
+
+def envelope_gain(g0: float, g1: float, x: float, shape="linear") -> float:
+    """Gain at fraction x (0..1) of a ramp from g0 to g1. equal_power is
+    a quarter sine, so a fade-out and a fade-in of the same length keep the
+    summed power constant (no dip in the middle of a crossfade)."""
+    x = max(0.0, min(1.0, x))
+    if shape == "equal_power":
+        if g1 >= g0:
+            return g0 + (g1 - g0) * math.sin(x * math.pi / 2.0)
+        return g1 + (g0 - g1) * math.cos(x * math.pi / 2.0)
+    return g0 + (g1 - g0) * x
+
+
+class Envelope:
+    """Gain ramp from g0 to g1 over dur seconds from t0 (perf_counter)."""
+
+    def __init__(self, g0, g1, dur, shape="linear", t0=None):
+        self.g0 = float(g0)
+        self.g1 = float(g1)
+        self.dur = max(0.0, float(dur))
+        self.shape = shape if shape in SHAPES else "linear"
+        self.t0 = time.perf_counter() if t0 is None else t0
+
+    def gain(self, now: float) -> float:
+        if self.dur <= 0.0:
+            return self.g1
+        return envelope_gain(self.g0, self.g1, (now - self.t0) / self.dur, self.shape)
+
+    def done(self, now: float) -> bool:
+        return now - self.t0 >= self.dur
+
+
+class Voice:
+    """One song playing: on a pool Channel, fed from its decoded PCM in
+    _PCM_CHUNK_S chunks (the next one queued ahead) - or, with channel None,
+    the track mixer.music is streaming."""
+
+    def __init__(self, path, channel=None, pcm=None, rate=MIXER_FREQ, frame_bytes=4, start_s=0.0):
+        self.path = path
+        self.channel = channel
+        self.pcm = pcm                 # flat byte view, keeps the samples alive
+        self.rate = rate
+        self.frame_bytes = frame_bytes
+        self.start_s = float(start_s)  # song position it started at
+        self.next_off = None           # byte offset of the next chunk
+        self.env = None
+        self.gain = 1.0
+        self.stop_when_silent = False  # fading out: stop when env ends
+        self.ended = False
+        self._level = -1               # last volume sent, in SDL's 0..128
+
+    @property
+    def is_music(self) -> bool:
+        return self.channel is None
+
+    def _chunk(self, off: int):
+        end = off + int(_PCM_CHUNK_S * self.rate) * self.frame_bytes
+        self.next_off = end if end < len(self.pcm) else None
+        return pygame.mixer.Sound(buffer=self.pcm[off:end])
+
+    def start(self):
+        """Start a channel voice at start_s (snapped to a sample frame)."""
+        fb = self.frame_bytes
+        off = int(max(0.0, self.start_s) * self.rate) * fb
+        off = min(off, max(0, len(self.pcm) - fb))
+        self.start_s = off / float(fb * self.rate)
+        self.channel.play(self._chunk(off))
+
+    def feed(self):
+        """Keep one chunk queued behind the playing one."""
+        if self.channel is None or self.next_off is None:
+            return
+        if not self.channel.get_busy():
+            # Ran dry (update() came too late): carry on from the next chunk
+            self.channel.play(self._chunk(self.next_off))
+        elif self.channel.get_queue() is None:
+            self.channel.queue(self._chunk(self.next_off))
+
+    def set_gain(self, gain: float):
+        self.gain = gain
+        # SDL keeps volume as 0..128; skip calls that wouldn't change it
+        level = int(round(gain * 128.0))
+        if level == self._level:
+            return
+        self._level = level
+        if self.channel is None:
+            pygame.mixer.music.set_volume(gain)
+        else:
+            self.channel.set_volume(gain)
+
+    def busy(self) -> bool:
+        if self.channel is None:
+            return pygame.mixer.music.get_busy()
+        return self.next_off is not None or self.channel.get_busy()
+
+    def stop(self):
+        if self.channel is None:
+            pygame.mixer.music.stop()
+        else:
+            self.channel.stop()
+        self.next_off = None
+        self.ended = True
+
+
+# Fader thread wake-up with no envelope active: often enough to queue the
+# next _PCM_CHUNK_S chunk and notice voices that ended
+_IDLE_S = 0.1
+
+
+def _locked(fn):
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return fn(self, *args, **kwargs)
+    return wrapper
+
+
+class VoiceMixer:
+    """Overlapping voices on a pool of mixer Channels, each with its own
+    gain envelope.
+
+    current is the voice the playhead follows: the one started last. Voices
+    fading out keep their channel until the fade ends; if every channel is
+    taken, the quietest voice that isn't current is cut to make room.
+    mixer.music carries at most one voice. update() advances the envelopes,
+    feeds chunks and drops voices that faded out or ended.
+
+    start(hz) runs update() on a fader thread of its own (1 kHz by
+    default), so envelopes follow perf_counter no matter how busy the GUI
+    or render thread is. SDL applies a volume once per mix buffer (256
+    samples by default, ~6 ms), so that is the step size of a fade, not the
+    caller's tick. The thread only runs at hz while an envelope is active;
+    otherwise it wakes every _IDLE_S (to queue the next chunk) or when a
+    fade starts. interval keeps a histogram of the gaps between updates
+    while fading.
+    """
+
+    def __init__(self, channels):
+        self.channels = list(channels)
+        self.voices = []
+        self.current = None
+        self.steals = 0
+        self.drops = 0          # voices dropped so far (faded out / ended)
+        self.paused = False
+        self.interval = RollingHistogram(2048)
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # set when an envelope starts
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Fader thread
+    # ------------------------------------------------------------------
+
+    def start(self, hz=1000.0):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(1.0 / max(1.0, float(hz)),),
+                                        name="fader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        self._wake.set()
+        t = self._thread
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _fading(self) -> bool:
+        return not self.paused and any(v.env is not None for v in self.voices)
+
+    def _run(self, period):
+        last = None  # previous update while fading, for interval
+        while not self._stop.is_set():
+            # Cleared before looking at the voices, so a fade started from
+            # here on still cuts the idle wait short
+            self._wake.clear()
+            now = time.perf_counter()
+            if last is not None:
+                self.interval.record(now - last)
+            try:
+                with self._lock:
+                    if not self.paused:
+                        self.update(now)
+                    fading = self._fading()
+            except Exception:
+                fading = False
+            if fading:
+                last = now
+                # time.sleep(), not Event.wait(): on Windows it uses a
+                # high-resolution timer (Python 3.11+), Event.wait() the
+                # 15 ms tick
+                time.sleep(period)
+            else:
+                last = None
+                self._wake.wait(_IDLE_S)
+
+    @_locked
+    def pause(self):
+        self.paused = True
+
+    @_locked
+    def resume(self, paused_for: float):
+        """Un-pause, moving every envelope paused_for seconds later."""
+        self.shift(paused_for)
+        self.paused = False
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+
+    @_locked
+    def paths(self):
+        return [v.path for v in self.voices]
+
+    def _free_channel(self):
+        used = {id(v.channel) for v in self.voices if v.channel is not None}
+        for ch in self.channels:
+            if id(ch) not in used:
+                return ch
+        on_channels = [v for v in self.voices if v.channel is not None]
+        victim = min([v for v in on_channels if v is not self.current] or on_channels, key=lambda v: v.gain)
+        self._drop(victim)
+        self.steals += 1
+        return victim.channel
+
+    def _add(self, voice, fade_in, shape, now):
+        if fade_in and fade_in > 0.0:
+            voice.env = Envelope(0.0, 1.0, fade_in, shape, now)
+            voice.set_gain(0.0)
+            self._wake.set()
+        else:
+            voice.set_gain(1.0)
+        self.voices.append(voice)
+        self.current = voice
+        return voice
+
+    @_locked
+    def play_pcm(self, path, pcm, rate, frame_bytes, start_s=0.0, fade_in=0.0, shape="linear", now=None):
+        """Start decoded samples on a free channel; becomes current."""
+        voice = Voice(path, self._free_channel(), pcm, rate, frame_bytes, start_s)
+        voice.start()
+        return self._add(voice, fade_in, shape, now)
+
+    @_locked
+    def play_music(self, path, start_s=0.0, fade_in=0.0, shape="linear", now=None):
+        """Register the track mixer.music was just started on; becomes
+        current. Any older music voice is gone (mixer.music plays one)."""
+        for v in [v for v in self.voices if v.is_music]:
+            self.voices.remove(v)
+            v.ended = True
+        return self._add(Voice(path, start_s=start_s), fade_in, shape, now)
+
+    @_locked
+    def fade_out(self, voice, dur, shape="linear", now=None):
+        """Fade voice from its gain to silence over dur s, then stop it."""
+        if dur <= 0.0:
+            self._drop(voice)
+            return
+        voice.env = Envelope(voice.gain, 0.0, dur, shape, now)
+        voice.stop_when_silent = True
+        self._wake.set()
+
+    @_locked
+    def fade_out_all(self, dur, shape="linear", now=None):
+        for v in list(self.voices):
+            self.fade_out(v, dur, shape, now)
+
+    def _drop(self, voice):
+        voice.stop()
+        if voice in self.voices:
+            self.voices.remove(voice)
+
+    @_locked
+    def stop_all(self):
+        for v in list(self.voices):
+            self._drop(v)
+        self.current = None
+        # Nothing left to hold; what plays next must not stay frozen
+        self.paused = False
+
+    @_locked
+    def shift(self, dt: float):
+        """Move every envelope dt seconds later (after a pause)."""
+        for v in self.voices:
+            if v.env is not None:
+                v.env.t0 += dt
+
+    @_locked
+    def update(self, now=None) -> bool:
+        """Advance one step; True if a voice was dropped."""
+        if now is None:
+            now = time.perf_counter()
+        dropped = False
+        for v in list(self.voices):
+            v.feed()
+            if v.env is not None:
+                v.set_gain(v.env.gain(now))
+                if v.env.done(now):
+                    v.env = None
+                    if v.stop_when_silent:
+                        self._drop(v)
+                        dropped = True
+                        continue
+            if not v.busy():
+                v.ended = True
+                self.voices.remove(v)
+                dropped = True
+        if dropped:
+            self.drops += 1
+        return dropped
+
+
 class AudioEngine:
     """
     Audio engine with:
     - mixer.music for the "main" track (normally the current cue)
-    - an overlay Channel for an additional track (used for CUE 20 while 19 tails)
-    - a virtual clock for UI seek bar
-    - manual tail-fade control for smooth 19 -> 20 transition
-    - simple sound cache so overlay sounds are pre-decoded
+    - a VoiceMixer: a pool of Channels for overlapping songs, each with its
+      own linear / equal-power envelope; crossfade() takes any cue to any
+      other with overlapping tails (e.g. 19 tailing out under 20)
+    - a ShowClock (perf_counter based, drift-corrected against the mixer)
+      that the UI, lighting and DMX all read through get_pos(); it follows
+      the mixer's current voice
+    - a byte-budgeted LRU sound cache so cue sounds are pre-decoded;
+      the playing songs and the armed next cue are pinned in it
+    - background preloading on a small worker pool (preload() -> Future);
+      loading a cue whose preload is still running waits for it instead of
+      decoding it a second time
+    - an optional on-disk PCM cache (set_pcm_cache_dir) so songs are decoded
+      once, not on every start / cue load
+    - instant seeks (seek_mode "pcm"): the main track's decoded PCM is kept
+      from load() and a seek plays it from the sample offset on a Channel,
+      instead of making SDL_mixer re-seek and re-decode the MP3
     """
 
-    def __init__(self):
+    def __init__(self, sound_cache_mb=256, mixer_freq=MIXER_FREQ, mixer_buffer=MIXER_BUFFER, voices=4,
+                 fade_hz=1000.0, timer=time.perf_counter):
         self.path = None
         self.length = 0.0
         self.assets_dir = None
 
-        # Virtual clock for mixer.music
-        self._anchor_t = None
-        self._anchor_off = 0.0
-        self._pause_t = None
+        # Playhead for whatever is "current" (the mixer's current voice).
+        # timer is the show's time base: perf_counter, or the simulated
+        # clock of an offline render (modules/offline_render.py)
+        self.timer = timer
+        self.clock = ShowClock(timer=timer)
         self.paused = False
-        self._ramp_until = 0.0
-
-        # Overlay channel for special cases (e.g. CUE 19 -> 20)
-        self.overlay_channel = pygame.mixer.Channel(7)
-        self.overlay_sound = None
-        self.overlay_start_t = None
-        self.overlay_active = False
-        self._overlay_pause_t = None  # for proper pause timing
-
-        # Manual tail fade for mixer.music (CUE 19 only)
-        self.tail_fade_active = False
-        self.tail_fade_t0 = None
-        self.tail_fade_dur = 0.0
-
-        # Simple cache of preloaded sounds
-        self._sound_cache = {}
+        self._paused_at = 0.0
+
+        # Mixer, opened by _ensure_mixer() on first use
+        self.mixer_freq = int(mixer_freq)
+        self.mixer_buffer = int(mixer_buffer)
+        self.mixer_ready = False
+        self.mixer_ready_at = 0.0  # perf_counter when it was opened
+        # mixer.music.get_pos() counts samples handed to the device, which
+        # run one buffer ahead of what is heard
+        self._output_latency_s = self.mixer_buffer / float(self.mixer_freq)
+
+        # Channel pool for overlapping voices (created with the mixer)
+        self.voices = max(1, int(voices))
+        self.fade_hz = float(fade_hz)  # fader thread rate; 0 = envelopes from update()
+        self.mixer = None
+        self._drops_seen = 0
+        self._music_path = None  # what mixer.music has loaded
+
+        # Preloaded sounds, LRU within a byte budget
+        self._sound_cache = SoundCache(int(float(sound_cache_mb) * 1024 * 1024))
+        self.armed_path = None
+
+        # Background preloads: path -> Future (True once decoded)
+        self.preload_workers = 3
+        self._pool = None
+        self._preloads = {}
+        self._preload_lock = threading.Lock()
+        self.pcm_cache = None
+        self._pcm_cache_dir = None
+
+        # Decoded current song for PCM seeks: a seek starts a voice on it at
+        # the sample offset instead of re-seeking mixer.music
+        self.seek_mode = "pcm"  # "pcm" or "stream" (mixer.music.play(start=))
+        self._pcm = None        # flat byte view of the decoded Sound
+        self._pcm_sound = None  # keeps the Sound / mapping (and so the view) alive
+        self._frame_bytes = 4
+        self._pcm_rate = MIXER_FREQ
+        self.seek_hist = RollingHistogram(256)
 
     # ------------- Setup / Loading -------------
 
     def set_assets_dir(self, assets_dir):
         self.assets_dir = assets_dir
 
-    def warm_sound(self, path: str):
-        """Pre-decode a sound into the cache without playing it."""
-        if not path or (not os.path.exists(path)):
+    def set_pcm_cache_dir(self, cache_dir):
+        """Keep decoded songs in cache_dir (None / "" to always decode).
+        The cache is keyed on the mixer format, so it opens with the mixer."""
+        with _mixer_lock:
+            self._pcm_cache_dir = cache_dir or None
+            self.pcm_cache = None
+            if self.mixer_ready:
+                self._open_pcm_cache()
+
+    def _open_pcm_cache(self):
+        if self._pcm_cache_dir:
+            freq, size, channels = pygame.mixer.get_init()
+            self.pcm_cache = PCMCache(self._pcm_cache_dir, freq, size, channels)
+
+    def _ensure_mixer(self):
+        """Open the mixer (init_mixer) and this engine's channels, once."""
+        if self.mixer_ready:
             return
+        with _mixer_lock:
+            if self.mixer_ready:
+                return
+            freq, size, channels = init_mixer(self.mixer_freq, self.mixer_buffer)
+            self._output_latency_s = self.mixer_buffer / float(freq)
+            self._pcm_rate = freq
+            self.mixer = VoiceMixer(self._open_channels())
+            if self.fade_hz > 0.0:
+                self.mixer.start(self.fade_hz)
+            self._open_pcm_cache()
+            self.mixer_ready_at = time.perf_counter()
+            self.mixer_ready = True
+
+    def _open_channels(self):
+        """The channel pool for the VoiceMixer (one per voice)."""
+        if pygame.mixer.get_num_channels() < self.voices:
+            pygame.mixer.set_num_channels(self.voices)
+        return [pygame.mixer.Channel(i) for i in range(self.voices)]
+
+    def _samples(self, path: str):
+        """Decoded samples of path: memory-mapped from the PCM cache when
+        there is one (decoding and storing it on a miss), else a new Sound.
+        None if it can't be decoded."""
+        self._ensure_mixer()
+        if self.pcm_cache is not None:
+            return self.pcm_cache.get(path, pygame.mixer.Sound)
+        try:
+            return pygame.mixer.Sound(path)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _to_sound(samples):
+        if samples is None or isinstance(samples, pygame.mixer.Sound):
+            return samples
+        try:
+            return pygame.mixer.Sound(buffer=samples)
+        except Exception:
+            return None
+
+    def warm_sound(self, path: str) -> bool:
+        """Pre-decode a sound into the cache without playing it.
+
+        Budget-aware: a sound that would only fit by evicting pinned ones
+        is not loaded (it is decoded when it plays instead). False if it
+        isn't in the cache afterwards.
+        """
+        if not path or (not os.path.exists(path)):
+            return False
         if path in self._sound_cache:
-            return
+            return True
+        samples = self._samples(path)
+        if samples is None:
+            return False
+        if not self._sound_cache.fits(sound_bytes(samples)):
+            self._sound_cache.rejected += 1
+            return False
+        snd = self._to_sound(samples)
+        return snd is not None and self._sound_cache.put(path, snd)
+
+    def _preload_job(self, path):
+        if self.warm_sound(path):
+            return True
+        # Refused by the budget, but decoded into the PCM cache
+        return self.pcm_cache is not None and self.pcm_cache.load(path) is not None
+
+    def _decoded(self, path) -> bool:
+        """True if path plays without decoding: in the sound cache or the
+        PCM cache."""
+        if path in self._sound_cache:
+            return True
+        return self.pcm_cache is not None and self.pcm_cache.has(path)
+
+    def preload(self, path):
+        """Decode path on the worker pool; returns its Future (True once
+        the song is decoded). Asking again returns the same Future unless
+        the decoded song has since been evicted."""
+        with self._preload_lock:
+            fut = self._preloads.get(path)
+            if fut is not None and fut.done() and not self._decoded(path):
+                fut = None
+            if fut is None:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=max(1, int(self.preload_workers)), thread_name_prefix="preload"
+                    )
+                fut = self._pool.submit(self._preload_job, path)
+                self._preloads[path] = fut
+        return fut
+
+    def wait_preload(self, path):
+        """Block until a running preload of path is done (no-op otherwise)."""
+        fut = self._preloads.get(path)
+        if fut is not None:
+            try:
+                fut.result()
+            except Exception:
+                pass
+
+    def preload_state(self, path) -> str:
+        """"armed" (decoded), "loading", "failed", or "" if never preloaded."""
+        fut = self._preloads.get(path)
+        if fut is None:
+            return "armed" if path in self._sound_cache else ""
+        if not fut.done():
+            return "loading"
         try:
-            snd = pygame.mixer.Sound(path)
+            ok = fut.result()
         except Exception:
-            return
-        self._sound_cache[path] = snd
+            return "failed"
+        if not ok:
+            return "failed"
+        # Evicted since (and not in the PCM cache): decodes again on play
+        return "armed" if self._decoded(path) else ""
+
+    def arm(self, path):
+        """Mark path as the next cue: pin it and preload it in the
+        background (if it fits). Returns the preload Future, or None."""
+        self.armed_path = path
+        self._update_pins()
+        if not path or not os.path.exists(path):
+            return None
+        return self.preload(path)
+
+    def _update_pins(self):
+        playing = self.mixer.paths() if self.mixer is not None else []
+        self._sound_cache.set_pins([self.path, self.armed_path] + playing)
+
+    def cache_stats(self) -> dict:
+        return self._sound_cache.stats()
+
+    def duration_of(self, path: str) -> float:
+        """Length in seconds of a song, without loading it as the main track."""
+        snd = self._sound_cache.peek(path)
+        if snd is not None:
+            try:
+                return snd.get_length()
+            except Exception:
+                pass
+        if path and self.pcm_cache is not None and os.path.exists(path):
+            dur = self.pcm_cache.duration(path)
+            if dur > 0.0:
+                return dur
+        return _duration_from_assets(path, self.assets_dir) if path else 0.0
+
+    def _pcm_of(self, path: str):
+        """Decoded samples of path for playback: the cached Sound, or the
+        PCM cache mapping (a decode only if it was never preloaded)."""
+        samples = self._sound_cache.get(path)
+        if samples is None:
+            samples = self._samples(path)
+            if isinstance(samples, pygame.mixer.Sound):
+                # Decoded in memory (no PCM cache): account for it
+                self._sound_cache.put(path, samples, force=True)
+        return samples
+
+    def _set_current(self, path: str):
+        """Make path the current song: its PCM (for seeks) and length."""
+        self.path = path
+        self._update_pins()
+        self.wait_preload(path)
+        self._set_pcm(self._pcm_of(path))
+        self.length = 0.0
+        if self._pcm is not None:
+            self.length = len(self._pcm) / float(self._frame_bytes * self._pcm_rate)
+        if (not self.length) and self.assets_dir:
+            self.length = _duration_from_assets(path, self.assets_dir) or 0.0
 
     def load(self, path: str):
         """Load a file into mixer.music as the main track."""
+        self._ensure_mixer()
         self.stop()
-        self.path = path
+        self._set_current(path)
         pygame.mixer.music.load(path)
-        try:
-            snd = pygame.mixer.Sound(path)
-            self.length = snd.get_length()
-        except Exception:
-            self.length = 0.0
-        if (not self.length) and self.assets_dir:
-            self.length = _duration_from_assets(path, self.assets_dir) or 0.0
+        self._music_path = path
 
         # Reset clock & flags
         self.paused = False
-        self._anchor_t = None
-        self._anchor_off = 0.0
-        self._pause_t = None
-        self._ramp_until = 0.0
-        self.tail_fade_active = False
-        self.tail_fade_t0 = None
-        self.tail_fade_dur = 0.0
+        self.clock.stop()
+
+    def _set_pcm(self, samples):
+        """Keep samples (a Sound or cached array) as a flat byte view for
+        PCM seeks (no copy)."""
+        self._pcm = None
+        self._pcm_sound = None
+        if samples is None:
+            return
+        try:
+            freq, size, channels = pygame.mixer.get_init()
+            self._pcm = memoryview(samples).cast("B")
+        except Exception:
+            return
+        self._pcm_sound = samples
+        self._pcm_rate = freq
+        self._frame_bytes = (abs(size) // 8) * channels
 
     # ------------- Main playback -------------
 
-    def _apply_ramp(self):
-        if self._ramp_until > 0.0:
-            now = time.time()
-            if now < self._ramp_until:
-                amt = max(0.0, min(1.0, 1.0 - (self._ramp_until - now)))
-                pygame.mixer.music.set_volume(amt)
-            else:
-                pygame.mixer.music.set_volume(1.0)
-                self._ramp_until = 0.0
+    @property
+    def voice(self):
+        """The voice the playhead follows (None before anything played)."""
+        return self.mixer.current if self.mixer is not None else None
 
     def play(self, start_sec: float = 0.0, ramp_in_sec: float = 0.0):
-        """Play the main track from a certain position."""
+        """Play the main track from a certain position (streamed by
+        mixer.music, a hard cut from whatever was playing)."""
         if self.path is None:
             return
+        self._ensure_mixer()
+        self.mixer.stop_all()
+        if self._music_path != self.path:
+            pygame.mixer.music.load(self.path)
+            self._music_path = self.path
         try:
             pygame.mixer.music.play(start=float(start_sec))
         except TypeError:
             pygame.mixer.music.stop()
             pygame.mixer.music.play()
-        self.paused = False
-        self._anchor_t = time.time()
-        self._anchor_off = float(start_sec)
-        self._pause_t = None
-        self.tail_fade_active = False
-        self.tail_fade_t0 = None
-        self.tail_fade_dur = 0.0
-        if ramp_in_sec and ramp_in_sec > 0.0:
-            pygame.mixer.music.set_volume(0.0)
-            self._ramp_until = time.time() + float(ramp_in_sec)
-        else:
-            pygame.mixer.music.set_volume(1.0)
-            self._ramp_until = 0.0
-
-    # ------------- Overlay (CUE 20) -------------
+            start_sec = 0.0
+        self.mixer.play_music(self.path, start_sec, fade_in=ramp_in_sec or 0.0)
+        self._started(start_sec)
 
-    def play_overlay(self, path: str):
-        """
-        Play an additional track on a separate channel at full volume.
-        Used for CUE 20 while CUE 19 is fading out.
-        """
-        # Stop any existing overlay first
-        if self.overlay_active:
-            try:
-                self.overlay_channel.stop()
-            except Exception:
-                pass
-            self.overlay_active = False
-            self.overlay_start_t = None
-            self.overlay_sound = None
-            self._overlay_pause_t = None
-
-        if not path or (not os.path.exists(path)):
-            return
-
-        # Use cached sound if available, else load and cache
-        snd = self._sound_cache.get(path)
-        if snd is None:
-            try:
-                snd = pygame.mixer.Sound(path)
-            except Exception:
-                return
-            self._sound_cache[path] = snd
-
-        self.overlay_sound = snd
-        self.overlay_start_t = time.time()
-        self.overlay_active = True
-        self._overlay_pause_t = None
-        self.overlay_channel.play(snd)
-
-        # For UI timeline, treat this overlay as the "current" track
-        try:
-            self.length = snd.get_length()
-        except Exception:
-            pass
+    def _started(self, start_sec):
+        if self.paused:
+            # Started while paused (seek / play without unpause): let SDL
+            # and the fader thread run the new voice
+            pygame.mixer.unpause()
+            self.mixer.resume(0.0)
+        self.paused = False
+        self.clock.start(float(start_sec))
+        self._update_pins()
 
-    # ------------- Manual tail fade for 19 -------------
+    def seek(self, start_sec: float):
+        """Restart the current song at start_sec (a hard cut, tails included).
 
-    def start_tail_fade(self, dur_sec: float = 2.0):
+        In "pcm" mode this starts a voice on the decoded samples at the frame
+        offset; its chunks are queued from update(). Falls back to
+        play(start_sec) (a stream seek) without decoded PCM or in "stream"
+        mode. The time spent here goes into seek_hist.
         """
-        Start a manual fade-out of the main mixer.music channel over dur_sec seconds.
-        This is used when CUE 19 is still playing and we trigger CUE 20.
+        t0 = time.perf_counter()
+        pcm = self._pcm
+        if self.seek_mode != "pcm" or pcm is None or self.path is None:
+            self.play(start_sec=start_sec)
+        else:
+            self.mixer.stop_all()
+            v = self.mixer.play_pcm(self.path, pcm, self._pcm_rate, self._frame_bytes, start_sec)
+            self._started(v.start_s)
+        self.seek_hist.record(time.perf_counter() - t0)
+
+    def fade_stats(self) -> dict:
+        """Gaps between envelope updates on the fader thread (ms)."""
+        s = self.mixer.interval.summary() if self.mixer is not None else {}
+        s["hz"] = self.fade_hz if self.mixer is not None and self.mixer.running else 0.0
+        return s
+
+    def seek_stats(self) -> dict:
+        """Time spent in seek() (ms percentiles)."""
+        s = self.seek_hist.summary()
+        s["mode"] = self.seek_mode
+        return s
+
+    # ------------- Crossfades -------------
+
+    def crossfade(self, path: str, fade_out: float = 2.0, fade_in: float = 0.0, shape: str = "linear"):
+        """Start path from the top as the current song while everything
+        playing fades out over fade_out seconds (0 = cut) and path fades in
+        over fade_in (0 = full volume at once); shape is "linear" or
+        "equal_power". The outgoing voices keep playing (and overlapping)
+        until their fade ends.
+
+        Plays from the armed / cached PCM, so a preloaded song is not
+        decoded at trigger time. Without decoded PCM the new song is
+        streamed by mixer.music instead, after a cut of any music voice.
         """
-        self.tail_fade_active = True
-        self.tail_fade_t0 = time.time()
-        self.tail_fade_dur = max(0.1, float(dur_sec))
-        # Disable any ramp-in that might still be running
-        self._ramp_until = 0.0
-
-    def _update_tail_fade(self):
-        """Internal: called from update() to progress the tail fade."""
-        if not self.tail_fade_active or self.tail_fade_t0 is None:
-            return
-        now = time.time()
-        elapsed = now - self.tail_fade_t0
-        if elapsed >= self.tail_fade_dur:
-            # Fade complete: stop the main music channel
-            pygame.mixer.music.stop()
-            self.tail_fade_active = False
-            self.tail_fade_t0 = None
-            self.tail_fade_dur = 0.0
+        if not path or not os.path.exists(path):
             return
-        # Otherwise, scale volume linearly from 1.0 -> 0.0
-        alpha = max(0.0, min(1.0, elapsed / self.tail_fade_dur))
-        vol = 1.0 - alpha
-        pygame.mixer.music.set_volume(vol)
+        self._ensure_mixer()
+        if self.paused:
+            self.unpause()
+        self._set_current(path)
+        now = self.timer()
+        self.mixer.fade_out_all(fade_out, shape, now)
+        if self._pcm is not None:
+            self.mixer.play_pcm(path, self._pcm, self._pcm_rate, self._frame_bytes, 0.0,
+                                fade_in=fade_in, shape=shape, now=now)
+        else:
+            pygame.mixer.music.load(path)
+            self._music_path = path
+            pygame.mixer.music.play()
+            self.mixer.play_music(path, 0.0, fade_in=fade_in, shape=shape, now=now)
+        self._started(0.0)
 
     # ------------- Pause / Stop / Update -------------
 
     def pause(self):
-        """Pause all playback (main + overlay) and freeze clocks."""
-        if not self.paused:
+        """Pause all playback (every voice) and freeze clocks."""
+        if not self.paused and self.mixer_ready:
+            self.mixer.pause()
             pygame.mixer.pause()
             pygame.mixer.music.pause()
             self.paused = True
-            now = time.time()
-            self._pause_t = now
-            if self.overlay_active and (self.overlay_start_t is not None):
-                self._overlay_pause_t = now
+            self._paused_at = self.timer()
+            self.clock.pause()
 
     def unpause(self):
-        """Unpause all playback (main + overlay) and resume clocks."""
-        if self.paused:
+        """Unpause all playback and resume clocks (and envelopes)."""
+        if self.paused and self.mixer_ready:
             pygame.mixer.unpause()
             pygame.mixer.music.unpause()
-            now = time.time()
-            if self._pause_t is not None and self._anchor_t is not None:
-                paused_dur = now - self._pause_t
-                self._anchor_t += paused_dur
-            if (
-                self.overlay_active
-                and (self.overlay_start_t is not None)
-                and (self._overlay_pause_t is not None)
-            ):
-                paused_dur_ov = now - self._overlay_pause_t
-                self.overlay_start_t += paused_dur_ov
             self.paused = False
-            self._pause_t = None
-            self._overlay_pause_t = None
+            self.mixer.resume(self.timer() - self._paused_at)
+            self.clock.resume()
 
     def stop(self):
         """Stop all playback and reset state."""
-        pygame.mixer.music.stop()
-        try:
-            self.overlay_channel.stop()
-        except Exception:
-            pass
-        self.overlay_active = False
-        self.overlay_start_t = None
-        self.overlay_sound = None
-        self._overlay_pause_t = None
-
+        if self.mixer is not None:
+            self.mixer.stop_all()
         self.paused = False
-        self._anchor_t = None
-        self._pause_t = None
-        self._ramp_until = 0.0
-        self.tail_fade_active = False
-        self.tail_fade_t0 = None
-        self.tail_fade_dur = 0.0
+        self.clock.stop()
+        self._update_pins()
 
     def update(self):
         """
-        Call this periodically (e.g. from the GUI timer) to:
-        - maintain any tail fade on the main channel
-        - maintain any ramp-in on the main channel
+        Call this periodically (e.g. from the render thread) to:
+        - advance every voice's envelope (fades, ramps), keep the next PCM
+          chunk queued and drop voices that faded out or ended - unless the
+          mixer's fader thread does that (fade_hz > 0)
+        - keep the show clock locked to what the mixer is playing
         """
-        if self.tail_fade_active:
-            self._update_tail_fade()
-        else:
-            # Only apply ramp if we aren't running a tail fade
-            self._apply_ramp()
+        if self.mixer is None or self.paused:
+            return
+        if not self.mixer.running:
+            self.mixer.update(self.timer())
+        if self.mixer.drops != self._drops_seen:
+            self._drops_seen = self.mixer.drops
+            self._update_pins()
+        self._sync_clock()
+
+    def _sync_clock(self):
+        """Internal: correct the clock against the mixer's own position."""
+        v = self.mixer.current
+        if v is None or not self.clock.running:
+            return
+        if v.ended:
+            # Finished naturally: hold the playhead at its end
+            self.clock.hold(self.length or self.clock.position())
+            return
+        if not v.is_music:
+            # Started at an exact sample offset; chunks queue back to back,
+            # so the clock free-runs and only the end is checked
+            return
+        try:
+            ms = pygame.mixer.music.get_pos()
+            busy = pygame.mixer.music.get_busy()
+        except Exception:
+            return
+        if busy and ms >= 0:
+            self.clock.correct(v.start_s + ms / 1000.0 - self._output_latency_s)
 
     # ------------- Position reporting -------------
 
     def get_pos(self) -> float:
         """
-        Return the "current position" in seconds, for the UI timeline.
-        When an overlay is active (e.g. CUE 20), we report that position.
-        Otherwise we report the virtual clock for the main mixer.music track.
+        Return the "current position" in seconds, for the UI timeline:
+        the show clock, following the current voice.
         """
-        # If overlay is active, that is the "current cue"
-        if self.overlay_active and (self.overlay_start_t is not None):
-            if not self.overlay_channel.get_busy():
-                # Overlay finished naturally
-                self.overlay_active = False
-                self.overlay_start_t = None
-                return self.length or 0.0
-
-            # While paused, freeze the overlay clock (like the main clock)
-            if self.paused and (self._overlay_pause_t is not None):
-                pos = self._overlay_pause_t - self.overlay_start_t
-            else:
-                pos = time.time() - self.overlay_start_t
-
-            if (self.length > 0.0) and (pos > self.length):
-                pos = self.length
-            return pos
-
-        # Otherwise, use virtual clock for main music
-        if self._anchor_t is None:
-            return 0.0
-        if self.paused and (self._pause_t is not None):
-            return self._anchor_off + (self._pause_t - self._anchor_t)
-        pos = self._anchor_off + (time.time() - self._anchor_t)
+        pos = self.clock.position()
         if (self.length > 0.0) and (pos > self.length):
             pos = self.length
         return pos
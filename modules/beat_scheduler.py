@@ -0,0 +1,95 @@
+import os
+from array import array
+from bisect import bisect_right
+
+from util.wave_assets import load_beats
+
+
+class BeatScheduler:
+    """Dispatches beat times to a callback as playback passes them.
+
+    Beats live in an array('d'); a cursor points at the next beat that has
+    not fired. advance(pos) is O(1) per tick during normal playback (it only
+    looks at the cursor), and seek(pos) re-syncs the cursor with a bisect.
+
+    Beats fire lookahead_s early, so a light change triggered on the GUI
+    tick before the beat reaches the fixtures on the beat instead of up to
+    one tick late. If several beats are due at once (a stalled tick, a jump
+    forward), only the newest fires; the Rockin patterns depend only on the
+    beat index, so the result is the same.
+    """
+
+    def __init__(self, beats=None, on_beat=None, lookahead_s=0.04):
+        self.on_beat = on_beat
+        self.lookahead_s = max(0.0, float(lookahead_s))
+        self.beats = array("d")
+        self.tempo_bpm = 0.0
+        self._next = 0
+        self.last_index = -1
+        self.fired = 0
+        self.skipped = 0
+        if beats:
+            self.set_beats(beats)
+
+    @classmethod
+    def from_file(cls, path: str, on_beat=None, lookahead_s=0.04):
+        """Scheduler for a *_beats.json file; empty if it is missing or broken."""
+        sched = cls(on_beat=on_beat, lookahead_s=lookahead_s)
+        if path and os.path.exists(path):
+            try:
+                data = load_beats(path)
+            except Exception:
+                data = None
+            if data:
+                sched.set_beats(data["beats_sec"])
+                sched.tempo_bpm = data["tempo_bpm"]
+        return sched
+
+    def __len__(self):
+        return len(self.beats)
+
+    def set_beats(self, beats):
+        """Replace the beat list (seconds, any order) and rewind."""
+        self.beats = array("d", sorted(float(b) for b in beats))
+        self.tempo_bpm = 0.0
+        self.rewind()
+
+    def clear(self):
+        self.set_beats(())
+
+    def rewind(self):
+        self._next = 0
+        self.last_index = -1
+
+    def seek(self, pos: float, fire=True):
+        """Jump to pos. With fire, the last beat at or before pos is
+        dispatched so the lights show that step straight away."""
+        k = bisect_right(self.beats, pos + self.lookahead_s)
+        self._next = k
+        self.last_index = k - 1
+        if fire and k > 0 and self.on_beat is not None:
+            self.on_beat(k - 1, self.beats[k - 1])
+            self.fired += 1
+
+    def advance(self, pos: float) -> int:
+        """Fire the beat due by pos (+ look-ahead). Returns the index fired or -1."""
+        beats = self.beats
+        k = self._next
+        due = pos + self.lookahead_s
+        if k > 0 and due < beats[k - 1]:
+            # Position went backwards without a seek (restart, stop)
+            self.seek(pos, fire=False)
+            k = self._next
+        n = len(beats)
+        if k >= n or beats[k] > due:
+            return -1
+        k += 1
+        if k < n and beats[k] <= due:
+            k = bisect_right(beats, due, k)
+            self.skipped += k - self._next - 1
+        self._next = k
+        self.last_index = k - 1
+        self.fired += 1
+        if self.on_beat is not None:
+            self.on_beat(k - 1, beats[k - 1])
+        return k - 1
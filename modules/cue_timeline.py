@@ -0,0 +1,141 @@
+import json
+import os
+import re
+from array import array
+from bisect import bisect_right
+
+from modules import effects
+
+# A cue map (cues/cue-map.template.json) lists, per cue, segments like
+#
+#   {"t": 48.0, "pattern": "Fade", "blend": 2.0}
+#
+# t     - song position (seconds) where the segment starts
+# pattern - a look from effects.LOOKS, or an effect spec such as
+#         {"fx": "strobe", "hz": 8, "of": "White"} (see effects.build)
+# blend - optional crossfade (seconds) from the previous segment's pattern
+# speed - optional time scale for animated patterns (Fade)
+# hold  - optional; once reached the segment stays on, even if the song is
+#         sought back, until the timeline is reset (next cue load / RESET)
+#
+# A segment lasts until the next one starts; the last one runs to the end.
+
+
+class CueTimeline:
+    """One cue's segments compiled into sorted arrays.
+
+    colors(pos) finds the active segment through a cached cursor: during
+    normal playback pos only moves forward, so the lookup is the current or
+    the next segment (O(1)); anything else (seek, restart) falls back to a
+    bisect over the start times (O(log n)).
+
+    Each segment is an effect graph (modules/effects.py) producing NumPy
+    (n, 3) uint8 frames into buffers it owns: static looks render once,
+    animated ones once per (quantized) position however many outputs ask,
+    so a tick allocates nothing.
+    """
+
+    def __init__(self, segments, n=38):
+        self.n = n
+        segs = sorted(
+            (s for s in (segments or []) if isinstance(s, dict)),
+            key=lambda s: float(s.get("t", 0.0)),
+        )
+        if not segs or float(segs[0].get("t", 0.0)) > 0.0:
+            segs.insert(0, {"t": 0.0, "pattern": "Off"})
+
+        self.starts = array("d", (float(s.get("t", 0.0)) for s in segs))
+        self.blends = array("d", (max(0.0, float(s.get("blend", 0.0) or 0.0)) for s in segs))
+        self.speeds = array("d", (float(s.get("speed", 1.0)) for s in segs))
+        self.holds = [bool(s.get("hold", False)) for s in segs]
+        # First segment that latches, or None (see colors())
+        self.hold_start = next((self.starts[k] for k, h in enumerate(self.holds) if h), None)
+        self.patterns = [s.get("pattern", "Off") for s in segs]
+        # Normalized definition, e.g. to key a baked cache on
+        self.segments = [dict(s) for s in segs]
+        # One effect graph per segment; a blend wraps the previous segment's
+        # graph and this one in a Crossfade, sharing (and memoizing) both
+        self.looks = [
+            effects.build(p, speed).bind(n) for p, speed in zip(self.patterns, self.speeds)
+        ]
+        self.effects = list(self.looks)
+        for k in range(1, len(segs)):
+            if self.blends[k] > 0.0:
+                self.effects[k] = effects.Crossfade(
+                    self.looks[k - 1], self.looks[k], self.starts[k], self.blends[k]
+                ).bind(n)
+        self._cursor = 0
+        self._held = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def held(self):
+        """Index of the latched hold segment, or None."""
+        return self._held
+
+    def reset(self):
+        self._cursor = 0
+        self._held = None
+
+    def index_at(self, pos: float) -> int:
+        starts = self.starts
+        last = len(starts) - 1
+        i = self._cursor
+        if starts[i] <= pos:
+            if i == last or pos < starts[i + 1]:
+                return i
+            if i + 1 == last or pos < starts[i + 2]:
+                self._cursor = i + 1
+                return i + 1
+        i = max(0, bisect_right(starts, pos) - 1)
+        self._cursor = i
+        return i
+
+    def colors(self, pos: float):
+        """(n, 3) uint8 frame at song position pos.
+
+        The array is owned by the timeline's effects and may be overwritten
+        on the next call; copy it (tolist/tobytes) to keep it.
+        """
+        i = self._held
+        if i is None:
+            i = self.index_at(pos)
+            if self.holds[i]:
+                self._held = i
+        elif pos < self.starts[i]:
+            # Latched and sought back before the segment: no blend-in
+            return self.looks[i].frame(pos)
+        return self.effects[i].frame(pos)
+
+
+def _cue_id(name: str):
+    m = re.match(r"\s*CUE\s+(\d+)", name, re.IGNORECASE)
+    return m.group(1) if m else name
+
+
+def load_cue_map(path: str, n=38):
+    """Cue map JSON -> {cue id: CueTimeline}, e.g. {"20": ...}.
+
+    Keys like "CUE 20 - HEAD ELF" are reduced to their number. A missing or
+    broken file gives an empty map.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except Exception:
+        return {}
+    out = {}
+    if isinstance(raw, dict):
+        for name, segments in raw.items():
+            if isinstance(segments, list):
+                out[_cue_id(str(name))] = CueTimeline(segments, n)
+    return out
+
+
+def cue_map_path(cfg: dict, app_root: str) -> str:
+    path = cfg.get("cue_map") or "cues/cue-map.template.json"
+    if not os.path.isabs(path):
+        path = os.path.join(app_root, path)
+    return path
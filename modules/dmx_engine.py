@@ -6,46 +6,335 @@ try:
 except Exception:
     serial = None
 
+from modules.dmx_universe import DMX_CHANNELS, Universe
+from modules.dmx_timing import DMXTiming
+
+# Enttec DMX USB Pro framing (the UltraDMX Micro speaks the same protocol):
+#   0x7E, label, len LSB, len MSB, <payload>, 0xE7
+# Label 6 = "Output Only Send DMX Packet"; payload = start code + channels.
+ENTTEC_SOM = 0x7E
+ENTTEC_EOM = 0xE7
+ENTTEC_LABEL_SEND_DMX = 6
+ENTTEC_HEADER = 5  # SOM, label, len LSB, len MSB, DMX start code
+ENTTEC_FOOTER = 1  # EOM
+
+# Last part of each frame wait is spent yielding instead of sleeping, because
+# Event.wait() on Windows only wakes on the ~15 ms system tick.
+_SPIN_S = 0.002
+
+
+def _port_name(com_port) -> str:
+    """COM number (11 / "11") -> "COM11"; anything else is used verbatim
+    (e.g. "COM3", "/dev/ttyUSB0" or a pseudo-terminal like "/dev/pts/4")."""
+    if isinstance(com_port, int) or str(com_port).isdigit():
+        return f"COM{int(com_port)}"
+    return str(com_port)
+
+
+class SerialBackend:
+    """DMX-USB Pro output over a COM port (single universe).
+
+    Output backends share this small interface with the network ones in
+    modules/dmx_net.py:
+      - headroom / tailroom: packet bytes around each universe's channels
+      - prepare(universe, index): write the static packet header once
+      - open() -> bool, close(), is_open
+      - send(universes, due): write every universe whose flag in due is set,
+        return the byte count; raise if the device is gone
+    """
+
+    name = "serial"
+    headroom = ENTTEC_HEADER
+    tailroom = ENTTEC_FOOTER
+    max_universes = 1
+
+    def __init__(self, com_port, baud=57600, write_timeout=0.1):
+        self.com_port = com_port
+        self.baud = int(baud or 57600)
+        self.write_timeout = write_timeout
+        self._ser = None
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self._ser) and getattr(self._ser, "is_open", True)
+
+    def prepare(self, universe: Universe, index: int):
+        n = universe.size
+        pkt = universe.raw
+        pkt[0] = ENTTEC_SOM
+        pkt[1] = ENTTEC_LABEL_SEND_DMX
+        pkt[2] = (n + 1) & 0xFF
+        pkt[3] = (n + 1) >> 8
+        pkt[4] = 0x00  # DMX start code
+        pkt[-1] = ENTTEC_EOM
+
+    def open(self) -> bool:
+        """Try to open the COM port. Returns True on success."""
+        if serial is None:
+            return False
+        try:
+            # DMXKing UltraDMX Micro uses 57,600 baud in DMX-USB Pro mode.
+            # A write that takes longer than a couple of frames means the
+            # device is gone; let it raise instead of hanging the sender.
+            self._ser = serial.Serial(
+                _port_name(self.com_port),
+                self.baud,
+                timeout=0,
+                write_timeout=self.write_timeout,
+            )
+            return True
+        except Exception:
+            self._ser = None
+            return False
+
+    def close(self):
+        """Close the COM port if it is open."""
+        try:
+            if self._ser and getattr(self._ser, "is_open", False):
+                self._ser.close()
+        except Exception:
+            # Ignore any OS/USB errors on shutdown
+            pass
+        finally:
+            self._ser = None
+
+    def send(self, universes, due) -> int:
+        if not due[0]:
+            return 0
+        frame = universes[0].frame
+        self._ser.write(frame)
+        return len(frame)
+
+
+class NullBackend:
+    """Always-open output that discards frames.
+
+    For show runs without hardware (frame recording, offline render,
+    benchmarks of everything up to the wire).
+    """
+
+    name = "null"
+    headroom = 0
+    tailroom = 0
+
+    def __init__(self):
+        self._open = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._open
+
+    def prepare(self, universe: Universe, index: int):
+        pass
+
+    def open(self) -> bool:
+        self._open = True
+        return True
+
+    def close(self):
+        self._open = False
+
+    def send(self, universes, due) -> int:
+        return sum(len(u.frame) for u, d in zip(universes, due) if d)
+
 
 class DMXEngine:
-    """Lightweight DMX presence checker with online/offline gate.
+    """DMX output engine with online/offline gate.
 
-    - Opens a given COM port at 57,600 baud.
-    - Periodically checks that the port is still alive.
+    - Writes through a pluggable backend: SerialBackend (DMX-USB Pro on a
+      COM port at 57,600 baud, the default) or the Art-Net / sACN backends
+      in modules/dmx_net.py for one or more universes.
+    - A dedicated sender thread writes one frame per universe every
+      1/frame_rate seconds, scheduled against perf_counter deadlines so the
+      average rate does not drift.
+    - submit() / submit_colors() hand a new frame to the sender without
+      blocking; the sender always transmits the most recent one.
+    - Each universe lives inside its preallocated packet, so the fixture
+      patch scatters colors straight into what goes on the wire.
+    - Submits that arrive between two sends collapse into one frame, and a
+      universe whose channels did not change is skipped; the output still
+      gets a keep-alive refresh at least keepalive_hz times per second.
+    - timing keeps rolling histograms of submit -> wire latency and sender
+      jitter (see modules/dmx_timing.py).
+    - An optional FrameRecorder (modules/dmx_recorder.py) logs every frame
+      that goes out.
+    - A lost or missing device is retried with exponential backoff
+      (reconnect_min_s doubling up to reconnect_max_s); stop() and
+      set_online() wake the thread immediately instead of waiting out a
+      sleep. The first frame after a reconnect goes out straight away and
+      the time from loss to that frame is kept in last_reconnect_s.
     - Emits simple status strings via the callback:
         "green" -> DMX interface present / port open
         "red"   -> DMX missing / error / offline
     """
 
-    def __init__(self, com_port, status_cb=lambda s: None):
+    def __init__(
+        self,
+        com_port,
+        status_cb=lambda s: None,
+        frame_rate=40,
+        baud=57600,
+        patch=None,
+        keepalive_hz=1.0,
+        backend=None,
+        universes=1,
+        reconnect_min_s=0.25,
+        reconnect_max_s=5.0,
+    ):
         self.com_port = com_port
         self.status_cb = status_cb
         self.online = True
+        self.frame_rate = max(1.0, float(frame_rate or 40))
+        self.baud = int(baud or 57600)
+        # 0 disables skipping: every tick goes out
+        keepalive_hz = float(keepalive_hz or 0.0)
+        self.keepalive_s = (1.0 / keepalive_hz) if keepalive_hz > 0.0 else 0.0
+
+        if backend is None:
+            backend = SerialBackend(
+                com_port,
+                self.baud,
+                write_timeout=max(0.1, 4.0 / self.frame_rate),
+            )
+        self.backend = backend
 
         self._stop = threading.Event()
+        # Set by stop() / set_online() so every wait in the sender returns at once
+        self._wake = threading.Event()
         self._thread = None
-        self._ser = None
+
+        # Reconnect state machine (see _run)
+        self.state = "connecting"
+        self.reconnect_min_s = float(reconnect_min_s)
+        self.reconnect_max_s = max(self.reconnect_min_s, float(reconnect_max_s))
+        self.connects = 0
+        self.last_reconnect_s = None
+
+        # Every universe is embedded in its own preallocated packet; the
+        # backend writes universe.frame as-is.
+        count = max(1, int(universes or 1))
+        count = min(count, getattr(backend, "max_universes", count))
+        self.universes = []
+        for i in range(count):
+            u = Universe(DMX_CHANNELS, headroom=backend.headroom, tailroom=backend.tailroom)
+            backend.prepare(u, i)
+            self.universes.append(u)
+        self.universe = self.universes[0]
+
+        self.patches = [None] * count
+        if patch is not None:
+            self.set_patch(patch)
+
+        # Latest submitted frame per universe, picked up by the sender thread:
+        # ("raw", channel bytes, submit time) or ("rgb", flattened colors, submit time)
+        self._frame_lock = threading.Lock()
+        self._pending = [None] * count
+        self._taken = [None] * count
+        self._submit_t = [None] * count
+        self._due = [False] * count
+        self._last_send_t = [None] * count
+        self._force_send = True
+
+        # Output counters (see counters()); one universe packet = one frame
+        self.frames_submitted = 0
+        self.frames_coalesced = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.bytes_sent = 0
+
+        # Achieved scheduler rate, sent + skipped (updated about once per second)
+        self.actual_fps = 0.0
+        self._fps_t0 = None
+        self._fps_n = 0
+
+        self.timing = DMXTiming()
+        self._last_submit_t = None
+        self.recorder = None
+
+    @property
+    def patch(self):
+        return self.patches[0]
 
     # ------------------------------------------------------------------
     # Public control
     # ------------------------------------------------------------------
 
     def start(self):
-        """Start the background monitoring thread."""
+        """Start the background sender thread."""
         if self._thread and self._thread.is_alive():
             return
         self._stop.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread = threading.Thread(target=self._run, name="DMXSender", daemon=True)
         self._thread.start()
 
     def stop(self):
-        """Stop monitoring and close the port."""
+        """Stop sending and close the output (takes effect immediately)."""
         self._stop.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
         self._close()
 
     def set_online(self, online: bool):
-        """Enable/disable DMX checking (legacy hook)."""
+        """Enable/disable DMX output (legacy hook); wakes the sender thread."""
         self.online = bool(online)
+        self._wake.set()
+
+    def set_patch(self, patch, universe: int = 0):
+        """Use a compiled FixturePatch for submit_colors() on a universe."""
+        self.patches[universe] = patch
+        if patch is not None:
+            patch.apply_defaults(self.universes[universe])
+
+    def set_recorder(self, recorder):
+        """Log every outgoing universe frame to recorder (None to stop)."""
+        self.recorder = recorder
+
+    def flush(self, now=None) -> bool:
+        """Apply pending submits and write what is due from the calling thread.
+
+        For offline rendering and benchmarks only: the sender thread must not
+        be running. Returns True if anything was written.
+        """
+        if not self.backend.is_open and not self._open():
+            return False
+        return self._send_frame(time.perf_counter() if now is None else now)
+
+    def submit(self, frame, universe: int = 0):
+        """Queue a universe (bytes-like, up to 512 channel values) for output.
+
+        Never blocks on the port: the frame is only parked for the sender
+        thread, and a newer submit simply replaces one that was not sent yet.
+        """
+        frame = bytes(frame[:DMX_CHANNELS])
+        self._park(universe, "raw", frame)
+
+    def submit_colors(self, cols, universe: int = 0):
+        """Queue one (r, g, b) per fixture; the patch maps them to channels."""
+        patch = self.patches[universe]
+        if patch is None:
+            return
+        self._park(universe, "rgb", patch.flatten(cols))
+
+    def record_compute(self, seconds: float):
+        """Let the app report how long building one frame of colors took."""
+        self.timing.record("compute", seconds)
+
+    def counters(self) -> dict:
+        """Snapshot of the output counters, for the UI or a log line."""
+        return {
+            "submitted": self.frames_submitted,
+            "coalesced": self.frames_coalesced,
+            "sent": self.frames_sent,
+            "skipped": self.frames_skipped,
+            "bytes_sent": self.bytes_sent,
+            "fps": round(self.actual_fps, 2),
+            "state": self.state,
+            "connects": self.connects,
+            "last_reconnect_ms": (
+                None if self.last_reconnect_s is None else round(self.last_reconnect_s * 1000.0, 1)
+            ),
+        }
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -59,77 +348,232 @@ class DMXEngine:
             pass
 
     def _open(self) -> bool:
-        """Try to open the COM port. Returns True on success."""
-        if serial is None:
-            return False
-        try:
-            # DMXKing UltraDMX Micro uses 57,600 baud in DMX-USB Pro mode.
-            self._ser = serial.Serial(f"COM{self.com_port}", 57600, timeout=0)
-            return True
-        except Exception:
-            self._ser = None
+        """Try to open the output. Returns True on success."""
+        if not self.backend.open():
             return False
+        # Fresh port: push every universe right away
+        self._force_send = True
+        return True
 
     def _close(self):
-        """Close the COM port if it is open."""
+        """Close the output if it is open."""
         try:
-            if self._ser and getattr(self._ser, "is_open", False):
-                self._ser.close()
+            self.backend.close()
         except Exception:
-            # Ignore any OS/USB errors on shutdown
             pass
-        finally:
-            self._ser = None
+
+    def _park(self, universe: int, kind: str, payload):
+        now = time.perf_counter()
+        if universe == 0:
+            if self._last_submit_t is not None:
+                self.timing.record("tick", now - self._last_submit_t)
+            self._last_submit_t = now
+        with self._frame_lock:
+            if self._pending[universe] is not None:
+                self.frames_coalesced += 1
+            self._pending[universe] = (kind, payload, now)
+            self.frames_submitted += 1
+
+    def _take_pending(self):
+        taken = self._taken
+        with self._frame_lock:
+            pending = self._pending
+            for i in range(len(pending)):
+                taken[i] = pending[i]
+                pending[i] = None
+        return taken
+
+    def _apply_pending(self):
+        for i, pending in enumerate(self._take_pending()):
+            if pending is None:
+                continue
+            kind, payload, self._submit_t[i] = pending
+            if kind == "rgb":
+                patch = self.patches[i]
+                if patch is not None:
+                    patch.scatter(self.universes[i], payload)
+            else:
+                self.universes[i].write(0, payload)
+
+    def _send_frame(self, now: float) -> bool:
+        """Send every universe that changed or whose keep-alive is due.
+        Returns True if anything was written (raises if the output died)."""
+        self._apply_pending()
+        due = self._due
+        n_due = 0
+        for i, u in enumerate(self.universes):
+            last = self._last_send_t[i]
+            due[i] = (
+                u.take_dirty() is not None
+                or self._force_send
+                or self.keepalive_s <= 0.0
+                or last is None
+                or (now - last) >= self.keepalive_s
+            )
+            if due[i]:
+                n_due += 1
+            else:
+                self.frames_skipped += 1
+                # Unchanged frame: nothing of it reaches the wire
+                self._submit_t[i] = None
+        if not n_due:
+            return False
+        t_ser = time.perf_counter()
+        self.bytes_sent += self.backend.send(self.universes, due)
+        t_wire = time.perf_counter()
+        self._force_send = False
+        self.frames_sent += n_due
+
+        timing = self.timing
+        submit_t = self._submit_t
+        recorder = self.recorder
+        for i in range(len(due)):
+            if not due[i]:
+                continue
+            self._last_send_t[i] = now
+            if recorder is not None:
+                try:
+                    recorder.record(i, self.universes[i].data, now)
+                except Exception:
+                    # A full disk must not take the lights down
+                    self.recorder = recorder = None
+            t0 = submit_t[i]
+            if t0 is not None:
+                timing.record("queue", t_ser - t0)
+                timing.record("write", t_wire - t_ser)
+                timing.record("latency", t_wire - t0)
+                submit_t[i] = None
+        return True
+
+    def _count_fps(self, now: float):
+        if self._fps_t0 is None:
+            self._fps_t0 = now
+            self._fps_n = 0
+            return
+        self._fps_n += 1
+        elapsed = now - self._fps_t0
+        if elapsed >= 1.0:
+            self.actual_fps = self._fps_n / elapsed
+            self._fps_t0 = now
+            self._fps_n = 0
+
+    def _reset_fps(self):
+        self._fps_t0 = None
+        self._fps_n = 0
+        self.actual_fps = 0.0
+
+    def _wait_until(self, deadline: float) -> bool:
+        """Sleep until the perf_counter deadline. Returns False if woken
+        early by stop() or set_online()."""
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0.0:
+                return True
+            if remaining > _SPIN_S:
+                if self._wake.wait(remaining - _SPIN_S):
+                    return False
+            else:
+                time.sleep(0)
+
+    def _set_state(self, state: str):
+        self.state = state
+
+    def _go_down(self, state: str):
+        """Leave the connected state: close the output, emit red once."""
+        was_ok = self.state == "connected"
+        self._close()
+        self._set_state(state)
+        if was_ok:
+            self._reset_fps()
+            self._emit("red")
 
     # ------------------------------------------------------------------
     # Background thread
     # ------------------------------------------------------------------
 
     def _run(self):
-        """Background loop: keep an eye on the COM port and emit status."""
-        was_ok = False
+        """Background loop: keep the output open and stream frames at frame_rate.
+
+        States: "connecting" (open attempt / waiting for the first write),
+        "connected", "backoff" (open or write failed; retry after a delay
+        that doubles up to reconnect_max_s) and "offline" (online gate off;
+        parked until set_online() or stop() wakes the thread).
+        """
+        period = 1.0 / self.frame_rate
+        next_t = None
+        last_tick = None
+        backoff = self.reconnect_min_s
+        lost_t = time.perf_counter()
 
         while not self._stop.is_set():
+            self._wake.clear()
+
             if not self.online:
                 # Offline mode: treat as red and don't touch the port
-                if was_ok:
-                    was_ok = False
-                    self._emit("red")
-                time.sleep(0.25)
+                self._go_down("offline")
+                next_t = last_tick = lost_t = None
+                self._wake.wait()
                 continue
 
+            if lost_t is None:
+                lost_t = time.perf_counter()
+
             # If we think we have a port but it's been closed, drop it
-            if self._ser and hasattr(self._ser, "is_open") and not self._ser.is_open:
-                self._close()
-                if was_ok:
-                    was_ok = False
-                    self._emit("red")
-
-            # No open port: try to open it
-            if not self._ser and not self._open():
-                if was_ok:
-                    was_ok = False
-                    self._emit("red")
-                time.sleep(0.5)
+            if self.state == "connected" and not self.backend.is_open:
+                self._go_down("backoff")
+                lost_t = time.perf_counter()
+
+            # No open port: try to open it, backing off on failure
+            if not self.backend.is_open:
+                self._set_state("connecting")
+                if not self._open():
+                    self._set_state("backoff")
+                    self._wake.wait(backoff)
+                    backoff = min(backoff * 2.0, self.reconnect_max_s)
+                    continue
+                # First frame after (re)connect goes out right away
+                backoff = self.reconnect_min_s
+                next_t = time.perf_counter()
+                last_tick = None
+
+            if next_t is None:
+                next_t = time.perf_counter()
+            if not self._wait_until(next_t):
+                # Woken early (stop / online toggle): re-check state
                 continue
 
-            # At this point we have an open port. Poke it lightly.
+            tick = time.perf_counter()
+            if last_tick is not None:
+                self.timing.record("jitter", abs((tick - last_tick) - period))
+            last_tick = tick
+
             try:
-                # Writing empty bytes is effectively a no-op but will throw
-                # if the USB/COM device disappeared.
-                if self._ser:
-                    self._ser.write(b"")
-                if not was_ok:
-                    was_ok = True
-                    self._emit("green")
+                self._send_frame(tick)
             except Exception:
                 # Something went wrong (likely unplugged) -> mark red.
-                self._close()
-                if was_ok:
-                    was_ok = False
-                    self._emit("red")
+                self._go_down("backoff")
+                next_t = last_tick = None
+                lost_t = time.perf_counter()
+                self._wake.wait(backoff)
+                backoff = min(backoff * 2.0, self.reconnect_max_s)
+                continue
+
+            now = time.perf_counter()
+            if self.state != "connected":
+                self._set_state("connected")
+                self.connects += 1
+                self.last_reconnect_s = now - lost_t
+                lost_t = None
+                self._emit("green")
+            self._count_fps(now)
 
-            time.sleep(0.2)
+            # Fixed-rate schedule: advance by exactly one period so small
+            # oversleeps are paid back on the next frame. If we fell more
+            # than a whole frame behind (GC pause, USB stall), resync instead
+            # of bursting frames to catch up.
+            next_t += period
+            if now - next_t > period:
+                next_t = now + period
 
         # Thread is shutting down
         self._close()
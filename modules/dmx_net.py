@@ -0,0 +1,211 @@
+import socket
+import struct
+import uuid
+
+from modules.dmx_universe import Universe
+from modules.dmx_engine import NullBackend
+
+ARTNET_PORT = 6454
+SACN_PORT = 5568
+
+# ArtDmx: "Art-Net\0", OpOutput (LE), ProtVer 14 (BE), Sequence, Physical,
+# SubUni, Net, Length (BE), then the channel data.
+ARTNET_HEADER = 18
+_ARTNET_ID = b"Art-Net\x00"
+_ARTNET_OP_DMX = 0x5000
+_ARTNET_PROTVER = 14
+
+# E1.31 data packet: root layer (38) + framing layer (77) + DMP layer (10)
+# + start code (1) = 126 bytes before the 512 channels.
+SACN_HEADER = 126
+_ACN_ID = b"ASC-E1.17\x00\x00\x00"
+_SACN_DEFAULT_PRIORITY = 100
+
+
+def _sacn_multicast(universe: int) -> str:
+    return f"239.255.{(universe >> 8) & 0xFF}.{universe & 0xFF}"
+
+
+class _UDPBackend:
+    """Shared socket handling for the network backends.
+
+    One non-blocking UDP socket; send() writes one datagram per due universe
+    straight from the universe's packet buffer. A full socket buffer drops
+    that universe's packet for this frame (counted in dropped) instead of
+    stalling the sender thread.
+    """
+
+    name = "udp"
+    headroom = 0
+    tailroom = 0
+    default_port = 0
+
+    def __init__(self, host="", port=None, first_universe=0):
+        self.host = host or ""
+        self.port = int(port or self.default_port)
+        self.first_universe = int(first_universe)
+        self.dropped = 0
+        self._sock = None
+        self._addrs = []
+        self._seq = []
+
+    @property
+    def is_open(self) -> bool:
+        return self._sock is not None
+
+    def _addr_for(self, net_universe: int):
+        return (self.host, self.port)
+
+    def prepare(self, universe: Universe, index: int):
+        net_universe = self.first_universe + index
+        while len(self._addrs) <= index:
+            self._addrs.append(None)
+            self._seq.append(0)
+        self._addrs[index] = self._addr_for(net_universe)
+        self._write_header(universe, net_universe)
+
+    def _write_header(self, universe: Universe, net_universe: int):
+        raise NotImplementedError
+
+    def _stamp(self, universe: Universe, index: int):
+        """Per-packet header fields (sequence number)."""
+        raise NotImplementedError
+
+    def open(self) -> bool:
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+            sock.setblocking(False)
+        except Exception:
+            return False
+        self._sock = sock
+        return True
+
+    def close(self):
+        try:
+            if self._sock is not None:
+                self._sock.close()
+        except Exception:
+            pass
+        finally:
+            self._sock = None
+
+    def send(self, universes, due) -> int:
+        sock = self._sock
+        sent = 0
+        for i, u in enumerate(universes):
+            if not due[i]:
+                continue
+            self._stamp(u, i)
+            try:
+                sent += sock.sendto(u.frame, self._addrs[i])
+            except (BlockingIOError, InterruptedError):
+                self.dropped += 1
+        return sent
+
+
+class ArtNetBackend(_UDPBackend):
+    """Art-Net 4 ArtDmx output; universe i goes to port-address first_universe + i.
+
+    host is the node's IP (unicast, recommended) or a broadcast address
+    such as 2.255.255.255.
+    """
+
+    name = "artnet"
+    headroom = ARTNET_HEADER
+    default_port = ARTNET_PORT
+
+    def __init__(self, host="2.255.255.255", port=None, first_universe=0):
+        super().__init__(host or "2.255.255.255", port, first_universe)
+
+    def _write_header(self, universe: Universe, net_universe: int):
+        pkt = universe.raw
+        pkt[0:8] = _ARTNET_ID
+        struct.pack_into("<H", pkt, 8, _ARTNET_OP_DMX)
+        struct.pack_into(">H", pkt, 10, _ARTNET_PROTVER)
+        pkt[12] = 0  # sequence, stamped per packet
+        pkt[13] = 0  # physical input port
+        pkt[14] = net_universe & 0xFF  # SubUni
+        pkt[15] = (net_universe >> 8) & 0x7F  # Net
+        struct.pack_into(">H", pkt, 16, universe.size)
+
+    def _stamp(self, universe: Universe, index: int):
+        # 1..255; 0 would tell the node to ignore ordering
+        seq = self._seq[index] % 255 + 1
+        self._seq[index] = seq
+        universe.raw[12] = seq
+
+
+class SACNBackend(_UDPBackend):
+    """ANSI E1.31 (sACN) data packets; universe i is E1.31 universe first_universe + i.
+
+    With no host, each universe goes to its standard multicast group
+    (239.255.hi.lo); otherwise packets are unicast to host.
+    """
+
+    name = "sacn"
+    headroom = SACN_HEADER
+    default_port = SACN_PORT
+
+    def __init__(self, host="", port=None, first_universe=1,
+                 source_name="Polar Ninja", priority=_SACN_DEFAULT_PRIORITY, cid=None):
+        super().__init__(host, port, max(1, int(first_universe)))
+        self.source_name = source_name
+        self.priority = max(0, min(200, int(priority)))
+        self.cid = cid or uuid.uuid4().bytes
+
+    def _addr_for(self, net_universe: int):
+        return (self.host or _sacn_multicast(net_universe), self.port)
+
+    def _write_header(self, universe: Universe, net_universe: int):
+        pkt = universe.raw
+        size = universe.size
+        total = SACN_HEADER + size
+        # Root layer
+        struct.pack_into(">HH", pkt, 0, 0x0010, 0x0000)
+        pkt[4:16] = _ACN_ID
+        struct.pack_into(">HI", pkt, 16, 0x7000 | (total - 16), 0x00000004)
+        pkt[22:38] = self.cid
+        # Framing layer
+        struct.pack_into(">HI", pkt, 38, 0x7000 | (total - 38), 0x00000002)
+        name = self.source_name.encode("utf-8")[:63]
+        pkt[44:108] = name + bytes(64 - len(name))
+        pkt[108] = self.priority
+        struct.pack_into(">H", pkt, 109, 0)  # no sync address
+        pkt[111] = 0  # sequence, stamped per packet
+        pkt[112] = 0  # options
+        struct.pack_into(">H", pkt, 113, net_universe)
+        # DMP layer
+        struct.pack_into(">HBBHHH", pkt, 115, 0x7000 | (total - 115), 0x02, 0xA1, 0x0000, 0x0001, size + 1)
+        pkt[125] = 0x00  # DMX start code
+
+    def _stamp(self, universe: Universe, index: int):
+        seq = (self._seq[index] + 1) & 0xFF
+        self._seq[index] = seq
+        universe.raw[111] = seq
+
+
+BACKENDS = {
+    "artnet": ArtNetBackend,
+    "sacn": SACNBackend,
+    "null": NullBackend,
+}
+
+
+def make_backend(cfg: dict):
+    """Backend from settings ("artnet", "sacn" or "null"), or None for the
+    default serial output."""
+    kind = str(cfg.get("dmx_output", "serial") or "serial").lower()
+    cls = BACKENDS.get(kind)
+    if cls is None:
+        return None
+    if cls is NullBackend:
+        return cls()
+    kwargs = {
+        "host": cfg.get("dmx_net_host", ""),
+        "port": cfg.get("dmx_net_port") or None,
+    }
+    if cfg.get("dmx_first_universe") is not None:
+        kwargs["first_universe"] = cfg.get("dmx_first_universe")
+    return cls(**kwargs)
@@ -0,0 +1,226 @@
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_right
+
+# Frame log layout (little-endian), append-only:
+#   header : magic "PNDMXLOG", version u16, universe size u16, frame rate f32
+#   record : t f64 (seconds since the first recorded frame),
+#            universe u16, length u16, <length channel bytes>
+LOG_MAGIC = b"PNDMXLOG"
+LOG_VERSION = 1
+_HEADER = struct.Struct("<8sHHf")
+_RECORD = struct.Struct("<dHH")
+
+
+class FrameRecorder:
+    """Writes every outgoing universe frame to a binary frame log.
+
+    Attach with DMXEngine.set_recorder(); the sender thread then calls
+    record() right after each write. Records go through one preallocated
+    header buffer and a large write buffer, so the sender never formats
+    or allocates per frame.
+    """
+
+    def __init__(self, path: str, frame_rate=40.0, universe_size=512, buffering=1 << 20):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._f = open(path, "wb", buffering=buffering)
+        self._f.write(_HEADER.pack(LOG_MAGIC, LOG_VERSION, int(universe_size), float(frame_rate)))
+        self._hdr = bytearray(_RECORD.size)
+        self.t0 = None
+        self.frames = 0
+
+    def record(self, universe: int, data, t=None):
+        """Append one frame; t is the sender's clock (default: perf_counter now)."""
+        f = self._f
+        if f is None:
+            return
+        if t is None:
+            t = time.perf_counter()
+        if self.t0 is None:
+            self.t0 = t
+        _RECORD.pack_into(self._hdr, 0, t - self.t0, universe, len(data))
+        f.write(self._hdr)
+        f.write(data)
+        self.frames += 1
+
+    def close(self):
+        f, self._f = self._f, None
+        if f is not None:
+            try:
+                f.close()
+            except Exception:
+                pass
+
+
+class FrameLog:
+    """Memory-mapped reader for a frame log.
+
+    Opening walks the record headers once to index them; frame data is
+    returned as memoryview slices of the map, never copied.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _HEADER.size:
+            self._file.close()
+            raise ValueError(f"Not a DMX frame log: {path}")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        magic, version, usize, rate = _HEADER.unpack_from(self._mm, 0)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            self.close()
+            raise ValueError(f"Not a DMX frame log: {path}")
+        self.universe_size = usize
+        self.frame_rate = rate
+
+        self.times = array("d")
+        self.universes = array("H")
+        self.offsets = array("Q")
+        self.lengths = array("H")
+        # per universe: (times, record indices) for frame_at()
+        self._by_universe = {}
+
+        pos = _HEADER.size
+        rec = _RECORD.size
+        while pos + rec <= size:
+            t, u, n = _RECORD.unpack_from(self._mm, pos)
+            if pos + rec + n > size:
+                break  # torn last record (recording was killed mid-write)
+            idx = len(self.times)
+            self.times.append(t)
+            self.universes.append(u)
+            self.offsets.append(pos + rec)
+            self.lengths.append(n)
+            ts, ids = self._by_universe.setdefault(u, (array("d"), array("I")))
+            ts.append(t)
+            ids.append(idx)
+            pos += rec + n
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def duration(self) -> float:
+        return self.times[-1] if self.times else 0.0
+
+    def universe_ids(self):
+        return sorted(self._by_universe)
+
+    def data(self, i: int):
+        off = self.offsets[i]
+        return self._view[off:off + self.lengths[i]]
+
+    def frame_at(self, t: float, universe: int = 0):
+        """The frame of a universe that was on the wire at time t (or None)."""
+        entry = self._by_universe.get(universe)
+        if entry is None:
+            return None
+        ts, ids = entry
+        k = bisect_right(ts, t) - 1
+        if k < 0:
+            return None
+        return self.data(ids[k])
+
+    def close(self):
+        try:
+            self._view.release()
+            self._mm.close()
+        except Exception:
+            pass
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+
+def replay(log: FrameLog, engine, speed=1.0, stop_event=None):
+    """Stream a recorded show into a running DMXEngine.
+
+    speed 1.0 keeps the original timing, 2.0 plays twice as fast, 0 submits
+    as fast as possible (the engine's frame rate then coalesces).
+    Returns the wall time taken.
+    """
+    t_start = time.perf_counter()
+    for i in range(len(log)):
+        if stop_event is not None and stop_event.is_set():
+            break
+        if speed and speed > 0.0:
+            due = t_start + log.times[i] / speed
+            delay = due - time.perf_counter()
+            if delay > 0.0:
+                if stop_event is not None:
+                    if stop_event.wait(delay):
+                        break
+                else:
+                    time.sleep(delay)
+        engine.submit(log.data(i), universe=log.universes[i])
+    return time.perf_counter() - t_start
+
+
+def bench(log: FrameLog, engine, repeat=1):
+    """Push every recorded frame through the engine's send path (universe
+    patch, change tracking, backend write) as fast as possible, bypassing
+    the frame scheduler. The engine must not be started.
+
+    Returns (frames pushed, seconds).
+    """
+    n = 0
+    t0 = time.perf_counter()
+    for _ in range(max(1, int(repeat))):
+        for i in range(len(log)):
+            engine.submit(log.data(i), universe=log.universes[i])
+            engine.flush()
+            n += 1
+    return n, time.perf_counter() - t0
+
+
+def compare(run: FrameLog, golden: FrameLog, step=None, tolerance=0):
+    """Sample both logs on the same clock and count frames that differ.
+
+    step defaults to one frame period of the golden log. Channels whose
+    values differ by no more than tolerance count as equal.
+    Returns a dict with samples, mismatches, max channel diff and the first
+    mismatch time (or None).
+    """
+    rate = golden.frame_rate or run.frame_rate or 40.0
+    step = float(step or (1.0 / rate))
+    end = max(run.duration, golden.duration)
+    universes = sorted(set(run.universe_ids()) | set(golden.universe_ids()))
+    samples = mismatches = max_diff = 0
+    first = None
+    k = 0
+    while True:
+        t = k * step
+        if t > end:
+            break
+        for u in universes:
+            a = run.frame_at(t, u)
+            b = golden.frame_at(t, u)
+            samples += 1
+            if a is None or b is None:
+                if a is not b:
+                    mismatches += 1
+                    first = t if first is None else first
+                continue
+            if a == b:
+                continue
+            diff = max(abs(x - y) for x, y in zip(a, b))
+            max_diff = max(max_diff, diff)
+            if diff > tolerance or len(a) != len(b):
+                mismatches += 1
+                first = t if first is None else first
+        k += 1
+    return {
+        "samples": samples,
+        "mismatches": mismatches,
+        "max_diff": max_diff,
+        "first_mismatch_s": first,
+    }
@@ -0,0 +1,133 @@
+import math
+from array import array
+
+# Log-spaced bins from 10 us to 10 s, ~12% wide: percentiles come back
+# within one bin, which is plenty to tell a 2 ms USB write from a 60 ms stall.
+_LO_S = 1e-5
+_RATIO = 1.12
+_LOG_RATIO = math.log(_RATIO)
+_NBINS = int(math.ceil(math.log(10.0 / _LO_S) / _LOG_RATIO)) + 1
+
+
+def _bin_of(value: float) -> int:
+    if value <= _LO_S:
+        return 0
+    b = int(math.log(value / _LO_S) / _LOG_RATIO) + 1
+    return b if b < _NBINS else _NBINS - 1
+
+
+def _bin_upper(b: int) -> float:
+    return _LO_S * (_RATIO ** b)
+
+
+class RollingHistogram:
+    """Histogram over the last `window` samples (seconds).
+
+    All storage is preallocated: record() overwrites one ring slot and moves
+    one count between bins, so nothing is allocated per frame. Percentiles
+    are read from the bins (upper bin edge, capped at the window max); max
+    is exact over the window.
+    """
+
+    def __init__(self, window=2048):
+        self.window = max(1, int(window))
+        self.counts = array("I", bytes(4 * _NBINS))
+        self._ring = array("d", bytes(8 * self.window))
+        self._bins = array("H", bytes(2 * self.window))
+        self._next = 0
+        self.n = 0
+        self.total = 0
+
+    def record(self, value: float):
+        i = self._next
+        if self.n == self.window:
+            self.counts[self._bins[i]] -= 1
+        else:
+            self.n += 1
+        b = _bin_of(value)
+        self._ring[i] = value
+        self._bins[i] = b
+        self.counts[b] += 1
+        self._next = i + 1 if i + 1 < self.window else 0
+        self.total += 1
+
+    def percentile(self, p: float) -> float:
+        if not self.n:
+            return 0.0
+        want = max(1, int(math.ceil(self.n * p / 100.0)))
+        seen = 0
+        for b, c in enumerate(self.counts):
+            seen += c
+            if seen >= want:
+                # A bin edge can overshoot the largest sample in it
+                return min(_bin_upper(b), self.max())
+        return self.max()
+
+    def max(self) -> float:
+        if not self.n:
+            return 0.0
+        return max(self._ring) if self.n == self.window else max(self._ring[:self.n])
+
+    def reset(self):
+        for b in range(_NBINS):
+            self.counts[b] = 0
+        self._next = 0
+        self.n = 0
+        self.total = 0
+
+    def summary(self) -> dict:
+        """Milliseconds, rounded for display."""
+        return {
+            "p50": round(self.percentile(50) * 1000.0, 2),
+            "p95": round(self.percentile(95) * 1000.0, 2),
+            "p99": round(self.percentile(99) * 1000.0, 2),
+            "max": round(self.max() * 1000.0, 2),
+            "n": self.total,
+        }
+
+
+# Stage names, in pipeline order:
+#   tick     - interval between two submits from the app (GUI tick pacing)
+#   compute  - app-reported time to build one frame of colors
+#   queue    - submit -> frame serialized by the sender thread
+#   write    - serialized -> backend write returned
+#   latency  - submit -> on the wire (queue + write)
+#   jitter   - |sender tick interval - frame period|
+STAGES = ("tick", "compute", "queue", "write", "latency", "jitter")
+
+
+class DMXTiming:
+    """Rolling timing histograms for the DMX output path."""
+
+    def __init__(self, window=2048):
+        self.hists = {name: RollingHistogram(window) for name in STAGES}
+
+    def record(self, stage: str, seconds: float):
+        self.hists[stage].record(seconds)
+
+    def reset(self):
+        for h in self.hists.values():
+            h.reset()
+
+    def snapshot(self) -> dict:
+        return {name: h.summary() for name, h in self.hists.items()}
+
+    def status_text(self) -> str:
+        """Short line for the top bar, e.g. 'lat 1.3/4.2 ms  jit 0.6 ms'."""
+        lat = self.hists["latency"]
+        jit = self.hists["jitter"]
+        if not lat.n:
+            return ""
+        return (
+            f"lat {lat.percentile(50) * 1000.0:.1f}/{lat.percentile(95) * 1000.0:.1f} ms"
+            f"  jit {jit.percentile(95) * 1000.0:.1f} ms"
+        )
+
+    def format_report(self) -> str:
+        """Multi-line table (ms) for logs."""
+        lines = [f"{'stage':<8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'n':>8}"]
+        for name, s in self.snapshot().items():
+            lines.append(
+                f"{name:<8} {s['p50']:>8.2f} {s['p95']:>8.2f} {s['p99']:>8.2f} {s['max']:>8.2f} {s['n']:>8d}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,174 @@
+import json
+import os
+from itertools import chain
+
+DMX_CHANNELS = 512
+
+# Profile channel names -> the roles the show logic cares about.
+# Matching is case-insensitive on the names used in config/profiles/*.json.
+ROLE_NAMES = {
+    "master": ("master dimmer", "master", "dimmer"),
+    "red": ("red",),
+    "green": ("green",),
+    "blue": ("blue",),
+    "white": ("macro/white", "white"),
+    "strobe": ("strobe",),
+}
+
+# Values written once when the patch is applied: full master so R/G/B are
+# visible, no white macro and no strobe.
+ROLE_DEFAULTS = {
+    "master": 255,
+    "white": 0,
+    "strobe": 0,
+}
+
+
+class Universe:
+    """One 512-channel DMX universe backed by a single bytearray.
+
+    `data` is a memoryview of the channel bytes (channel 1 = data[0]).
+    headroom/tailroom reserve bytes around it inside the same buffer so an
+    output backend can put its packet header/footer there and hand `frame`
+    to the wire without copying the channels.
+
+    Writes that actually change a value widen a dirty span [lo, hi) that the
+    sender reads (and resets) with take_dirty(), so unchanged frames can be
+    skipped.
+    """
+
+    def __init__(self, size=DMX_CHANNELS, headroom=0, tailroom=0):
+        self.size = int(size)
+        self.headroom = int(headroom)
+        self.tailroom = int(tailroom)
+        self.raw = bytearray(self.headroom + self.size + self.tailroom)
+        self.frame = memoryview(self.raw)
+        self.data = self.frame[self.headroom:self.headroom + self.size]
+        self._dirty_lo = None
+        self._dirty_hi = None
+
+    def mark_dirty(self, lo: int, hi: int):
+        if self._dirty_lo is None:
+            self._dirty_lo, self._dirty_hi = lo, hi
+        else:
+            self._dirty_lo = min(self._dirty_lo, lo)
+            self._dirty_hi = max(self._dirty_hi, hi)
+
+    def take_dirty(self):
+        """Return the changed span (lo, hi) since the last call, or None."""
+        if self._dirty_lo is None:
+            return None
+        span = (self._dirty_lo, self._dirty_hi)
+        self._dirty_lo = self._dirty_hi = None
+        return span
+
+    def assign(self, sl: slice, values):
+        """data[sl] = values, marking the span dirty only if something changed."""
+        if self.data[sl] != values:
+            self.data[sl] = values
+            self.mark_dirty(sl.start, sl.stop)
+
+    def write(self, offset: int, values):
+        """Copy bytes-like values into the universe starting at offset (0-based)."""
+        n = min(len(values), self.size - offset)
+        if n > 0:
+            self.assign(slice(offset, offset + n), values[:n])
+
+    def clear(self):
+        self.assign(slice(0, self.size), bytes(self.size))
+
+
+def load_profile(path: str) -> dict:
+    """Read a fixture profile JSON ({"name":..., "channels": {"1": "Red", ...}})."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+
+def _role_offsets(profile: dict) -> dict:
+    """Map role -> 0-based channel offset inside one fixture."""
+    offsets = {}
+    channels = profile.get("channels") or {}
+    for num, name in channels.items():
+        lname = str(name).strip().lower()
+        for role, names in ROLE_NAMES.items():
+            if role not in offsets and lname in names:
+                offsets[role] = int(num) - 1
+    return offsets
+
+
+class FixturePatch:
+    """A fixture profile compiled into index tables for one universe.
+
+    N identical fixtures are patched back to back from start_address, so each
+    role (red, green, ...) lives at a fixed stride in the universe. Every role
+    is compiled once into an extended slice; scatter() then writes a whole
+    N x RGB frame with three slice assignments instead of a per-channel loop.
+    """
+
+    def __init__(self, profile: dict, start_address=1, channels_per_fixture=10, num_fixtures=38):
+        self.name = profile.get("name", "")
+        self.start = max(0, int(start_address) - 1)
+        self.stride = max(1, int(channels_per_fixture))
+        self.count = max(0, int(num_fixtures))
+        if self.start + self.stride * self.count > DMX_CHANNELS:
+            # Don't patch past the end of the universe
+            self.count = max(0, (DMX_CHANNELS - self.start) // self.stride)
+
+        self.offsets = _role_offsets(profile)
+        self.slices = {role: self._slice(off, self.count) for role, off in self.offsets.items()}
+        self._rgb = tuple(
+            (k, self.offsets[role], self.slices[role])
+            for k, role in enumerate(("red", "green", "blue"))
+            if role in self.offsets
+        )
+
+    @classmethod
+    def from_config(cls, cfg: dict, app_root: str = ""):
+        """Build the patch from settings (fixture_profile + address layout)."""
+        ppath = cfg.get("fixture_profile", "")
+        if ppath and not os.path.isabs(ppath):
+            ppath = os.path.join(app_root, ppath)
+        try:
+            profile = load_profile(ppath)
+        except Exception:
+            # No profile: plain RGB fixtures
+            profile = {"channels": {"1": "Red", "2": "Green", "3": "Blue"}}
+        return cls(
+            profile,
+            start_address=cfg.get("start_address", 1),
+            channels_per_fixture=cfg.get("channels_per_fixture", 10),
+            num_fixtures=cfg.get("num_fixtures", 38),
+        )
+
+    def _slice(self, offset: int, n: int) -> slice:
+        first = self.start + offset
+        return slice(first, first + self.stride * n, self.stride)
+
+    def apply_defaults(self, universe: Universe):
+        """Write the static channels (master, white, strobe) once."""
+        for role, value in ROLE_DEFAULTS.items():
+            sl = self.slices.get(role)
+            if sl is not None and self.count:
+                universe.assign(sl, bytes([value]) * self.count)
+
+    @staticmethod
+    def flatten(cols) -> bytes:
+        """[(r, g, b), ...] or an (N, 3) uint8 array -> b"rgbrgb..."."""
+        if hasattr(cols, "tobytes"):
+            # NumPy frame: one C copy, so the caller may reuse its buffer
+            return cols.tobytes()
+        return bytes(chain.from_iterable(cols))
+
+    def scatter(self, universe: Universe, rgb: bytes):
+        """Write a flattened RGB frame (see flatten) into the universe.
+
+        Extra fixtures in the frame are ignored; missing ones keep their
+        previous values.
+        """
+        n = min(len(rgb) // 3, self.count)
+        if n <= 0:
+            return
+        for k, off, sl in self._rgb:
+            if n != self.count:
+                sl = self._slice(off, n)
+            universe.assign(sl, rgb[k:3 * n:3])
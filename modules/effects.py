@@ -0,0 +1,251 @@
+import math
+
+from modules import frames
+
+# Looks are built from small effect nodes combined into a graph, e.g.
+#
+#   Crossfade(Split(Solid(BLACK), Solid(GREEN)), Fade(), start=48.0, dur=2.0)
+#
+# Evaluation is pull-based and lazy:
+#   - frame(t) on a node renders it only if it has not already rendered that
+#     (quantized) time; several readers of the same frame (dot bar, DMX,
+#     recorder, render thread) share one evaluation. Static nodes render once.
+#   - a node only pulls the inputs it needs at t: a crossfade outside its
+#     window reads one side, a strobe in its off phase reads nothing.
+#   - Split hands each child only the fixtures it covers, so children are
+#     bound to (and render) just their share of the bar.
+#
+# Nodes own their output buffer; bind(n) sizes the graph once. A node can
+# be shared inside one graph, not between graphs of different sizes.
+# Frames returned by frame() belong to the node: copy them to keep them.
+
+QUANTUM_S = 0.001  # memo key resolution (1 ms)
+
+
+class Effect:
+    static = False  # output does not depend on t
+
+    def __init__(self):
+        self.n = 0
+        self.out = None
+        self._key = None
+        self.evals = 0
+
+    def children(self):
+        return ()
+
+    def bind(self, n: int):
+        """Size the node (and its inputs) for n fixtures."""
+        if self.n != n or self.out is None:
+            self.n = n
+            self.out = frames.new_frame(n)
+            self._key = None
+        for child, share in self._child_sizes(n):
+            child.bind(share)
+        return self
+
+    def _child_sizes(self, n):
+        return [(c, n) for c in self.children()]
+
+    def frame(self, t: float):
+        """(n, 3) uint8 frame at time t, memoized per quantized t."""
+        key = 0 if self.static else int(round(t / QUANTUM_S))
+        if key != self._key:
+            self.render(self.out, t)
+            self._key = key
+            self.evals += 1
+        return self.out
+
+    def invalidate(self):
+        self._key = None
+        for c in self.children():
+            c.invalidate()
+
+    def render(self, out, t: float):
+        raise NotImplementedError
+
+
+# ----------------------------------------------------------------------
+# Generators
+# ----------------------------------------------------------------------
+
+class Solid(Effect):
+    static = True
+
+    def __init__(self, color):
+        super().__init__()
+        self.color = tuple(int(c) for c in color)
+
+    def render(self, out, t):
+        frames.fill(out, self.color)
+
+
+class Fade(Effect):
+    """Red/green sine crossfade, even pixels opposite to odd ones."""
+
+    def __init__(self, speed=1.0):
+        super().__init__()
+        self.speed = float(speed)
+
+    def render(self, out, t):
+        frames.fade(out, t, self.speed)
+
+
+class Chase(Effect):
+    """Colors repeat along the bar and shift one pixel every 1/rate s."""
+
+    def __init__(self, colors=(frames.RED, frames.GREEN), rate=2.0):
+        super().__init__()
+        self.colors = [tuple(int(c) for c in col) for col in colors] or [frames.BLACK]
+        self.rate = float(rate)
+
+    def render(self, out, t):
+        m = len(self.colors)
+        step = int(t * self.rate)
+        for j, col in enumerate(self.colors):
+            out[(j - step) % m::m] = col
+
+
+# ----------------------------------------------------------------------
+# Combinators
+# ----------------------------------------------------------------------
+
+class Split(Effect):
+    """left on the first half of the bar, right on the rest."""
+
+    def __init__(self, left: Effect, right: Effect):
+        super().__init__()
+        self.left = left
+        self.right = right
+        self.static = left.static and right.static
+
+    def children(self):
+        return (self.left, self.right)
+
+    def _child_sizes(self, n):
+        return [(self.left, n // 2), (self.right, n - n // 2)]
+
+    def render(self, out, t):
+        half = self.left.n
+        out[:half] = self.left.frame(t)
+        out[half:] = self.right.frame(t)
+
+
+class Strobe(Effect):
+    """Effect `of` for `duty` of every 1/hz period, black otherwise."""
+
+    def __init__(self, of: Effect, hz=10.0, duty=0.5):
+        super().__init__()
+        self.of = of
+        self.hz = float(hz)
+        self.duty = max(0.0, min(1.0, float(duty)))
+
+    def children(self):
+        return (self.of,)
+
+    def render(self, out, t):
+        if self.hz <= 0.0 or math.modf(t * self.hz)[0] < self.duty:
+            out[:] = self.of.frame(t)
+        else:
+            out[:] = 0
+
+
+class Hold(Effect):
+    """Effect `of` frozen at time `at`."""
+
+    static = True
+
+    def __init__(self, of: Effect, at=0.0):
+        super().__init__()
+        self.of = of
+        self.at = float(at)
+
+    def children(self):
+        return (self.of,)
+
+    def render(self, out, t):
+        out[:] = self.of.frame(self.at)
+
+
+class Crossfade(Effect):
+    """a until start, then a linear blend into b over dur seconds, then b."""
+
+    def __init__(self, a: Effect, b: Effect, start=0.0, dur=1.0):
+        super().__init__()
+        self.a = a
+        self.b = b
+        self.start = float(start)
+        self.dur = float(dur)
+        self._blender = None
+
+    def children(self):
+        return (self.a, self.b)
+
+    def bind(self, n):
+        super().bind(n)
+        if self._blender is None or self._blender.out.shape[0] != n:
+            self._blender = frames.Blender(n)
+        return self
+
+    def render(self, out, t):
+        alpha = (t - self.start) / self.dur if self.dur > 0.0 else 1.0
+        if alpha <= 0.0:
+            out[:] = self.a.frame(t)
+        elif alpha >= 1.0:
+            out[:] = self.b.frame(t)
+        else:
+            self._blender.blend(self.a.frame(t), self.b.frame(t), alpha, out=out)
+
+
+# ----------------------------------------------------------------------
+# Building graphs from cue map specs
+# ----------------------------------------------------------------------
+
+WHITE = (240, 240, 240)
+WHITE_LOW = (60, 60, 60)
+
+# Named looks used by the cue map ("pattern": "RedLeft"); speed scales
+# animated ones.
+LOOKS = {
+    "Off": lambda speed: Solid(frames.BLACK),
+    "Idle": lambda speed: Solid(frames.BLACK),
+    "White": lambda speed: Solid(WHITE),
+    "AllWhiteLow": lambda speed: Solid(WHITE_LOW),
+    "Fade": lambda speed: Fade(speed),
+    "RedLeft": lambda speed: Split(Solid(frames.RED), Solid(frames.BLACK)),
+    "GreenRight": lambda speed: Split(Solid(frames.BLACK), Solid(frames.GREEN)),
+    "RockinRedGreen": lambda speed: Chase((frames.RED, frames.GREEN), 2.0 * speed),
+}
+
+
+def build(spec, speed=1.0) -> Effect:
+    """Effect graph from a cue map pattern: a LOOKS name, or a dict such as
+
+        {"fx": "strobe", "hz": 8, "of": "White"}
+        {"fx": "split", "left": "Fade", "right": {"fx": "solid", "color": [0, 0, 255]}}
+
+    fx is one of solid, fade, chase, split, strobe, hold, crossfade. Unknown
+    names give black.
+    """
+    if isinstance(spec, str):
+        make = LOOKS.get(spec)
+        return make(speed) if make else Solid(frames.BLACK)
+    if not isinstance(spec, dict):
+        return Solid(frames.BLACK)
+    fx = str(spec.get("fx", "")).lower()
+    if fx == "solid":
+        return Solid(spec.get("color", frames.BLACK))
+    if fx == "fade":
+        return Fade(spec.get("speed", speed))
+    if fx == "chase":
+        return Chase(spec.get("colors", (frames.RED, frames.GREEN)), spec.get("rate", 2.0 * speed))
+    if fx == "split":
+        return Split(build(spec.get("left"), speed), build(spec.get("right"), speed))
+    if fx == "strobe":
+        return Strobe(build(spec.get("of"), speed), spec.get("hz", 10.0), spec.get("duty", 0.5))
+    if fx == "hold":
+        return Hold(build(spec.get("of"), speed), spec.get("at", 0.0))
+    if fx == "crossfade":
+        return Crossfade(build(spec.get("from"), speed), build(spec.get("to"), speed),
+                         spec.get("start", 0.0), spec.get("dur", 1.0))
+    return Solid(frames.BLACK)
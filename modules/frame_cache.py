@@ -0,0 +1,112 @@
+import glob
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+
+from modules.cue_timeline import CueTimeline
+
+# Bump when a pattern or blend changes its output, so old bakes are dropped
+CACHE_VERSION = 2
+
+
+def cache_key(timeline: CueTimeline, fps: float, duration: float) -> str:
+    """Hash of everything a baked cue depends on: the cue definition,
+    fixture count, frame rate and song length."""
+    blob = json.dumps(
+        {
+            "v": CACHE_VERSION,
+            "segments": timeline.segments,
+            "n": timeline.n,
+            "fps": round(float(fps), 3),
+            "duration": round(float(duration), 3),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class BakedTimeline:
+    """A CueTimeline pre-rendered at the DMX frame rate.
+
+    frames is an (count, n, 3) uint8 array, memory-mapped from the cache
+    file, so colors(pos) is an index into it and a seek costs the same as a
+    tick. Once a hold segment is reached (CUE 21's latch to white) the live
+    timeline takes over, because that state depends on history, not on
+    position. Positions past the baked range fall back to it as well.
+    """
+
+    def __init__(self, live: CueTimeline, frames, fps: float):
+        self.live = live
+        self.frames = frames
+        self.fps = float(fps)
+        self.n = live.n
+
+    def __len__(self):
+        return len(self.live)
+
+    @property
+    def held(self):
+        return self.live.held
+
+    def reset(self):
+        self.live.reset()
+
+    def colors(self, pos: float):
+        live = self.live
+        if live.held is not None or (live.hold_start is not None and pos >= live.hold_start):
+            return live.colors(pos)
+        k = int(pos * self.fps)
+        if 0 <= k < len(self.frames):
+            return self.frames[k]
+        return live.colors(pos)
+
+
+def bake(timeline: CueTimeline, fps: float, duration: float, path: str):
+    """Render timeline at fps over [0, duration] into an .npy file at path.
+
+    Renders from a fresh copy of the timeline so the live one's cursor and
+    hold state are left alone. Written to a temp file first, so a crash
+    never leaves a half-baked cache behind.
+    """
+    count = int(math.ceil(duration * fps)) + 1
+    shape = (count, timeline.n, 3)
+    tmp = path + ".tmp"
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8, shape=shape)
+    scratch = CueTimeline(timeline.segments, timeline.n)
+    for k in range(count):
+        out[k] = scratch.colors(k / fps)
+    out.flush()
+    del out
+    os.replace(tmp, path)
+
+
+def load_or_bake(cid: str, timeline: CueTimeline, fps: float, duration: float, cache_dir: str):
+    """BakedTimeline for a cue, reusing the cache file if its key matches.
+
+    Cache files are named cue<id>-<key>.npy; bakes of the same cue under an
+    older key (changed cue map, fixture count, ...) are deleted. Returns
+    None if there is nothing to bake or the cache can't be written.
+    """
+    if fps <= 0.0 or duration <= 0.0 or not cache_dir:
+        return None
+    key = cache_key(timeline, fps, duration)
+    path = os.path.join(cache_dir, f"cue{cid}-{key}.npy")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for old in glob.glob(os.path.join(glob.escape(cache_dir), glob.escape(f"cue{cid}-") + "*.npy*")):
+            if old != path:
+                try:
+                    os.remove(old)
+                except Exception:
+                    pass
+        if not os.path.exists(path):
+            bake(timeline, fps, duration, path)
+        frames = np.load(path, mmap_mode="r")
+    except Exception:
+        return None
+    if frames.ndim != 3 or frames.shape[1:] != (timeline.n, 3):
+        return None
+    return BakedTimeline(timeline, frames, fps)
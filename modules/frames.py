@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+
+# Color frames are (N, 3) uint8 arrays, one row per pixel/fixture. Kernels
+# write into a caller-owned buffer (out=...) instead of building lists, so
+# a tick allocates nothing and the cost per pixel is a strided memory fill
+# rather than a Python loop iteration.
+
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLACK = (0, 0, 0)
+
+
+def new_frame(n: int):
+    return np.zeros((n, 3), dtype=np.uint8)
+
+
+def fill(out, col):
+    out[:] = col
+    return out
+
+
+def split(out, left, right):
+    """First half left, second half right (odd counts give right the extra)."""
+    half = len(out) // 2
+    out[:half] = left
+    out[half:] = right
+    return out
+
+
+def alternate(out, a, b, phase=0):
+    """Every other pixel a / b; phase 1 swaps them."""
+    p = int(phase) & 1
+    out[p::2] = a
+    out[1 - p::2] = b
+    return out
+
+
+def fade(out, t: float, speed=1.0):
+    """Red/green sine crossfade, even pixels opposite to odd ones."""
+    x = (math.sin(t * speed) + 1) / 2
+    hi = int(255 * x)
+    lo = int(255 * (1 - x))
+    out[0::2] = (hi, lo, 0)
+    out[1::2] = (lo, hi, 0)
+    return out
+
+
+class Blender:
+    """Linear crossfade of two frames into a preallocated output.
+
+    Works in float64 scratch buffers and rounds half-to-even, so results
+    match int(round(a * (1 - alpha) + b * alpha)) per channel exactly.
+    """
+
+    def __init__(self, n: int):
+        self.out = new_frame(n)
+        self._acc = np.zeros((n, 3), dtype=np.float64)
+        self._tmp = np.zeros((n, 3), dtype=np.float64)
+
+    def blend(self, a, b, alpha: float, out=None):
+        out = self.out if out is None else out
+        alpha = max(0.0, min(1.0, float(alpha)))
+        np.multiply(a, 1 - alpha, out=self._acc)
+        np.multiply(b, alpha, out=self._tmp)
+        np.add(self._acc, self._tmp, out=self._acc)
+        np.rint(self._acc, out=self._acc)
+        np.copyto(out, self._acc, casting="unsafe")
+        return out
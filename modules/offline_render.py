@@ -0,0 +1,317 @@
+import os
+import time
+import wave
+
+import numpy as np
+
+from modules import audio
+from modules.audio import AudioEngine
+from modules.beat_scheduler import BeatScheduler
+from modules.cue_timeline import load_cue_map, cue_map_path
+from modules.dmx_engine import DMXEngine, NullBackend
+from modules.dmx_recorder import FrameRecorder
+from modules.dmx_timing import RollingHistogram
+from modules.dmx_universe import FixturePatch
+from modules.rockin_modes import RockinModes
+from modules.show import transition_for, beats_path, cue_colors
+
+# Offline render of a show: the same AudioEngine (voices, envelopes,
+# crossfades), cue lighting and DMX framing as the app, driven by a
+# simulated clock instead of the sound card and the render thread, as fast
+# as the CPU allows. Output is a mixed WAV and a DMX frame log
+# (modules/dmx_recorder.py) that tools/dmx_replay.py can compare against a
+# golden run. See tools/render_show.py.
+
+
+class SimClock:
+    """Simulated show time in seconds; the timer passed to AudioEngine."""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class OfflineChannel:
+    """Stand-in for a pygame.mixer.Channel that mixes into the offline
+    render instead of the sound card.
+
+    Plays one Sound with one queued behind it, like SDL: when the playing
+    one runs out mid-buffer the queued one continues in the same buffer.
+    The volume is kept in SDL's 128 steps and applies to a whole buffer.
+    """
+
+    def __init__(self, channels=2):
+        self.channels = channels
+        self.volume = 1.0
+        self._snd = None   # keeps the playing Sound (and so _buf) alive
+        self._buf = None   # (frames, channels) int16 view of it
+        self._pos = 0
+        self._queued = None
+
+    def _frames(self, snd):
+        return np.frombuffer(memoryview(snd).cast("B"), dtype=np.int16).reshape(-1, self.channels)
+
+    def play(self, snd):
+        self._snd = snd
+        self._buf = self._frames(snd)
+        self._pos = 0
+        self._queued = None
+
+    def queue(self, snd):
+        if self._buf is None:
+            self.play(snd)
+        else:
+            self._queued = snd
+
+    def get_queue(self):
+        return self._queued
+
+    def get_busy(self) -> bool:
+        return self._buf is not None
+
+    def set_volume(self, value: float):
+        self.volume = int(max(0.0, min(1.0, float(value))) * 128) / 128.0
+
+    def stop(self):
+        self._snd = self._buf = self._queued = None
+
+    def mix_into(self, out):
+        """Add this channel's next len(out) frames to out (float32)."""
+        n = len(out)
+        i = 0
+        while i < n and self._buf is not None:
+            take = min(n - i, len(self._buf) - self._pos)
+            if self.volume > 0.0:
+                out[i:i + take] += self._buf[self._pos:self._pos + take] * self.volume
+            self._pos += take
+            i += take
+            if self._pos >= len(self._buf):
+                nxt, self._queued = self._queued, None
+                if nxt is None:
+                    self.stop()
+                else:
+                    self.play(nxt)
+
+
+class OfflineAudioEngine(AudioEngine):
+    """AudioEngine on OfflineChannels and a simulated timer.
+
+    Every song plays as a PCM voice (a hard cut is a seek to 0), since
+    mixer.music streams straight to the device and can't be captured.
+    Envelopes are advanced by the render once per mix buffer (fade_hz 0),
+    as SDL applies them.
+    """
+
+    def __init__(self, timer, **kwargs):
+        kwargs["fade_hz"] = 0.0
+        super().__init__(timer=timer, **kwargs)
+        self.bus = []
+        self.format = None  # (freq, size, channels), once the mixer is open
+
+    def _open_channels(self):
+        self.format = audio.pygame.mixer.get_init()
+        self.bus = [OfflineChannel(self.format[2]) for _ in range(self.voices)]
+        return self.bus
+
+    def _require_pcm(self, path):
+        # Without decoded samples AudioEngine falls back to mixer.music,
+        # which would be missing from the render (and play() <-> seek()
+        # would call each other)
+        if path is None or self._pcm_of(path) is None:
+            raise RuntimeError(f"Offline render: could not decode {path}")
+
+    def play(self, start_sec: float = 0.0, ramp_in_sec: float = 0.0):
+        self._require_pcm(self.path)
+        self.seek(start_sec)
+
+    def seek(self, start_sec: float):
+        self._require_pcm(self.path)
+        # Always from the decoded PCM, whatever seek_mode says
+        self.seek_mode = "pcm"
+        super().seek(start_sec)
+
+    def crossfade(self, path: str, fade_out: float = 2.0, fade_in: float = 0.0, shape: str = "linear"):
+        self._require_pcm(path)
+        super().crossfade(path, fade_out, fade_in, shape)
+
+    def mix(self, frames: int):
+        """The next frames of output, (frames, channels) int16."""
+        out = np.zeros((frames, self.format[2]), np.float32)
+        for ch in self.bus:
+            ch.mix_into(out)
+        return np.clip(out, -32768, 32767).astype(np.int16)
+
+
+def parse_script(text: str):
+    """"19@0 20@185.5 21@400" -> [(0.0, "19"), (185.5, "20"), (400.0, "21")]."""
+    events = []
+    for item in text.replace(",", " ").split():
+        cid, _, at = item.partition("@")
+        events.append((float(at or 0.0), cid.strip()))
+    return sorted(events)
+
+
+class OfflineShow:
+    """Render a cue script (time, cue id) to a WAV and a DMX frame log.
+
+    Mirrors App.load_cue / App._render_frame: a cue with a transition
+    from the playing one crossfades, anything else is a hard cut; every
+    DMX frame reads the show clock, builds the cue's colors and goes
+    through the fixture patch and DMXEngine.flush(), timestamped with
+    simulated time.
+    """
+
+    def __init__(self, cfg: dict, app_root: str, frame_rate=None):
+        self.cfg = cfg
+        self.sim = SimClock()
+        self.frame_rate = float(frame_rate or cfg.get("frame_rate", 40) or 40)
+        self.audio = OfflineAudioEngine(
+            self.sim,
+            sound_cache_mb=cfg.get("sound_cache_mb", 256),
+            mixer_freq=cfg.get("mixer_freq", 44100),
+            mixer_buffer=cfg.get("mixer_buffer", 256),
+            voices=cfg.get("mixer_voices", 4),
+        )
+        self.audio.set_assets_dir(cfg.get("assets_dir"))
+        if cfg.get("pcm_cache", True):
+            self.audio.set_pcm_cache_dir(cfg.get("pcm_cache_dir") or os.path.join(
+                cfg.get("assets_dir") or app_root, "pcm_cache"
+            ))
+        self.dmx = DMXEngine(
+            cfg.get("dmx_com_port", 11),
+            frame_rate=self.frame_rate,
+            patch=FixturePatch.from_config(cfg, app_root),
+            keepalive_hz=cfg.get("dmx_keepalive_hz", 1.0),
+            backend=NullBackend(),
+            universes=cfg.get("dmx_universes", 1),
+        )
+        self.rockin = RockinModes(38)
+        self.rockin.set_mode(1)
+        self.beat_lookahead_s = cfg.get("beat_lookahead_ms", 40) / 1000.0
+        self.beats = BeatScheduler(on_beat=self.rockin.on_beat, lookahead_s=self.beat_lookahead_s)
+        self.timelines = load_cue_map(cue_map_path(cfg, app_root), 38)
+        self.current_cue = None
+        self.frame_hist = RollingHistogram(4096)
+
+    def song(self, cid):
+        path = self.cfg["songs"].get(cid)
+        return path if path and os.path.exists(path) else None
+
+    def duration(self, cid) -> float:
+        path = self.song(cid)
+        return self.audio.duration_of(path) if path else 0.0
+
+    def default_script(self):
+        """19, 20, 21 back to back; a cue with a transition starts its
+        fade_out before the previous song ends, so the overlap is heard."""
+        events, t, prev = [], 0.0, None
+        for cid in ("19", "20", "21"):
+            if self.song(cid) is None:
+                continue
+            tr = transition_for(self.cfg, prev, cid) if prev else None
+            if tr is not None:
+                t = max(events[-1][0], t - float(tr.get("fade_out", 2.0)))
+            events.append((t, cid))
+            t += self.duration(cid)
+            prev = cid
+        return events
+
+    def load_cue(self, cid: str):
+        prev, self.current_cue = self.current_cue, cid
+        for tl in self.timelines.values():
+            tl.reset()
+        path = self.song(cid)
+        if path is None:
+            return
+        tr = transition_for(self.cfg, prev, cid)
+        if tr is not None and self.audio.clock.started:
+            self.audio.crossfade(
+                path,
+                fade_out=float(tr.get("fade_out", 2.0)),
+                fade_in=float(tr.get("fade_in", 0.0)),
+                shape=tr.get("shape", "linear"),
+            )
+        else:
+            self.audio.load(path)
+            self.audio.play(start_sec=0.0)
+        self.beats.clear()
+        beats_json = beats_path(cid, self.cfg.get("assets_dir"))
+        if beats_json:
+            self.beats = BeatScheduler.from_file(
+                beats_json, on_beat=self.rockin.on_beat, lookahead_s=self.beat_lookahead_s
+            )
+        self.beats.rewind()
+
+    def _frame(self):
+        t0 = time.perf_counter()
+        self.audio.update()
+        pos = max(0.0, self.audio.get_pos())
+        cid = self.current_cue
+        cols = cue_colors(cid, pos, self.timelines.get(cid), self.beats, self.rockin)
+        self.dmx.submit_colors(cols)
+        self.dmx.flush(now=self.sim.t)
+        self.frame_hist.record(time.perf_counter() - t0)
+
+    def render(self, wav_path: str, log_path: str, script=None, end_s=None) -> dict:
+        """Render script (default_script()) up to end_s; returns stats."""
+        engine = self.audio
+        engine._ensure_mixer()
+        # Decode everything up front (the durations are needed for the script)
+        songs = [self.song(cid) for cid in ([c for _, c in script] if script else ("19", "20", "21"))]
+        for path in songs:
+            if path:
+                engine.preload(path)
+        for path in songs:
+            engine.wait_preload(path)
+        events = sorted(script) if script else self.default_script()
+        if end_s is None:
+            # Until the last song ends, plus a second of silence
+            end_s = max([t + self.duration(cid) for t, cid in events] or [0.0]) + 1.0
+
+        freq, _, channels = engine.format
+        block = max(1, engine.mixer_buffer)
+        frame_s = 1.0 / self.frame_rate
+        self.dmx.set_recorder(FrameRecorder(log_path, self.frame_rate))
+        folder = os.path.dirname(wav_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        total = int(end_s * freq)
+        done = 0
+        next_frame = 0
+        t_wall = time.perf_counter()
+        with wave.open(wav_path, "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(freq)
+            while done < total:
+                t = done / float(freq)
+                # DMX frames due before this buffer, then cues, in time order
+                while next_frame * frame_s <= t:
+                    self.sim.t = next_frame * frame_s
+                    while events and events[0][0] <= self.sim.t:
+                        self.load_cue(events.pop(0)[1])
+                    self._frame()
+                    next_frame += 1
+                self.sim.t = t
+                while events and events[0][0] <= t:
+                    self.load_cue(events.pop(0)[1])
+                # One mix buffer: envelopes as of its start, like SDL
+                engine.mixer.update(t)
+                n = min(block, total - done)
+                wav.writeframes(engine.mix(n).tobytes())
+                done += n
+        wall = time.perf_counter() - t_wall
+        self.dmx.recorder.close()
+        self.dmx.set_recorder(None)
+        self.dmx.stop()
+        return {
+            "show_s": round(end_s, 3),
+            "wall_s": round(wall, 3),
+            "x_real_time": round(end_s / wall, 1) if wall > 0.0 else 0.0,
+            "dmx_frames": next_frame,
+            "frame_ms": self.frame_hist.summary(),
+            "dmx": self.dmx.counters(),
+        }
@@ -0,0 +1,142 @@
+import glob
+import hashlib
+import os
+import re
+
+import numpy as np
+
+# Bump when the file layout changes, so old caches are dropped
+CACHE_VERSION = 1
+
+# Bytes read from each end of the song for its content hash
+_HASH_SPAN = 1 << 16
+
+# pygame.mixer.get_init() sample size -> NumPy dtype
+_DTYPES = {8: "u1", -8: "i1", 16: "<u2", -16: "<i2", 32: "<f4"}
+
+
+def file_key(path: str, fmt=()) -> str:
+    """Hash identifying one version of a song (and the mixer format it was
+    decoded for): size, mtime and the first and last 64 KB of its content.
+    A re-exported or replaced file gets a new key even if it keeps its name.
+    """
+    st = os.stat(path)
+    h = hashlib.sha1()
+    h.update(repr((CACHE_VERSION, st.st_size, st.st_mtime_ns, tuple(fmt))).encode("utf-8"))
+    with open(path, "rb") as f:
+        h.update(f.read(_HASH_SPAN))
+        if st.st_size > 2 * _HASH_SPAN:
+            f.seek(-_HASH_SPAN, os.SEEK_END)
+            h.update(f.read(_HASH_SPAN))
+    return h.hexdigest()[:16]
+
+
+class PCMCache:
+    """Decoded songs on disk, so they are decoded once, not on every start.
+
+    Each song is stored as an (frames, channels) .npy in the mixer's sample
+    format, named <song>-<key>.npy. get() memory-maps it: nothing is read
+    until samples are touched, and the duration is frames / freq from the
+    .npy header. On a miss the song is decoded with pygame once and written
+    (to a temp file first, so a crash never leaves a half-written cache).
+    Caches of the same song under an older key are deleted.
+    """
+
+    def __init__(self, cache_dir: str, freq: int, size: int, channels: int):
+        self.cache_dir = cache_dir
+        self.freq = int(freq)
+        self.size = int(size)
+        self.channels = int(channels)
+        self.dtype = np.dtype(_DTYPES.get(self.size, "<i2"))
+        self.hits = 0
+        self.misses = 0
+        self._paths = {}  # song path -> (size, mtime_ns, cache path)
+
+    @property
+    def fmt(self):
+        return (self.freq, self.size, self.channels)
+
+    def cache_path(self, song: str) -> str:
+        st = os.stat(song)
+        known = self._paths.get(song)
+        if known and known[:2] == (st.st_size, st.st_mtime_ns):
+            return known[2]
+        stem = os.path.splitext(os.path.basename(song))[0]
+        path = os.path.join(self.cache_dir, f"{stem}-{file_key(song, self.fmt)}.npy")
+        self._paths[song] = (st.st_size, st.st_mtime_ns, path)
+        return path
+
+    def _open(self, path: str):
+        arr = np.load(path, mmap_mode="r")
+        if arr.ndim != 2 or arr.shape[1] != self.channels or arr.dtype != self.dtype:
+            return None
+        return arr
+
+    def load(self, song: str):
+        """Memory-mapped samples for song, or None if it isn't cached."""
+        try:
+            path = self.cache_path(song)
+            if os.path.exists(path):
+                return self._open(path)
+        except Exception:
+            pass
+        return None
+
+    def has(self, song: str) -> bool:
+        """True if song is cached (without mapping it)."""
+        try:
+            return os.path.exists(self.cache_path(song))
+        except Exception:
+            return False
+
+    def store(self, song: str, samples):
+        """Write decoded samples (a Sound or anything with the buffer
+        protocol, in the mixer format) for song; returns the mapped copy."""
+        path = self.cache_path(song)
+        stem = os.path.splitext(os.path.basename(song))[0]
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Only <stem>-<key>.npy (and its .tmp): "Song" must not match
+        # "Song-Remix-<key>.npy"
+        own = re.compile(re.escape(stem) + r"-[0-9a-f]{16}\.npy(\.tmp)?")
+        for old in glob.glob(os.path.join(glob.escape(self.cache_dir), glob.escape(stem) + "-*.npy*")):
+            if old != path and own.fullmatch(os.path.basename(old)):
+                try:
+                    os.remove(old)
+                except Exception:
+                    pass
+        src = np.frombuffer(memoryview(samples).cast("B"), dtype=self.dtype)
+        src = src[: len(src) - len(src) % self.channels].reshape(-1, self.channels)
+        tmp = path + ".tmp"
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=self.dtype, shape=src.shape)
+        out[:] = src
+        out.flush()
+        del out
+        os.replace(tmp, path)
+        return self._open(path)
+
+    def get(self, song: str, decode=None):
+        """Samples for song from the cache, decoding (decode(song) -> Sound)
+        and storing it on a miss. None if it can't be decoded."""
+        arr = self.load(song)
+        if arr is not None:
+            self.hits += 1
+            return arr
+        self.misses += 1
+        if decode is None:
+            return None
+        try:
+            snd = decode(song)
+        except Exception:
+            return None
+        try:
+            return self.store(song, snd)
+        except Exception:
+            # Read-only or full disk: still hand back the decoded samples
+            return np.frombuffer(memoryview(snd).cast("B"), dtype=self.dtype).reshape(-1, self.channels)
+
+    def duration(self, song: str) -> float:
+        """Length in seconds from the cache header, 0.0 if not cached."""
+        arr = self.load(song)
+        if arr is None:
+            return 0.0
+        return arr.shape[0] / float(self.freq)
@@ -0,0 +1,127 @@
+import threading
+import time
+
+from modules.dmx_timing import RollingHistogram
+
+# Same trick as the DMX sender: sleep until just before the deadline, then
+# yield, because Event.wait() on Windows only wakes on the ~15 ms tick.
+_SPIN_S = 0.002
+
+
+class RenderLoop:
+    """Calls render_fn(now) on its own thread at frame_rate.
+
+    - Deadline based: frame k is due at t0 + k * period; each deadline is
+      advanced by one period, so late frames don't accumulate drift. If the
+      loop falls more than a period behind it resyncs to now and counts the
+      frames it skipped as dropped.
+    - A frame that isn't finished by the next frame's deadline counts as a
+      deadline miss. lateness (start - deadline) and work (time spent in
+      render_fn) keep rolling histograms.
+    - Exceptions from render_fn are counted and the loop keeps going.
+    """
+
+    def __init__(self, render_fn, frame_rate=40, window=2048):
+        self.render_fn = render_fn
+        self.frame_rate = max(1.0, float(frame_rate))
+        self.period = 1.0 / self.frame_rate
+
+        self.frames = 0
+        self.misses = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+        self.actual_fps = 0.0
+        self.lateness = RollingHistogram(window)
+        self.work = RollingHistogram(window)
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="render", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        t = self._thread
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def counters(self) -> dict:
+        return {
+            "frames": self.frames,
+            "misses": self.misses,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "fps": round(self.actual_fps, 2),
+        }
+
+    def status_text(self) -> str:
+        """Short line for the top bar, empty while nothing was missed."""
+        if not (self.misses or self.dropped):
+            return ""
+        return f"render miss {self.misses}"
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'n':>8}"]
+        for name, h in (("late", self.lateness), ("work", self.work)):
+            s = h.summary()
+            lines.append(
+                f"{name:<8} {s['p50']:>8.2f} {s['p95']:>8.2f} {s['p99']:>8.2f} {s['max']:>8.2f} {s['n']:>8d}"
+            )
+        lines.append(", ".join(f"{k}={v}" for k, v in self.counters().items()))
+        return "\n".join(lines)
+
+    def _wait_until(self, deadline: float) -> bool:
+        """Sleep until the perf_counter deadline. False if stop() came first."""
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0.0:
+                return True
+            if remaining > _SPIN_S:
+                if self._stop.wait(remaining - _SPIN_S):
+                    return False
+            else:
+                time.sleep(0)
+
+    def _run(self):
+        period = self.period
+        next_t = time.perf_counter()
+        fps_t0 = next_t
+        fps_n = 0
+        while not self._stop.is_set():
+            if not self._wait_until(next_t):
+                break
+            start = time.perf_counter()
+            self.lateness.record(start - next_t)
+            try:
+                self.render_fn(start)
+            except Exception as ex:
+                self.errors += 1
+                self.last_error = repr(ex)
+            end = time.perf_counter()
+            self.work.record(end - start)
+            self.frames += 1
+            if end > next_t + period:
+                self.misses += 1
+
+            fps_n += 1
+            if end - fps_t0 >= 1.0:
+                self.actual_fps = fps_n / (end - fps_t0)
+                fps_t0 = end
+                fps_n = 0
+
+            next_t += period
+            if end - next_t > period:
+                behind = int((end - next_t) / period)
+                self.dropped += behind
+                next_t = end + period
@@ -1,53 +1,99 @@
+import math
+
+import numpy as np
+
 RED=(255,0,0); GREEN=(0,255,0); WHITE_LOW=(60,60,60)
 
+# Every mode is a pure function of the beat index k that repeats with a
+# fixed period, so each (mode, fixture count) is rendered once into a
+# (period, n, 3) uint8 table and beat k is row k % period. Nothing depends
+# on which beats were played before: after a seek, on_beat(k) alone gives
+# the exact pattern.
+
+def _ex1(k,n):
+    phase=k%2
+    return [RED if (i%2)==phase else GREEN for i in range(n)]
+
+def _ex2(k,n):
+    cols=[(0,0,0)]*n
+    left=list(range(n//2-1,-1,-1))
+    right=list(range(n//2,n))
+    step=k%max(1,len(left))
+    if step < len(left):
+        a=left[step]; b=right[step] if step<len(right) else right[-1]
+        col=RED if step%2==0 else GREEN
+        cols[a]=col; cols[b]=col
+    if k%4==3:
+        cols=[GREEN]*n
+    return cols
+
+def _ex3(k,n):
+    cols=[(0,0,0)]*n
+    seg=3; steps=6; s=(k%steps)
+    direction = 1 if (k%2)==0 else -1
+    head = (0 if direction==1 else n-1) + direction*s*seg
+    for j in range(seg):
+        idx=(head + direction*j) % n
+        cols[idx]= RED if (j%2)==0 else GREEN
+    if k%8==0:
+        cols=[RED]*(n//2)+[GREEN]*(n-n//2)
+    elif k%8==1:
+        cols=[GREEN]*(n//2)+[RED]*(n-n//2)
+    return cols
+
+def _lcm(a,b):
+    return a*b//math.gcd(a,b)
+
+# mode -> (pattern fn, period in beats for n fixtures)
+MODES={
+    1:(_ex1, lambda n: 2),
+    2:(_ex2, lambda n: _lcm(max(1,n//2),4)),
+    3:(_ex3, lambda n: 24),  # lcm(6 steps, 2 directions, 8 bookends)
+}
+
+_TABLES={}
+
+def pattern_table(mode:int, n:int):
+    """Read-only (period, n, 3) uint8 table for a mode, built on first use."""
+    key=(mode,n)
+    tab=_TABLES.get(key)
+    if tab is None:
+        fn,period=MODES[mode]
+        p=max(1,period(n))
+        tab=np.array([fn(k,n) for k in range(p)],dtype=np.uint8).reshape(p,n,3)
+        tab.flags.writeable=False
+        _TABLES[key]=tab
+    return tab
+
 class RockinModes:
     def __init__(self, fixture_count=38):
         self.n=fixture_count
         self.mode=1
-        self.colors=[(0,0,0)]*self.n
+        self.beat=-1          # last beat index, -1 = none yet
+        self.white_low=False
+        self._black=np.zeros((self.n,3),dtype=np.uint8)
+        self._white_low=np.array([WHITE_LOW]*self.n,dtype=np.uint8).reshape(self.n,3)
+        self._table=pattern_table(self.mode,self.n)
 
     def set_mode(self, m:int):
         self.mode=max(1,min(3,int(m)))
+        self._table=pattern_table(self.mode,self.n)
+
+    def colors_at(self, k:int):
+        """Frame for beat k in the current mode (a row of the shared table)."""
+        tab=self._table
+        return tab[k%len(tab)]
 
     def current_colors(self):
-        return list(self.colors)
+        if self.white_low:
+            return self._white_low
+        if self.beat<0:
+            return self._black
+        return self.colors_at(self.beat)
 
     def on_beat(self, i:int, t:float):
-        if self.mode==1: self._ex1(i)
-        elif self.mode==2: self._ex2(i)
-        else: self._ex3(i)
+        self.beat=int(i)
+        self.white_low=False
 
     def finish_all_white_low(self):
-        self.colors=[WHITE_LOW]*self.n
-
-    def _ex1(self,k):
-        phase=k%2
-        for i in range(self.n):
-            self.colors[i]=RED if (i%2)==phase else GREEN
-
-    def _ex2(self,k):
-        self.colors=[(0,0,0)]*self.n
-        left=list(range(self.n//2-1,-1,-1))
-        right=list(range(self.n//2,self.n))
-        step=k%max(1,len(left))
-        if step < len(left):
-            a=left[step]; b=right[step] if step<len(right) else right[-1]
-            col=RED if step%2==0 else GREEN
-            self.colors[a]=col; self.colors[b]=col
-        if k%4==3:
-            for i in range(self.n): self.colors[i]=GREEN
-
-    def _ex3(self,k):
-        self.colors=[(0,0,0)]*self.n
-        seg=3; steps=6; s=(k%steps)
-        direction = 1 if (k%2)==0 else -1
-        head = (0 if direction==1 else self.n-1) + direction*s*seg
-        for j in range(seg):
-            idx=(head + direction*j) % self.n
-            self.colors[idx]= RED if (j%2)==0 else GREEN
-        if k%8==0:
-            for i in range(self.n//2): self.colors[i]=RED
-            for i in range(self.n//2,self.n): self.colors[i]=GREEN
-        elif k%8==1:
-            for i in range(self.n//2): self.colors[i]=GREEN
-            for i in range(self.n//2,self.n): self.colors[i]=RED
+        self.white_low=True
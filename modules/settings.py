@@ -5,6 +5,34 @@ DEFAULTS = {
     "beta_label": "Polar Ninja - Beta .05",
     "online_mode": True,
     "dmx_com_port": 11,
+    "baud": 57600,
+    "frame_rate": 40,
+    "dmx_keepalive_hz": 1.0,
+    "dmx_output": "serial",
+    "dmx_net_host": "",
+    "dmx_universes": 1,
+    "dmx_record_dir": "",
+    "fixture_profile": "config/profiles/LE062_10ch.json",
+    "start_address": 1,
+    "channels_per_fixture": 10,
+    "num_fixtures": 38,
+    "cue_map": "cues/cue-map.template.json",
+    "bake_lighting": True,
+    "lighting_cache_dir": "",
+    "beat_lookahead_ms": 40,
+    "render_thread": True,
+    "seek_mode": "pcm",
+    "pcm_cache": True,
+    "pcm_cache_dir": "",
+    "sound_cache_mb": 256,
+    "preload_workers": 3,
+    "mixer_freq": 44100,
+    "mixer_buffer": 256,
+    "mixer_voices": 4,
+    "fade_hz": 1000,
+    "transitions": {
+        "19>20": {"fade_out": 2.0, "fade_in": 0.0, "shape": "linear"},
+    },
     "music_dir": r"C:\PolarNinja\music",
     "assets_dir": r"C:\PolarNinja\assets",
     "songs": {},
@@ -53,7 +81,10 @@ def _maybe_migrate_old_paths(cfg):
                 cfg["songs"][cid] = os.path.join(DEFAULTS["music_dir"], FALLBACK_FILENAMES[cid]); changed = True
     return changed
 
-def load_settings():
+def load_settings(persist=True):
+    """Defaults merged with settings.json. With persist (the app), missing
+    folders are created and migrated / autofilled paths are written back;
+    tools pass persist=False to read the config without touching it."""
     cfg = DEFAULTS.copy()
     spath = _settings_path()
     if os.path.exists(spath):
@@ -65,13 +96,14 @@ def load_settings():
         except Exception:
             pass
 
-    _ensure_dir(cfg.get("music_dir", DEFAULTS["music_dir"]))
-    _ensure_dir(cfg.get("assets_dir", DEFAULTS["assets_dir"]))
+    if persist:
+        _ensure_dir(cfg.get("music_dir", DEFAULTS["music_dir"]))
+        _ensure_dir(cfg.get("assets_dir", DEFAULTS["assets_dir"]))
 
     changed = _maybe_migrate_old_paths(cfg)
     changed = _autofill_songs(cfg) or changed
 
-    if changed:
+    if changed and persist:
         try:
             with open(spath, "w", encoding="utf-8") as f:
                 json.dump(cfg, f, indent=2)
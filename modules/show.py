@@ -0,0 +1,47 @@
+import os
+
+from util.wave_assets import WAVE_EXT
+
+# Show logic shared by the app (App._render_frame / load_cue) and the
+# offline render (modules/offline_render.py), so both play the same show.
+
+# Cue order: the cue armed (preloaded) after each one
+NEXT_CUE = {"19": "20", "20": "21"}
+
+# Cues whose lights follow a beat grid, and the asset stem it comes from
+# in assets_dir: <stem>.pnwave, else the <stem>_beats.json it was built from
+BEAT_FILES = {"21": "CUE_21_-_ROCKIN"}
+
+
+def transition_for(cfg: dict, prev, cid):
+    """Crossfade settings for prev -> cid (settings "transitions", key
+    "19>20", else "*"), or None for a hard cut."""
+    table = cfg.get("transitions") or {}
+    tr = table.get(f"{prev}>{cid}", table.get("*"))
+    return tr if isinstance(tr, dict) else None
+
+
+def beats_path(cid, assets_dir):
+    """The beat grid file for cue cid, or None if it has none."""
+    stem = BEAT_FILES.get(cid)
+    if not stem or not assets_dir or not os.path.isdir(assets_dir):
+        return None
+    packed = os.path.join(assets_dir, stem + WAVE_EXT)
+    if os.path.exists(packed):
+        return packed
+    return os.path.join(assets_dir, stem + "_beats.json")
+
+
+def cue_colors(cid, pos: float, timeline, beats, rockin, n=38):
+    """One frame of cue cid's lights at song position pos.
+
+    Cue lighting comes from the compiled cue map (cues/*.json); CUE 21
+    follows its beat grid when there is one, until the timeline latches
+    (the hold to white). Advances beats, so call it once per frame.
+    """
+    cols = timeline.colors(pos) if timeline is not None else [(0, 0, 0)] * n
+    if cid == "21" and len(beats) and (timeline is None or timeline.held is None):
+        beats.advance(pos)
+        if beats.last_index >= 0:
+            cols = rockin.current_colors()
+    return cols
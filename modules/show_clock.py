@@ -0,0 +1,127 @@
+import time
+
+from modules.dmx_timing import RollingHistogram
+
+
+class ShowClock:
+    """The show's playhead, on time.perf_counter() (or on timer, e.g. the
+    simulated clock of an offline render).
+
+    Audio, lighting and the UI all read position(). The clock free-runs
+    between corrections; correct(measured) pulls it towards what the mixer
+    reports with a first-order filter (gain per sample), so a mixer position
+    that only advances in buffer-sized steps doesn't make the lights jitter,
+    while a slow drift (sound card vs. CPU clock, an underrun) is followed
+    within a fraction of a second. An error beyond resync_s (a restart the
+    clock was not told about) snaps it instead.
+
+    While running, position() never goes backwards between two reads
+    unless start()/seek() moved it.
+    """
+
+    def __init__(self, gain=0.1, resync_s=0.25, window=2048, timer=time.perf_counter):
+        self.timer = timer
+        self.gain = max(0.0, min(1.0, float(gain)))
+        self.resync_s = float(resync_s)
+        self.state = "stopped"  # stopped / running / paused
+        self._anchor_t = 0.0    # perf_counter at which ...
+        self._anchor_pos = 0.0  # ... the playhead was here
+        self._last_pos = 0.0
+
+        # Drift statistics: measured - clock, before correction
+        self.error_hist = RollingHistogram(window)
+        self.last_error_s = 0.0
+        self.mean_error_s = 0.0  # smoothed, signed
+        self.corrections = 0
+        self.resyncs = 0
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self.state == "running"
+
+    @property
+    def started(self) -> bool:
+        """Running or paused (play() was called and not stopped)."""
+        return self.state != "stopped"
+
+    def start(self, pos=0.0, now=None):
+        self._anchor_t = self.timer() if now is None else now
+        self._anchor_pos = float(pos)
+        self._last_pos = self._anchor_pos
+        self.state = "running"
+
+    def seek(self, pos: float, now=None):
+        """Move the playhead, keeping the running / paused state."""
+        if self.state == "running":
+            self.start(pos, now)
+        else:
+            self._anchor_pos = self._last_pos = float(pos)
+
+    def pause(self, now=None):
+        if self.state == "running":
+            self._anchor_pos = self._last_pos = self.position(now)
+            self.state = "paused"
+
+    def resume(self, now=None):
+        if self.state == "paused":
+            self.start(self._anchor_pos, now)
+
+    def stop(self):
+        self.state = "stopped"
+        self._anchor_pos = self._last_pos = 0.0
+
+    def hold(self, pos: float):
+        """Stop advancing at pos (e.g. the track ended) but stay started."""
+        self._anchor_pos = self._last_pos = float(pos)
+        self.state = "paused"
+
+    def position(self, now=None) -> float:
+        if self.state != "running":
+            return self._anchor_pos
+        if now is None:
+            now = self.timer()
+        pos = self._anchor_pos + (now - self._anchor_t)
+        if pos < self._last_pos:
+            pos = self._last_pos
+        self._last_pos = pos
+        return pos
+
+    # ------------------------------------------------------------------
+    # Drift correction
+    # ------------------------------------------------------------------
+
+    def correct(self, measured: float, now=None):
+        """Feed one measured playhead (seconds) from the audio output."""
+        if self.state != "running":
+            return
+        if now is None:
+            now = self.timer()
+        err = measured - (self._anchor_pos + (now - self._anchor_t))
+        self.last_error_s = err
+        self.error_hist.record(abs(err))
+        self.mean_error_s += 0.05 * (err - self.mean_error_s)
+        if abs(err) > self.resync_s:
+            self.start(measured, now)
+            self.resyncs += 1
+            return
+        self._anchor_pos += self.gain * err
+        self.corrections += 1
+
+    def drift_stats(self) -> dict:
+        """Audio vs. clock error in ms (|error| percentiles, signed mean)."""
+        s = self.error_hist.summary()
+        s.update(
+            last=round(self.last_error_s * 1000.0, 2),
+            mean=round(self.mean_error_s * 1000.0, 2),
+            resyncs=self.resyncs,
+        )
+        return s
+
+    def status_text(self) -> str:
+        if not self.error_hist.n:
+            return ""
+        return f"a/v {self.error_hist.percentile(95) * 1000.0:.1f} ms"
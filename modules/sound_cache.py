@@ -0,0 +1,135 @@
+import functools
+import threading
+from collections import OrderedDict
+
+
+def sound_bytes(snd) -> int:
+    """Size of a Sound's decoded samples (no copy)."""
+    try:
+        return memoryview(snd).nbytes
+    except Exception:
+        try:
+            return len(snd.get_raw())
+        except Exception:
+            return 0
+
+
+def _locked(fn):
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return fn(self, *args, **kwargs)
+    return wrapper
+
+
+class SoundCache:
+    """Decoded Sounds by path, within a byte budget, least recently used
+    evicted first.
+
+    Pinned paths (the track playing, the overlay, the next armed cue) are
+    never evicted. put() makes room by evicting unpinned entries; if the
+    sound still doesn't fit it is refused, unless force is set (a sound that
+    is about to play), in which case the cache may run over budget until
+    pins are released. Counters: hits, misses, evictions, rejected.
+
+    Safe to use from the preload workers and the GUI / render threads.
+    """
+
+    def __init__(self, budget_bytes=256 * 1024 * 1024):
+        self.budget = max(0, int(budget_bytes))
+        self._entries = OrderedDict()  # path -> (sound, nbytes), LRU first
+        self._pins = set()
+        self._lock = threading.RLock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    def __contains__(self, path):
+        return path in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @_locked
+    def get(self, path):
+        entry = self._entries.get(path)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(path)
+        self.hits += 1
+        return entry[0]
+
+    @_locked
+    def peek(self, path):
+        """Like get(), without touching the LRU order or the counters."""
+        entry = self._entries.get(path)
+        return entry[0] if entry is not None else None
+
+    @_locked
+    def fits(self, nbytes: int) -> bool:
+        """Whether nbytes more would fit after evicting everything unpinned."""
+        pinned = sum(n for p, (_, n) in self._entries.items() if p in self._pins)
+        return pinned + nbytes <= self.budget
+
+    @_locked
+    def put(self, path, snd, force=False) -> bool:
+        n = sound_bytes(snd)
+        old = self._entries.pop(path, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        if not force and not self.fits(n):
+            if old is not None:
+                self._entries[path] = old
+                self.nbytes += old[1]
+            self.rejected += 1
+            return False
+        self._evict(self.budget - n)
+        self._entries[path] = (snd, n)
+        self.nbytes += n
+        return True
+
+    @_locked
+    def discard(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
+    def _evict(self, limit: int):
+        """Drop unpinned entries, oldest first, until nbytes <= limit."""
+        if self.nbytes <= limit:
+            return
+        for path in [p for p in self._entries if p not in self._pins]:
+            self.discard(path)
+            self.evictions += 1
+            if self.nbytes <= limit:
+                return
+
+    # ------------------------------------------------------------------
+    # Pinning
+    # ------------------------------------------------------------------
+
+    @_locked
+    def set_pins(self, paths):
+        """Pin exactly these paths (None entries are ignored); entries that
+        are no longer pinned become evictable, and the cache is trimmed back
+        to the budget."""
+        self._pins = {p for p in paths if p}
+        self._evict(self.budget)
+
+    def pinned(self, path) -> bool:
+        return path in self._pins
+
+    @_locked
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "mb": round(self.nbytes / 1048576.0, 1),
+            "budget_mb": round(self.budget / 1048576.0, 1),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,33 @@
+import time
+
+
+class StartupTimer:
+    """Named marks from app start to the first painted frame.
+
+    t0 is taken when the timer is created (the first line of app.py), so
+    interpreter start-up before that isn't included; `python -X importtime`
+    (tools/startup_report.py) covers it.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks = []  # (name, seconds since t0)
+
+    def mark(self, name: str, at=None):
+        at = time.perf_counter() if at is None else at
+        self.marks.append((name, at - self.t0))
+
+    def elapsed(self, name: str) -> float:
+        """Seconds from t0 to the first mark called name, -1.0 if none."""
+        for n, t in self.marks:
+            if n == name:
+                return t
+        return -1.0
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<18} {'at ms':>9} {'delta ms':>9}"]
+        prev = 0.0
+        for name, t in sorted(self.marks, key=lambda m: m[1]):
+            lines.append(f"{name:<18} {t * 1000.0:>9.1f} {(t - prev) * 1000.0:>9.1f}")
+            prev = t
+        return "\n".join(lines)
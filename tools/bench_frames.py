@@ -0,0 +1,126 @@
+"""Micro-benchmark: list-of-tuples color frames vs the NumPy frame pipeline.
+
+The list versions are the pre-NumPy code from app.py (sine fade, blend,
+CUE 21 red/green). Each case is timed per frame at several pixel counts,
+checked for identical output, and shown against the tick budget.
+
+    python tools/bench_frames.py [--pixels 38 1000 5000] [--fps 40]
+"""
+import argparse
+import itertools
+import math
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from modules import frames  # noqa: E402
+from modules.cue_timeline import CueTimeline  # noqa: E402
+from modules.dmx_universe import FixturePatch  # noqa: E402
+
+
+# ----------------------------------------------------------------------
+# Reference list code (as it was in app.py)
+# ----------------------------------------------------------------------
+
+def list_fade(t, n):
+    x = (math.sin(t * 1.0) + 1) / 2
+    cols = []
+    for i in range(n):
+        if i % 2 == 0:
+            cols.append((int(255 * x), int(255 * (1 - x)), 0))
+        else:
+            cols.append((int(255 * (1 - x)), int(255 * x), 0))
+    return cols
+
+
+def list_blend(cols_a, cols_b, alpha):
+    out = []
+    a = max(0.0, min(1.0, float(alpha)))
+    for (r1, g1, b1), (r2, g2, b2) in zip(cols_a, cols_b):
+        r = int(round(r1 * (1 - a) + r2 * a))
+        g = int(round(g1 * (1 - a) + g2 * a))
+        b = int(round(b1 * (1 - a) + b2 * a))
+        out.append((r, g, b))
+    return out
+
+
+def list_rockin(t, n):
+    step = int(t * 2.0) % 2
+    cols = []
+    for i in range(n):
+        if (i + step) % 2 == 0:
+            cols.append((255, 0, 0))
+        else:
+            cols.append((0, 255, 0))
+    return cols
+
+
+def list_cue20_wow(t, n):
+    # 48.0 -> 50.0: green right fading into the sine fade
+    half = n // 2
+    green_right = [(0, 0, 0)] * half + [(0, 255, 0)] * (n - half)
+    return list_blend(green_right, list_fade(t, n), (t - 48.0) / 2.0)
+
+
+# ----------------------------------------------------------------------
+
+def per_frame_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def run(n, budget_us):
+    out = frames.new_frame(n)
+    other = frames.new_frame(n)
+    blender = frames.Blender(n)
+    frames.split(other, frames.BLACK, frames.GREEN)
+    timeline = CueTimeline([
+        {"t": 0.0, "pattern": "GreenRight"},
+        {"t": 48.0, "pattern": "Fade", "blend": 2.0},
+    ], n)
+    t = 48.7
+
+    # Same output, or the comparison is meaningless
+    assert np.array_equal(frames.fade(out, t), np.array(list_fade(t, n), np.uint8))
+    assert np.array_equal(timeline.colors(t), np.array(list_cue20_wow(t, n), np.uint8))
+    assert np.array_equal(frames.alternate(out, frames.RED, frames.GREEN, int(t * 2.0)),
+                          np.array(list_rockin(t, n), np.uint8))
+
+    # The timeline memoizes per millisecond, so step t to measure real work
+    steps = itertools.cycle([48.0 + 0.001 * k for k in range(1, 2000)])
+
+    a_list = list_fade(t, n)
+    b_list = [tuple(c) for c in other.tolist()]
+    number = max(20, 200000 // n)
+    cases = [
+        ("fade", lambda: list_fade(t, n), lambda: frames.fade(out, t)),
+        ("blend", lambda: list_blend(a_list, b_list, 0.3), lambda: blender.blend(out, other, 0.3)),
+        ("rockin", lambda: list_rockin(t, n),
+         lambda: frames.alternate(out, frames.RED, frames.GREEN, int(t * 2.0))),
+        ("cue20 blend+dmx", lambda: FixturePatch.flatten(list_cue20_wow(next(steps), n)),
+         lambda: FixturePatch.flatten(timeline.colors(next(steps)))),
+    ]
+    print(f"\npixels = {n}")
+    print(f"  {'case':<16} {'list us':>10} {'numpy us':>10} {'speedup':>8} {'numpy % tick':>13}")
+    for name, ref, new in cases:
+        a = per_frame_us(ref, number)
+        b = per_frame_us(new, number)
+        print(f"  {name:<16} {a:>10.1f} {b:>10.1f} {a / b:>7.1f}x {100.0 * b / budget_us:>12.2f}%")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pixels", type=int, nargs="+", default=[38, 1000, 5000])
+    ap.add_argument("--fps", type=float, default=40.0, help="tick rate for the budget column")
+    args = ap.parse_args()
+    budget_us = 1e6 / args.fps
+    print(f"tick budget: {budget_us / 1000.0:.1f} ms at {args.fps:g} fps")
+    for n in args.pixels:
+        run(max(2, n), budget_us)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Waveform / beat asset load times: JSON and CSV imports vs the .pnwave container.
+
+Writes synthetic long tracks in each format to a temp folder and times
+util.wave_assets loading them. ".pnwave (touched)" also reads every value
+once, since the mapped load itself touches no samples.
+
+    python tools/bench_wave_assets.py [--minutes 3 10 60] [--rate 100] [--repeat 5]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from util.wave_assets import (  # noqa: E402
+    load_waveform, load_beats, write_wave_asset, WAVE_INT16,
+)
+
+
+def write_track(folder, minutes, rate):
+    """JSON, CSV and .pnwave (float32, int16) of one synthetic track."""
+    duration = minutes * 60.0
+    n = int(duration * rate)
+    rng = np.random.default_rng(1)
+    values = np.abs(np.sin(np.arange(n) / rate) * rng.uniform(0.2, 1.0, n)).astype(np.float32)
+    beats = np.arange(0.25, duration, 0.5)  # 120 bpm
+    stem = os.path.join(folder, f"T{minutes:g}")
+    paths = {
+        "json": stem + "_waveform.json",
+        "csv": stem + "_waveform.csv",
+        "beats": stem + "_beats.json",
+        "pnwave": stem + ".pnwave",
+        "pnwave16": stem + "_16.pnwave",
+    }
+    with open(paths["json"], "w", encoding="utf-8") as f:
+        json.dump({"duration": duration, "points": {"value": values.tolist()}}, f)
+    with open(paths["csv"], "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["t", "value"])
+        w.writerows(zip((np.arange(n) / rate).round(4).tolist(), values.tolist()))
+    with open(paths["beats"], "w", encoding="utf-8") as f:
+        json.dump({"tempo_bpm": 120.0, "beats_sec": beats.tolist()}, f)
+    write_wave_asset(paths["pnwave"], values, duration, beats, 120.0, rate)
+    write_wave_asset(paths["pnwave16"], values, duration, beats, 120.0, rate, fmt=WAVE_INT16)
+    return n, len(beats), paths
+
+
+def best_ms(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000.0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--minutes", type=float, nargs="+", default=[3, 10, 60])
+    ap.add_argument("--rate", type=float, default=100.0, help="waveform points per second")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        for minutes in args.minutes:
+            n, nb, p = write_track(folder, minutes, args.rate)
+            print(f"\n{minutes:g} min: {n:,} waveform points, {nb:,} beats")
+            print(f"  {'format':<20} {'size KB':>9} {'load ms':>9} {'vs json':>8}")
+            # (name, file, loader, baseline row)
+            cases = [
+                ("waveform json", p["json"], lambda: load_waveform(p["json"]), "waveform json"),
+                ("waveform csv", p["csv"], lambda: load_waveform(p["csv"]), "waveform json"),
+                (".pnwave float32", p["pnwave"], lambda: load_waveform(p["pnwave"]), "waveform json"),
+                (".pnwave (touched)", p["pnwave"],
+                 lambda: float(load_waveform(p["pnwave"])["values"].sum()), "waveform json"),
+                (".pnwave int16", p["pnwave16"], lambda: load_waveform(p["pnwave16"]), "waveform json"),
+                ("beats json", p["beats"], lambda: load_beats(p["beats"]), "beats json"),
+                ("beats .pnwave", p["pnwave"], lambda: load_beats(p["pnwave"]), "beats json"),
+            ]
+            times = {}
+            for name, path, fn, base in cases:
+                times[name] = ms = best_ms(fn, args.repeat)
+                print(f"  {name:<20} {os.path.getsize(path) / 1024.0:>9.0f} {ms:>9.3f} {times[base] / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Build the waveform assets for the cue songs: peak pyramid + .pnwave.
+
+Each song is decoded once (through the app's PCM cache, so a song the app
+already decoded is not decoded again) into <assets_dir>/<song stem>:
+
+  _peaks.bin  min/max peak pyramid; WaveView reads only the zoom level
+              that matches its width
+  .pnwave     waveform (the finest peak level as 0..1 amplitudes) and the
+              beat grid imported from <stem>_beats.json, memory-mapped by
+              util.wave_assets.load_wave_asset
+
+A song that isn't on this machine gets its .pnwave imported from an
+existing <stem>_waveform.json / .csv instead. JSON and CSV are import
+formats only; the app and WaveView read the binary files.
+
+    python tools/build_wave_assets.py [songs ...] [--assets DIR] [--block 256] [--int16]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np  # noqa: E402
+
+from modules import audio  # noqa: E402
+from modules.pcm_cache import PCMCache  # noqa: E402
+from modules.settings import load_settings  # noqa: E402
+from util.wave_assets import (  # noqa: E402
+    asset_stem, write_peaks, load_peaks, load_waveform, load_beats,
+    write_wave_asset, WAVE_EXT, WAVE_FLOAT32, WAVE_INT16,
+)
+
+
+def decode(song, cache):
+    if cache is not None:
+        return cache.get(song, audio.pygame.mixer.Sound)
+    snd = audio.pygame.mixer.Sound(song)
+    _, _, channels = audio.pygame.mixer.get_init()
+    return np.frombuffer(memoryview(snd).cast("B"), np.int16).reshape(-1, channels)
+
+
+def beat_grid(out_dir, stem):
+    path = os.path.join(out_dir, stem + "_beats.json")
+    if not os.path.exists(path):
+        return (), 0.0
+    data = load_beats(path)
+    return data["beats_sec"], data["tempo_bpm"]
+
+
+def import_legacy(out_dir, stem, fmt):
+    """<stem>_waveform.json / .csv (+ beats) -> <stem>.pnwave; the path or None."""
+    for ext in (".json", ".csv"):
+        src = os.path.join(out_dir, stem + "_waveform" + ext)
+        if os.path.exists(src):
+            wf = load_waveform(src)
+            beats, bpm = beat_grid(out_dir, stem)
+            dst = os.path.join(out_dir, stem + WAVE_EXT)
+            write_wave_asset(dst, wf["values"], wf["duration"], beats, bpm, fmt=fmt)
+            return dst
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("songs", nargs="*", help="default: the cue songs in settings.json")
+    ap.add_argument("--assets", default=None, help="output folder (default: settings assets_dir)")
+    ap.add_argument("--block", type=int, default=256, help="frames per bin at the finest level")
+    ap.add_argument("--no-pcm-cache", action="store_true", help="decode without the PCM cache")
+    ap.add_argument("--int16", action="store_true", help="store .pnwave values as int16 (half the size)")
+    args = ap.parse_args()
+
+    cfg = load_settings(persist=False)  # don't rewrite the user's settings.json
+    songs = args.songs or [p for _, p in sorted((cfg.get("songs") or {}).items())]
+    out_dir = args.assets or cfg.get("assets_dir") or "."
+    os.makedirs(out_dir, exist_ok=True)
+
+    freq, size, channels = audio.init_mixer(cfg.get("mixer_freq", 44100), cfg.get("mixer_buffer", 256))
+    cache = None
+    if cfg.get("pcm_cache", True) and not args.no_pcm_cache:
+        cache = PCMCache(cfg.get("pcm_cache_dir") or os.path.join(out_dir, "pcm_cache"), freq, size, channels)
+
+    fmt = WAVE_INT16 if args.int16 else WAVE_FLOAT32
+    for song in songs:
+        stem = asset_stem(song)
+        if not os.path.exists(song):
+            dst = import_legacy(out_dir, stem, fmt)
+            print(f"imported : {dst}" if dst else f"missing  : {song}")
+            continue
+        t0 = time.perf_counter()
+        samples = decode(song, cache)
+        if samples is None:
+            print(f"failed   : {song}")
+            continue
+        t1 = time.perf_counter()
+        path = os.path.join(out_dir, stem + "_peaks.bin")
+        levels = write_peaks(path, samples, freq, args.block)
+        # Waveform: the finest level's amplitude, freq / block points per second
+        amp = np.maximum(np.abs(levels[0][:, 0].astype(np.float32)), levels[0][:, 1]) / 32768.0
+        beats, bpm = beat_grid(out_dir, stem)
+        write_wave_asset(os.path.join(out_dir, stem + WAVE_EXT), amp, len(samples) / float(freq),
+                         beats, bpm, rate=freq / float(args.block), fmt=fmt)
+        t2 = time.perf_counter()
+        peaks = load_peaks(path)
+        print(f"{os.path.basename(path)}: {peaks.duration:.1f} s, {len(levels)} levels "
+              f"({len(levels[0])} .. {len(levels[-1])} bins), {os.path.getsize(path) / 1024.0:.0f} KB; "
+              f"{len(beats)} beats; decode {(t1 - t0) * 1000.0:.0f} ms, assets {(t2 - t1) * 1000.0:.0f} ms")
+        peaks.close()
+
+
+if __name__ == "__main__":
+    main()
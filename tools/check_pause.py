@@ -0,0 +1,81 @@
+"""Pause regression check: seek, play and crossfade after a pause.
+
+A pause must not outlive what comes after it: seek() or stop() + play()
+without unpause() has to keep feeding the new voice, and a crossfade has
+to fade the outgoing one. Plays in real time (~6 s); use
+SDL_AUDIODRIVER=dummy to run it without a sound card.
+
+    python tools/check_pause.py "C:\\PolarNinja\\music\\CUE 19 - UNLOADING.mp3" "C:\\PolarNinja\\music\\CUE 20 - HEAD ELF SCENE.mp3"
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import audio as audio_mod  # noqa: E402
+from modules.audio import AudioEngine  # noqa: E402
+
+
+def check_pause_seek(audio, song):
+    """pause -> seek: the PCM voice keeps being fed past its first chunk."""
+    audio.load(song)
+    audio.seek_mode = "pcm"
+    audio.play()
+    time.sleep(0.2)
+    audio.pause()
+    audio.seek(0.0)
+    v = audio.voice
+    first = v.next_off
+    time.sleep(audio_mod._PCM_CHUNK_S + 0.5)
+    audio.update()
+    if audio.mixer.paused:
+        return "mixer still paused"
+    if v.next_off == first or not v.busy():
+        return "voice not fed after its first chunk"
+    return None
+
+
+def check_pause_stop_play(audio, song, other):
+    """pause -> stop -> play -> crossfade: the outgoing voice fades out."""
+    audio.load(song)
+    audio.play()
+    time.sleep(0.2)
+    audio.pause()
+    audio.stop()
+    audio.play()
+    time.sleep(0.2)
+    out = audio.voice
+    audio.crossfade(other, fade_out=1.0)
+    time.sleep(1.5)
+    audio.update()
+    if audio.mixer.paused:
+        return "mixer still paused"
+    if out in audio.mixer.voices and out.gain > 0.0:
+        return f"outgoing voice still at gain {out.gain:.2f}"
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("song")
+    ap.add_argument("other", help="song to crossfade to")
+    args = ap.parse_args()
+
+    audio = AudioEngine()
+    checks = (
+        ("pause -> seek", lambda: check_pause_seek(audio, args.song)),
+        ("pause -> stop -> play -> crossfade", lambda: check_pause_stop_play(audio, args.song, args.other)),
+    )
+    failed = 0
+    for name, check in checks:
+        err = check()
+        print(f"{name:<36} {'FAIL: ' + err if err else 'ok'}")
+        failed += err is not None
+    audio.stop()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Bench check for DMXEngine without the real hardware attached.
+
+serial (default): opens a pseudo-terminal pair, points DMXEngine at the
+    slave side as if it were the UltraDMX Micro's COM port, and parses the
+    Enttec frames coming out of the master side (POSIX only).
+artnet / sacn: binds a UDP listener on 127.0.0.1, points the network
+    backend at it and checks every packet's header, per-universe sequence
+    numbers and per-universe frame rate.
+
+    python tools/dmx_loopback.py [--mode serial|artnet|sacn] [--seconds 5]
+                                 [--fps 40] [--universes 4]
+"""
+import argparse
+import os
+import select
+import socket
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.dmx_engine import (  # noqa: E402
+    DMXEngine,
+    DMX_CHANNELS,
+    ENTTEC_SOM,
+    ENTTEC_EOM,
+    ENTTEC_LABEL_SEND_DMX,
+)
+from modules.dmx_net import ArtNetBackend, SACNBackend, ARTNET_HEADER, SACN_HEADER  # noqa: E402
+
+
+class UniverseStats:
+    def __init__(self):
+        self.frames = 0
+        self.first_t = None
+        self.last_t = None
+        self.last_seq = None
+        self.seq_errors = 0
+        self.malformed = 0
+
+    def add(self, now, data, seq=None, seq_wrap=256, seq_start=0):
+        if self.first_t is None:
+            self.first_t = now
+        self.last_t = now
+        self.frames += 1
+        if seq is not None:
+            if self.last_seq is not None:
+                want = self.last_seq + 1
+                if want >= seq_wrap:
+                    want = seq_start
+                if seq != want:
+                    self.seq_errors += 1
+            self.last_seq = seq
+        if len(data) != DMX_CHANNELS or data.count(data[0]) != DMX_CHANNELS:
+            self.malformed += 1
+
+    @property
+    def fps(self):
+        if self.frames > 1 and self.last_t > self.first_t:
+            return (self.frames - 1) / (self.last_t - self.first_t)
+        return 0.0
+
+
+def parse_enttec(buf: bytearray):
+    """Pop complete label-6 frames off the front of buf; yields channel bytes."""
+    while True:
+        start = buf.find(bytes([ENTTEC_SOM]))
+        if start < 0:
+            buf.clear()
+            return
+        if start:
+            del buf[:start]
+        if len(buf) < 4:
+            return
+        n = buf[2] | (buf[3] << 8)
+        total = 4 + n + 1
+        if len(buf) < total:
+            return
+        if buf[1] != ENTTEC_LABEL_SEND_DMX or buf[total - 1] != ENTTEC_EOM:
+            del buf[:1]
+            continue
+        yield bytes(buf[5:4 + n])
+        del buf[:total]
+
+
+def parse_artnet(pkt: bytes):
+    """-> (universe, sequence, data) or None if the header is wrong."""
+    if len(pkt) < ARTNET_HEADER or pkt[:8] != b"Art-Net\x00":
+        return None
+    op, = struct.unpack_from("<H", pkt, 8)
+    ver, = struct.unpack_from(">H", pkt, 10)
+    length, = struct.unpack_from(">H", pkt, 16)
+    if op != 0x5000 or ver != 14 or len(pkt) != ARTNET_HEADER + length:
+        return None
+    universe = pkt[14] | (pkt[15] << 8)
+    return universe, pkt[12], pkt[ARTNET_HEADER:]
+
+
+def parse_sacn(pkt: bytes):
+    """-> (universe, sequence, data) or None if the header is wrong."""
+    if len(pkt) < SACN_HEADER or pkt[4:16] != b"ASC-E1.17\x00\x00\x00":
+        return None
+    root_vec, = struct.unpack_from(">I", pkt, 18)
+    frame_vec, = struct.unpack_from(">I", pkt, 40)
+    count, = struct.unpack_from(">H", pkt, 123)
+    if root_vec != 4 or frame_vec != 2 or pkt[117] != 0x02 or pkt[125] != 0:
+        return None
+    if len(pkt) != SACN_HEADER + count - 1:
+        return None
+    universe, = struct.unpack_from(">H", pkt, 113)
+    return universe, pkt[111], pkt[SACN_HEADER:]
+
+
+def run_serial(args, submit_value):
+    import tty
+
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    name = os.ttyname(slave)
+    states = []
+    dmx = DMXEngine(name, status_cb=states.append, frame_rate=args.fps)
+    stats = {0: UniverseStats()}
+    buf = bytearray()
+    dmx.start()
+    t_end = time.perf_counter() + args.seconds
+    while time.perf_counter() < t_end:
+        submit_value(dmx, 1)
+        r, _, _ = select.select([master], [], [], 0.05)
+        if not r:
+            continue
+        buf.extend(os.read(master, 65536))
+        for data in parse_enttec(buf):
+            stats[0].add(time.perf_counter(), data)
+    dmx.stop()
+    os.close(master)
+    os.close(slave)
+    return name, states, dmx, stats
+
+
+def run_udp(args, submit_value):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.settimeout(0.05)
+    port = listener.getsockname()[1]
+    if args.mode == "artnet":
+        backend = ArtNetBackend("127.0.0.1", port, first_universe=0)
+        parse, wrap, start = parse_artnet, 256, 1
+    else:
+        backend = SACNBackend("127.0.0.1", port, first_universe=1)
+        parse, wrap, start = parse_sacn, 256, 0
+    states = []
+    dmx = DMXEngine(None, status_cb=states.append, frame_rate=args.fps,
+                    backend=backend, universes=args.universes)
+    stats = {}
+    bad = UniverseStats()
+    dmx.start()
+    t_end = time.perf_counter() + args.seconds
+    while time.perf_counter() < t_end:
+        submit_value(dmx, len(dmx.universes))
+        try:
+            pkt = listener.recv(2048)
+        except socket.timeout:
+            continue
+        parsed = parse(pkt)
+        if parsed is None:
+            bad.malformed += 1
+            continue
+        universe, seq, data = parsed
+        stats.setdefault(universe, UniverseStats()).add(
+            time.perf_counter(), data, seq, seq_wrap=wrap, seq_start=start)
+    dmx.stop()
+    listener.close()
+    if bad.malformed:
+        stats["?"] = bad
+    return f"udp://127.0.0.1:{port}", states, dmx, stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--mode", choices=("serial", "artnet", "sacn"), default="serial")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--fps", type=float, default=40.0)
+    ap.add_argument("--universes", type=int, default=4, help="network modes only")
+    args = ap.parse_args()
+
+    counter = [0]
+
+    def submit_value(dmx, universes):
+        # Change every channel each time so no frame is skipped as unchanged
+        counter[0] = (counter[0] + 1) & 0xFF
+        frame = bytes([counter[0]]) * DMX_CHANNELS
+        for u in range(universes):
+            dmx.submit(frame, universe=u)
+
+    if args.mode == "serial":
+        target, states, dmx, stats = run_serial(args, submit_value)
+    else:
+        target, states, dmx, stats = run_udp(args, submit_value)
+
+    print(f"output      : {args.mode} -> {target}")
+    print(f"status      : {' -> '.join(states) or '(none)'}")
+    print(f"target fps  : {args.fps:.1f}")
+    print(f"engine fps  : {dmx.actual_fps:.2f}")
+    for universe, st in sorted(stats.items(), key=lambda kv: str(kv[0])):
+        print(f"universe {universe!s:<3}: {st.frames} frames, {st.fps:.2f} fps, "
+              f"{st.seq_errors} sequence errors, {st.malformed} malformed")
+    print("counters    : " + ", ".join(f"{k}={v}" for k, v in dmx.counters().items()))
+    print("timing (ms) :")
+    print(dmx.timing.format_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Inspect, replay, compare and benchmark DMX frame logs (*.dmxlog).
+
+Frame logs are written by the app when "dmx_record_dir" is set in
+settings.json (use "dmx_output": "null" to record a run without hardware).
+
+    python tools/dmx_replay.py info   show.dmxlog
+    python tools/dmx_replay.py play   show.dmxlog [--speed 1] [--output serial|artnet|sacn|null]
+                                                  [--port 11] [--host 10.0.0.50]
+    python tools/dmx_replay.py compare run.dmxlog golden.dmxlog [--tolerance 0]
+    python tools/dmx_replay.py bench  show.dmxlog [--output null] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.dmx_engine import DMXEngine  # noqa: E402
+from modules.dmx_net import make_backend  # noqa: E402
+from modules.dmx_recorder import FrameLog, replay, bench, compare  # noqa: E402
+
+
+def _engine(args, log, status_cb=lambda s: None):
+    cfg = {"dmx_output": args.output, "dmx_net_host": args.host}
+    universes = max(log.universe_ids() or [0]) + 1
+    return DMXEngine(
+        args.port,
+        status_cb=status_cb,
+        frame_rate=log.frame_rate or 40.0,
+        backend=make_backend(cfg),
+        universes=universes,
+        # Replays should reproduce every recorded frame, not skip repeats
+        keepalive_hz=0,
+    )
+
+
+def cmd_info(args):
+    log = FrameLog(args.log)
+    print(f"file        : {args.log}")
+    print(f"frames      : {len(log)}")
+    print(f"universes   : {', '.join(str(u) for u in log.universe_ids()) or '-'}")
+    print(f"duration    : {log.duration:.2f} s")
+    print(f"frame rate  : {log.frame_rate:g} fps (recorded as)")
+    log.close()
+
+
+def cmd_play(args):
+    log = FrameLog(args.log)
+    states = []
+    dmx = _engine(args, log, status_cb=states.append)
+    dmx.start()
+    try:
+        took = replay(log, dmx, speed=args.speed)
+        time.sleep(2.0 / dmx.frame_rate)  # let the last frame go out
+    except KeyboardInterrupt:
+        took = None
+    dmx.stop()
+    if took is not None:
+        print(f"replayed {len(log)} frames ({log.duration:.2f} s of show) in {took:.2f} s")
+    print("status   : " + (" -> ".join(states) or "(never connected)"))
+    print("counters : " + ", ".join(f"{k}={v}" for k, v in dmx.counters().items()))
+    log.close()
+
+
+def cmd_compare(args):
+    run = FrameLog(args.run)
+    golden = FrameLog(args.golden)
+    res = compare(run, golden, step=args.step, tolerance=args.tolerance)
+    print(f"run      : {args.run} ({run.duration:.2f} s)")
+    print(f"golden   : {args.golden} ({golden.duration:.2f} s)")
+    print(f"samples  : {res['samples']}")
+    print(f"mismatch : {res['mismatches']} (max channel diff {res['max_diff']})")
+    if res["first_mismatch_s"] is not None:
+        print(f"first at : {res['first_mismatch_s']:.3f} s")
+    run.close()
+    golden.close()
+    return 1 if res["mismatches"] else 0
+
+
+def cmd_bench(args):
+    log = FrameLog(args.log)
+    dmx = _engine(args, log)
+    n, secs = bench(log, dmx, repeat=args.repeat)
+    dmx.stop()
+    if secs > 0.0:
+        show_s = log.duration * args.repeat
+        print(f"{n} frames in {secs:.3f} s -> {n / secs:,.0f} frames/s, "
+              f"{(show_s / secs) if show_s else 0.0:,.1f}x real time ({args.output})")
+    print("write ms : " + str(dmx.timing.hists["write"].summary()))
+    log.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("info")
+    p.add_argument("log")
+    p.set_defaults(fn=cmd_info)
+
+    for name, fn in (("play", cmd_play), ("bench", cmd_bench)):
+        p = sub.add_parser(name)
+        p.add_argument("log")
+        p.add_argument("--output", default="null" if name == "bench" else "serial",
+                       choices=("serial", "artnet", "sacn", "null"))
+        p.add_argument("--port", default=11, help="COM number or device path (serial)")
+        p.add_argument("--host", default="", help="node IP (artnet/sacn)")
+        if name == "play":
+            p.add_argument("--speed", type=float, default=1.0, help="0 = as fast as possible")
+        else:
+            p.add_argument("--repeat", type=int, default=1)
+        p.set_defaults(fn=fn)
+
+    p = sub.add_parser("compare")
+    p.add_argument("run")
+    p.add_argument("golden")
+    p.add_argument("--tolerance", type=int, default=0, help="per-channel difference allowed")
+    p.add_argument("--step", type=float, default=None, help="sample step in seconds")
+    p.set_defaults(fn=cmd_compare)
+
+    args = ap.parse_args()
+    sys.exit(args.fn(args) or 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Offline show render: audio mixdown + DMX frame log, faster than real time.
+
+Plays a cue script through the app's AudioEngine, cue lighting and DMX
+framing on a simulated clock (SDL's dummy audio driver, no window, no DMX
+hardware) and writes what the audience would hear and the fixtures would
+get. Without --script, CUE 19, 20 and 21 play back to back, each cue with
+a transition starting its fade before the previous song ends.
+
+    python tools/render_show.py [--out render] [--script "19@0 20@185.5 21@400"]
+                                [--end 600] [--fps 40]
+
+Compare a run against a golden one with
+    python tools/dmx_replay.py compare render/show.dmxlog golden.dmxlog
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from modules.offline_render import OfflineShow, parse_script  # noqa: E402
+from modules.settings import load_settings  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--out", default=os.path.join(ROOT, "render"), help="folder for show.wav / show.dmxlog")
+    ap.add_argument("--script", default="", help='cue@seconds list, e.g. "19@0 20@185.5 21@400"')
+    ap.add_argument("--end", type=float, default=None, help="seconds to render (default: until the last song ends)")
+    ap.add_argument("--fps", type=float, default=None, help="DMX frame rate (default: settings frame_rate)")
+    args = ap.parse_args()
+
+    # Read-only: a render must not rewrite the user's settings.json
+    show = OfflineShow(load_settings(persist=False), ROOT, frame_rate=args.fps)
+    script = parse_script(args.script) if args.script else None
+    wav_path = os.path.join(args.out, "show.wav")
+    log_path = os.path.join(args.out, "show.dmxlog")
+    stats = show.render(wav_path, log_path, script=script, end_s=args.end)
+
+    print(f"script   : {' '.join(f'{c}@{t:g}' for t, c in (script or show.default_script()))}")
+    print(f"audio    : {wav_path}")
+    print(f"frames   : {log_path} ({stats['dmx_frames']} frames at {show.frame_rate:g} fps)")
+    print(f"rendered : {stats['show_s']:.1f} s of show in {stats['wall_s']:.2f} s "
+          f"-> {stats['x_real_time']:,.1f}x real time")
+    print("frame ms : " + str(stats["frame_ms"]))
+    print("counters : " + ", ".join(f"{k}={v}" for k, v in stats["dmx"].items()))
+
+
+if __name__ == "__main__":
+    main()
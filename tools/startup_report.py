@@ -0,0 +1,84 @@
+"""Cold-start report: import-time breakdown plus the app's own startup marks.
+
+Runs app.py under `python -X importtime` with --exit-after-startup, so the
+window opens, loads CUE 19, prints its startup report and closes. Shows
+the slowest top-level imports (cumulative, like -X importtime) and the
+marks up to first paint, so cold start can be tracked as a number.
+Imports done off the GUI thread (pygame, on the first preload worker) are
+listed too; the marks show whether they delayed the first paint.
+
+    python tools/startup_report.py [--runs 3] [--top 15]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+_MARK_RE = re.compile(r"^(\S.*?)\s+([\d.]+)\s+([\d.]+)$")
+
+
+def run_once(timeout):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.join(ROOT, "app.py"), "--exit-after-startup"],
+        cwd=ROOT, capture_output=True, text=True, timeout=timeout,
+    )
+    imports = []  # (cumulative us, self us, depth, name)
+    for line in proc.stderr.splitlines():
+        m = _IMPORT_RE.match(line)
+        if m:
+            imports.append((int(m.group(2)), int(m.group(1)), len(m.group(3)) // 2, m.group(4)))
+    marks = {}
+    in_report = False
+    for line in proc.stdout.splitlines():
+        if line.startswith("Startup (ms):"):
+            in_report = True
+            continue
+        if in_report:
+            m = _MARK_RE.match(line.strip())
+            if not m:
+                if marks:
+                    break
+                continue
+            marks[m.group(1).strip()] = float(m.group(2))
+    return imports, marks
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=1, help="runs to take the median of")
+    ap.add_argument("--top", type=int, default=15, help="imports to list")
+    ap.add_argument("--timeout", type=float, default=60.0)
+    args = ap.parse_args()
+
+    runs = [run_once(args.timeout) for _ in range(max(1, args.runs))]
+    imports = runs[-1][0]
+    if not imports:
+        sys.exit("no -X importtime output (did app.py start?)")
+
+    # Imports app.py triggers itself: the shallowest level under it
+    app_level = min(d for _, _, d, n in imports if n != "app") if any(n == "app" for _, _, _, n in imports) else 0
+    top = sorted((i for i in imports if i[2] == app_level), reverse=True)[: args.top]
+    total = sum(c for c, _, d, _ in imports if d == 0)
+    print(f"imports: {total / 1000.0:.1f} ms cumulative (last run)")
+    print(f"  {'module':<40} {'cumulative ms':>14} {'self ms':>9}")
+    for cum, own, _, name in top:
+        print(f"  {name:<40} {cum / 1000.0:>14.1f} {own / 1000.0:>9.1f}")
+
+    names = []
+    for _, marks in runs:
+        names += [n for n in marks if n not in names]
+    if not names:
+        sys.exit("app.py printed no startup report")
+    print(f"\nstartup marks (median of {len(runs)} run(s), ms since app.py start)")
+    for name in names:
+        vals = [marks[name] for _, marks in runs if name in marks]
+        print(f"  {name:<20} {statistics.median(vals):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
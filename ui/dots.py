@@ -9,6 +9,7 @@ class DotBar(QWidget):
         self.colors=[(0,0,0)]*count
         self.setMinimumHeight(100)
     def set_colors(self, rgbs):
+        if hasattr(rgbs,"tolist"): rgbs=rgbs.tolist()  # (N,3) frame array
         self.colors=list(rgbs)+[(0,0,0)]*(self.count-len(rgbs))
         self.update()
     def paintEvent(self, e):
@@ -8,14 +8,29 @@ class WaveView(tk.Canvas):
         kw.setdefault("highlightthickness", 0)
         super().__init__(master, **kw)
         self.values = []
+        self.peaks = None  # util.wave_assets.PeakPyramid, preferred over values
         self.duration = 0.0
         self.pos_sec = 0.0
+        self._drawn_size = None
+        self._playhead = None
         self.bind("<Button-1>", self._seek_click)
+        self.bind("<Configure>", lambda e: self.redraw())
 
     def load(self, values, duration):
         self.values = list(values)
+        self.peaks = None
         self.duration = float(duration)
         self.pos_sec = 0.0
+        self._drawn_size = None
+        self.redraw()
+
+    def load_peaks(self, peaks):
+        """Show a peak pyramid: only the level matching the width is read."""
+        self.values = []
+        self.peaks = peaks
+        self.duration = float(peaks.duration)
+        self.pos_sec = 0.0
+        self._drawn_size = None
         self.redraw()
 
     def set_pos(self, sec):
@@ -29,11 +44,19 @@ class WaveView(tk.Canvas):
         new_t = x * self.duration
         self.event_generate("<<WaveSeek>>", when="tail", data=str(new_t))
 
-    def redraw(self):
+    def _draw_wave(self, w, h):
         self.delete("all")
-        w = self.winfo_width() or 600
-        h = self.winfo_height() or 80
+        self._playhead = None
         mid = h // 2
+        if self.peaks is not None:
+            # One min..max line per pixel column
+            lo, hi = self.peaks.columns(w)
+            n = len(lo)
+            for i in range(n):
+                x = int(i * w / n)
+                self.create_line(x, int(mid - hi[i] * (mid - 8)), x, int(mid - lo[i] * (mid - 8)) + 1,
+                                 fill="#27c24c")
+            return
         n = len(self.values)
         # Draw waveform in green bars
         if n > 1:
@@ -41,7 +64,19 @@ class WaveView(tk.Canvas):
                 x = int(i / (n - 1) * (w - 1))
                 y = int(mid - a * (mid - 8))
                 self.create_line(x, mid, x, y, fill="#27c24c")
+
+    def redraw(self):
+        w = self.winfo_width() or 600
+        h = self.winfo_height() or 80
+        # The waveform only changes with the data or the size; a position
+        # update just moves the playhead
+        if self._drawn_size != (w, h):
+            self._drawn_size = (w, h)
+            self._draw_wave(w, h)
         # Draw playhead
         if self.duration > 0:
             x = int((self.pos_sec / self.duration) * (w - 1))
-            self.create_line(x, 0, x, h, fill="#66ff99")
+            if self._playhead is None:
+                self._playhead = self.create_line(x, 0, x, h, fill="#66ff99")
+            else:
+                self.coords(self._playhead, x, 0, x, h)
@@ -1,4 +1,6 @@
-import json, csv, os, wave
+import json, csv, os, wave, mmap, struct
+
+import numpy as np
 
 def _duration_from_wav(wav_guess: str) -> float:
     try:
@@ -11,7 +13,8 @@ def _duration_from_wav(wav_guess: str) -> float:
 
 def load_waveform(path: str):
     """
-    Robust loader for waveform JSON/CSV.
+    Robust loader for waveform JSON/CSV (import formats), or a .pnwave
+    container (see load_wave_asset; values are then a float32 view).
     - Accepts UTF-8 with or without BOM.
     - JSON: {"points":{"value":[...]}} or [{"t":..,"a":..}, ...] with optional "duration".
     - CSV: headers can be value / a, and optional t for duration.
@@ -20,20 +23,24 @@ def load_waveform(path: str):
     values, duration = [], 0.0
     plower = path.lower()
 
+    if plower.endswith(WAVE_EXT):
+        asset = load_wave_asset(path)
+        return {"duration": asset.duration, "values": asset.waveform()}
+
     if plower.endswith(".json"):
         # Handle UTF-8 BOM safely
         with open(path, "r", encoding="utf-8-sig") as f:
             data = json.load(f)
         pts = data.get("points")
         if isinstance(pts, dict) and "value" in pts:
-            values = list(pts["value"])
+            values = pts["value"]
         elif isinstance(pts, list):
-            values = [float(p.get("a", 0.0)) for p in pts]
+            values = [p.get("a", 0.0) for p in pts]
             duration = float(data.get("duration", 0.0))
         else:
             # Fallback: if the JSON is a flat list of numbers
             if isinstance(data, list):
-                values = [float(x) for x in data]
+                values = data
     else:
         # CSV (accept BOM)
         with open(path, "r", encoding="utf-8-sig", newline="") as f:
@@ -65,9 +72,246 @@ def load_waveform(path: str):
     return {"duration": float(duration), "values": [float(v) for v in values]}
 
 def load_beats(path_json: str):
+    if path_json.lower().endswith(WAVE_EXT):
+        asset = load_wave_asset(path_json)
+        return {"tempo_bpm": asset.tempo_bpm, "beats_sec": asset.beats}
     # Handle UTF-8 with BOM safely
     with open(path_json, "r", encoding="utf-8-sig") as f:
         data = json.load(f)
+    if isinstance(data, list):
+        # Bare list of beat times
+        return {"tempo_bpm": 0.0, "beats_sec": [float(x) for x in data]}
     bpm = float(data.get("tempo_bpm", 0.0))
     beats = [float(x) for x in data.get("beats_sec", [])]
     return {"tempo_bpm": bpm, "beats_sec": beats}
+
+
+# ----------------------------------------------------------------------
+# Peak pyramid: min/max peaks of a decoded song at several zoom levels
+# (tools/build_wave_assets.py writes <asset stem>_peaks.bin).
+#
+# Layout (little-endian):
+#   header : magic "PNPEAKS\0", version u16, levels u16, sample rate u32,
+#            frames per level-0 bin u32, song frames u64
+#   counts : levels x u32, bins per level
+#   levels : level 0 first; per bin an int16 (min, max) pair. Each level
+#            has half the bins of the one before (2x the frames per bin).
+# ----------------------------------------------------------------------
+
+PEAKS_MAGIC = b"PNPEAKS\0"
+PEAKS_VERSION = 1
+_PEAKS_HEADER = struct.Struct("<8sHHIIQ")
+
+# Coarsest level kept; a widget narrower than this still reads a few KB
+_PEAKS_MIN_BINS = 256
+
+
+def asset_stem(song_path: str) -> str:
+    """"CUE 19 - UNLOADING.mp3" -> "CUE_19_-_UNLOADING" (asset file names)."""
+    return os.path.splitext(os.path.basename(song_path))[0].replace(" ", "_")
+
+
+def build_peaks(samples, block=256):
+    """(frames, channels) or (frames,) int16 samples -> [level 0, 1, ...],
+    each an (n, 2) int16 array of (min, max) per bin, over all channels."""
+    a = np.asarray(samples)
+    if a.ndim > 1:
+        # Channel by channel: min/max over a short axis 1 is slow in NumPy
+        lo, hi = a[:, 0].copy(), a[:, 0].copy()
+        for c in range(1, a.shape[1]):
+            np.minimum(lo, a[:, c], out=lo)
+            np.maximum(hi, a[:, c], out=hi)
+    else:
+        lo = hi = a
+    block = max(1, int(block))
+    pad = -len(lo) % block
+    if pad:
+        lo = np.concatenate([lo, np.zeros(pad, lo.dtype)])
+        hi = np.concatenate([hi, np.zeros(pad, hi.dtype)])
+    level = np.empty((len(lo) // block, 2), np.int16)
+    level[:, 0] = lo.reshape(-1, block).min(axis=1)
+    level[:, 1] = hi.reshape(-1, block).max(axis=1)
+    levels = [level]
+    while len(level) > _PEAKS_MIN_BINS:
+        if len(level) % 2:
+            level = np.concatenate([level, np.zeros((1, 2), np.int16)])
+        pairs = level.reshape(-1, 2, 2)
+        level = np.empty((len(pairs), 2), np.int16)
+        level[:, 0] = pairs[:, :, 0].min(axis=1)
+        level[:, 1] = pairs[:, :, 1].max(axis=1)
+        levels.append(level)
+    return levels
+
+
+def write_peaks(path: str, samples, sample_rate: int, block=256):
+    """Build the pyramid for samples and write it to path (atomically)."""
+    frames = len(samples)
+    levels = build_peaks(samples, block)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PEAKS_HEADER.pack(PEAKS_MAGIC, PEAKS_VERSION, len(levels), int(sample_rate), int(block), frames))
+        f.write(struct.pack(f"<{len(levels)}I", *(len(lv) for lv in levels)))
+        for lv in levels:
+            f.write(lv.astype("<i2").tobytes())
+    os.replace(tmp, path)
+    return levels
+
+
+class PeakPyramid:
+    """A *_peaks.bin file, memory-mapped.
+
+    Only the level that columns() picks for a width is ever read, so
+    loading and drawing cost depends on the widget width, not on the song
+    length.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_levels, rate, block, frames = _PEAKS_HEADER.unpack_from(self._mm, 0)
+        if magic != PEAKS_MAGIC or version != PEAKS_VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a peaks file: {path}")
+        self.sample_rate = rate
+        self.block = block
+        self.frames = frames
+        self.duration = frames / float(rate) if rate else 0.0
+        off = _PEAKS_HEADER.size
+        counts = struct.unpack_from(f"<{n_levels}I", self._mm, off)
+        off += 4 * n_levels
+        self.levels = []
+        for n in counts:
+            self.levels.append(np.frombuffer(self._mm, "<i2", n * 2, off).reshape(n, 2))
+            off += n * 4
+
+    def level_for(self, width: int) -> int:
+        """Coarsest level with at least width bins (level 0 if none has)."""
+        for i in range(len(self.levels) - 1, -1, -1):
+            if len(self.levels[i]) >= width:
+                return i
+        return 0
+
+    def columns(self, width: int):
+        """(lo, hi) float arrays in -1..1, one per pixel column (fewer if
+        the finest level has fewer bins than width)."""
+        level = self.levels[self.level_for(max(1, int(width)))]
+        n = len(level)
+        width = min(max(1, int(width)), n)
+        if not n:
+            return np.zeros(0), np.zeros(0)
+        edges = np.arange(width) * n // width
+        lo = np.minimum.reduceat(level[:, 0], edges) / 32768.0
+        hi = np.maximum.reduceat(level[:, 1], edges) / 32768.0
+        return lo, hi
+
+    def close(self):
+        self.levels = []
+        try:
+            self._mm.close()
+        except Exception:
+            pass
+
+
+def load_peaks(path: str) -> PeakPyramid:
+    return PeakPyramid(path)
+
+
+# ----------------------------------------------------------------------
+# Wave asset container: waveform + beat grid of one song (<stem>.pnwave),
+# read with mmap into NumPy views; JSON / CSV are only imported into it
+# (tools/build_wave_assets.py).
+#
+# Layout (little-endian):
+#   header  : magic "PNWAVE\0\0", version u16, value format u16
+#             (1 = float32, 2 = int16 scaled by 1/32767), duration f64,
+#             waveform points per second f64 (0 = spread over duration),
+#             tempo bpm f32, value count u32, beat count u32
+#   values  : value count x float32 / int16, padded to 4 bytes
+#   beats   : beat count x float32, seconds, sorted
+# ----------------------------------------------------------------------
+
+WAVE_EXT = ".pnwave"
+WAVE_MAGIC = b"PNWAVE\0\0"
+WAVE_VERSION = 1
+WAVE_FLOAT32 = 1
+WAVE_INT16 = 2
+_WAVE_HEADER = struct.Struct("<8sHHddfII")
+_WAVE_DTYPES = {WAVE_FLOAT32: "<f4", WAVE_INT16: "<i2"}
+
+
+def write_wave_asset(path: str, values=(), duration=0.0, beats=(), tempo_bpm=0.0, rate=0.0, fmt=WAVE_FLOAT32):
+    """Write a .pnwave (atomically). values in -1..1; fmt WAVE_INT16
+    halves the size at 1/32767 resolution."""
+    vals = np.asarray(values, np.float32).ravel()
+    if fmt == WAVE_INT16:
+        vals = np.round(np.clip(vals, -1.0, 1.0) * 32767.0).astype("<i2")
+    else:
+        fmt = WAVE_FLOAT32
+        vals = vals.astype("<f4")
+    bts = np.sort(np.asarray(beats, np.float64).ravel()).astype("<f4")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_WAVE_HEADER.pack(WAVE_MAGIC, WAVE_VERSION, fmt, float(duration), float(rate),
+                                  float(tempo_bpm), len(vals), len(bts)))
+        f.write(vals.tobytes())
+        f.write(b"\0" * (-vals.nbytes % 4))
+        f.write(bts.tobytes())
+    os.replace(tmp, path)
+
+
+class WaveAsset:
+    """A .pnwave file, memory-mapped.
+
+    values and beats are read-only NumPy views of the map (no parsing, no
+    copies); pages are only read when the samples are touched.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, fmt, self.duration, self.rate, self.tempo_bpm,
+             n_values, n_beats) = _WAVE_HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic = None
+        if magic != WAVE_MAGIC or version != WAVE_VERSION or fmt not in _WAVE_DTYPES:
+            self._mm.close()
+            raise ValueError(f"Not a wave asset: {path}")
+        self.format = fmt
+        off = _WAVE_HEADER.size
+        self.values = np.frombuffer(self._mm, _WAVE_DTYPES[fmt], n_values, off)
+        off += self.values.nbytes
+        off += -off % 4
+        self.beats = np.frombuffer(self._mm, "<f4", n_beats, off)
+
+    def waveform(self):
+        """Values as float32 in -1..1 (the view itself for float32 files)."""
+        if self.format == WAVE_INT16:
+            return self.values * np.float32(1.0 / 32767.0)
+        return self.values
+
+    def close(self):
+        self.values = self.beats = None
+        try:
+            self._mm.close()
+        except Exception:
+            pass
+
+
+def load_wave_asset(path: str) -> WaveAsset:
+    return WaveAsset(path)
+
+
+def wave_asset_duration(path: str) -> float:
+    """Duration from a .pnwave header only, 0.0 if unreadable."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_WAVE_HEADER.size)
+        magic, version, _, duration = _WAVE_HEADER.unpack(head)[:4]
+        if magic == WAVE_MAGIC and version == WAVE_VERSION:
+            return float(duration)
+    except Exception:
+        pass
+    return 0.0